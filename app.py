@@ -1,21 +1,46 @@
+import time
+
+# Startup is timed from here, before the heavy imports below
+_startup_began = time.perf_counter()
+
 import dash
 import dash_ag_grid as dag
 from dash import Dash, html, dcc, Input, Output, callback, Patch
-import pandas as pd
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
-import plotly.graph_objects as go
+import flask
 import json
 import re
-from typing import List, Dict, Tuple
-
-from dash import ALL, MATCH, Input, Output, State, callback_context 
+from typing import List, Dict, Iterator, Tuple
 
-# DeepSeek/LLM imports
-from ollama import chat, ChatResponse
+from dash import ALL, MATCH, ClientsideFunction, Input, Output, State, callback_context 
 
 from src.pokemon_analysis import PokemonData, TeamAnalysis, TeamVisualization
-from src.pokemon_analysis import calculate_team_kpis, generate_radar, pokemon_info, generate_bar, generate_team_summary
+from src.pokemon_analysis import calculate_team_kpis, generate_radar, pokemon_info, generate_bar, generate_team_summary, team_profile, radar_values
+from src.api import register_api
+from src.chat_stream import ChatJobs, visible_answer
+from src.metrics import LLM_CALLS, REGISTRY, StartupReport, cache_collector, instrument_dash
+from src.pokedex import Pokedex
+from src.pokedex_query import PokedexQuery
+from src.recommender import Recommender
+from src.response_cache import ResponseCache
+from src.speculation import TeamSpeculator
+from src.team_session import TeamSessionStore
+from src.type_chart import TypeChart
+
+startup = StartupReport(_startup_began)
+startup.mark("imports")
+
+
+def ollama_chat(*args, **kwargs):
+    """
+    ollama's chat function, imported on the first LLM request: importing
+    ollama is slow and creates its client, and the app must start (and
+    answer everything but free-text chat) without it installed
+    """
+    from ollama import chat
+    return chat(*args, **kwargs)
+
 
 # COMPLETE REPLACEMENT FOR YOUR PokemonTeamChatAssistant CLASS
 
@@ -24,84 +49,52 @@ class PokemonTeamChatAssistant:
     Fast Hybrid Pokemon Team Assistant - Instant calculations + Optional LLM
     """
     
-    def __init__(self, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
-        """Initialize with same data but optimized for speed"""
-        self.pokemon_df = pd.read_csv(pokemon_csv_path)
-        self.types_df = pd.read_csv(types_csv_path)
+    def __init__(self, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv",
+                 response_cache=None, chat_fn=None):
+        """
+        Initialize with same data but optimized for speed
+        
+        response_cache: ResponseCache for LLM answers (defaults to llm_cache.sqlite3)
+        chat_fn: Stand-in for ollama's chat function, e.g. in tests
+        """
+        self.pokedex = Pokedex.load(pokemon_csv_path)
+        self.pokemon_csv_path = pokemon_csv_path
+        self.types_csv_path = types_csv_path
+        self.chart = TypeChart.load(types_csv_path)
         self.model_name = 'deepseek-r1'
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.chat_fn = chat_fn or ollama_chat
         self.type_chart = self._load_type_chart()
         self.chat_history = []
         
     def _load_type_chart(self) -> Dict:
-        """Load type effectiveness chart from CSV"""
-        type_chart = {}
-        attacking_types = self.types_df['Type'].tolist()
-        
-        for _, row in self.types_df.iterrows():
-            attacking_type = row['Type']
-            effectiveness = {}
-            
-            for defending_type in attacking_types:
-                if defending_type in row:
-                    effectiveness[defending_type] = float(row[defending_type])
-                    
-            type_chart[attacking_type] = effectiveness
-            
-        return type_chart
+        """Nested dict view of the shared type effectiveness matrix"""
+        return self.chart.to_dict()
     
     # ========================================================================
     # INSTANT RESPONSE FUNCTIONS (No LLM - <1 second responses)
     # ========================================================================
     
+    def _team_profile(self, current_team: List[Dict]):
+        """Shared matchup profile of the team (computed once per team, then cached)"""
+        return team_profile(current_team, self.types_csv_path)
+    
     def get_instant_analysis(self, current_team: List[Dict]) -> str:
         """Instant team analysis using pure calculations"""
         if not current_team:
             return "No Pokemon selected. Choose some Pokemon to analyze!"
         
-        # Quick type analysis
-        team_types = set()
-        vulnerabilities = {}
-        resistances = {}
-        offensive_coverage = set()
-        
-        for pokemon in current_team:
-            type1 = pokemon.get('type1', '')
-            type2 = pokemon.get('type2', '')
-            
-            # Track team types
-            if type1: team_types.add(type1)
-            if type2 and type2 != '': team_types.add(type2)
-            
-            # Calculate what this Pokemon can hit effectively
-            for defending_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(type1, {}).get(defending_type, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(type2, {}).get(defending_type, 1.0) if type2 and type2 != '' else 1.0
-                
-                if max(eff1, eff2) >= 2.0:
-                    offensive_coverage.add(defending_type)
-            
-            # Calculate what threatens this Pokemon
-            for attacking_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(attacking_type, {}).get(type1, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(attacking_type, {}).get(type2, 1.0) if type2 and type2 != '' else 1.0
-                
-                total_eff = eff1 * eff2
-                
-                if total_eff >= 2.0:
-                    vulnerabilities[attacking_type] = vulnerabilities.get(attacking_type, 0) + 1
-                elif total_eff <= 0.5:
-                    resistances[attacking_type] = resistances.get(attacking_type, 0) + 1
+        profile = self._team_profile(current_team)
         
         # Generate instant summary
         team_size = len(current_team)
-        type_diversity = len(team_types)
+        type_diversity = len(profile.team_types)
         
         # Find main threats (types that threaten 2+ Pokemon)
-        main_threats = [t for t, count in vulnerabilities.items() if count >= 2][:3]
+        main_threats = profile.main_threats()[:3]
         
         # Find coverage gaps
-        all_types = set(self.type_chart.keys())
-        coverage_gaps = list(all_types - offensive_coverage)[:3]
+        coverage_gaps = profile.coverage_gaps[:3]
         
         # Create response
         summary = f"**Team Analysis ({team_size} Pokemon, {type_diversity} types):**\n\n"
@@ -116,7 +109,7 @@ class PokemonTeamChatAssistant:
         else:
             summary += f"⚔️ **Offense:** Good coverage across all types\n"
         
-        if len(team_types) < 4 and team_size >= 3:
+        if type_diversity < 4 and team_size >= 3:
             summary += f"📈 **Suggestion:** Add more type diversity (currently {type_diversity} types)\n"
         
         summary += f"\n💡 Ask me detailed questions for more insights!"
@@ -128,34 +121,20 @@ class PokemonTeamChatAssistant:
         if not current_team:
             return "Select Pokemon first to see what types threaten your team!"
         
-        vulnerabilities = {}
-        
-        for pokemon in current_team:
-            name = pokemon.get('pokemon', 'Unknown')
-            type1 = pokemon.get('type1', '')
-            type2 = pokemon.get('type2', '')
-            
-            for attacking_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(attacking_type, {}).get(type1, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(attacking_type, {}).get(type2, 1.0) if type2 and type2 != '' else 1.0
-                
-                total_eff = eff1 * eff2
-                
-                if total_eff >= 2.0:
-                    if attacking_type not in vulnerabilities:
-                        vulnerabilities[attacking_type] = []
-                    multiplier = "4x" if total_eff >= 4.0 else "2x"
-                    vulnerabilities[attacking_type].append(f"{name} ({multiplier})")
+        profile = self._team_profile(current_team)
         
-        if not vulnerabilities:
+        if not profile.threats:
             return "🛡️ **Great defense!** Your team has no major type vulnerabilities."
         
         response = "🚨 **Team Vulnerabilities:**\n\n"
         
         # Sort by number of Pokemon affected
-        sorted_threats = sorted(vulnerabilities.items(), key=lambda x: len(x[1]), reverse=True)
+        sorted_threats = sorted(profile.threats.items(), key=lambda x: len(x[1]), reverse=True)
         
-        for threat_type, affected_pokemon in sorted_threats[:5]:
+        for threat_type, affected_members in sorted_threats[:5]:
+            affected_pokemon = [
+                f"{profile.names[i]} ({'4x' if multiplier >= 4.0 else '2x'})" for i, multiplier in affected_members
+            ]
             response += f"**{threat_type}:** {', '.join(affected_pokemon)}\n"
         
         response += f"\n💡 Consider adding Pokemon that resist these types!"
@@ -163,78 +142,35 @@ class PokemonTeamChatAssistant:
         return response
     
     def get_instant_suggestions(self, current_team: List[Dict]) -> str:
-        """Instant Pokemon suggestions based on coverage gaps"""
+        """Instant Pokemon suggestions ranked by KPI gain over the whole Pokedex"""
         if not current_team:
             return "Since you haven't selected any Pokemon yet, I recommend starting with a **Steel-type**! Steel types resist many attacks (Normal, Flying, Rock, Bug, Steel, Grass, Psychic, Ice, Dragon, Fairy) and are great defensive anchors. Try **Metagross**, **Skarmory**, or **Magnezone**!"
         
-        if len(current_team) >= 6:
-            return "Your team is full! Try removing a Pokemon first, then I can suggest better type coverage options."
-        
-        # Find coverage gaps
-        offensive_coverage = set()
-        vulnerabilities = {}
-        team_types = set()
-        
-        for pokemon in current_team:
-            type1 = pokemon.get('type1', '')
-            type2 = pokemon.get('type2', '')
-            
-            if type1: team_types.add(type1)
-            if type2 and type2 != '': team_types.add(type2)
-            
-            # What can this Pokemon hit effectively?
-            for defending_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(type1, {}).get(defending_type, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(type2, {}).get(defending_type, 1.0) if type2 and type2 != '' else 1.0
-                
-                if max(eff1, eff2) >= 2.0:
-                    offensive_coverage.add(defending_type)
-            
-            # What threatens this Pokemon?
-            for attacking_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(attacking_type, {}).get(type1, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(attacking_type, {}).get(type2, 1.0) if type2 and type2 != '' else 1.0
-                
-                if eff1 * eff2 >= 2.0:
-                    vulnerabilities[attacking_type] = vulnerabilities.get(attacking_type, 0) + 1
-        
         # Find gaps and threats
-        all_types = set(self.type_chart.keys())
-        coverage_gaps = list(all_types - offensive_coverage)
-        main_threats = [t for t, count in vulnerabilities.items() if count >= 2]
-        
-        # Suggest types that help
-        suggestions = []
-        
-        # Suggest types that cover offensive gaps
-        if 'Steel' in coverage_gaps and 'Fighting' not in team_types:
-            suggestions.append("**Fighting-type** (hits Steel super effectively)")
-        
-        if 'Water' in coverage_gaps and 'Grass' not in team_types:
-            suggestions.append("**Grass-type** (hits Water super effectively)")
+        profile = self._team_profile(current_team)
+        coverage_gaps = profile.coverage_gaps
+        main_threats = profile.main_threats()
         
-        if 'Flying' in coverage_gaps and 'Electric' not in team_types:
-            suggestions.append("**Electric-type** (hits Flying super effectively)")
-        
-        # Suggest types that resist main threats
-        if 'Rock' in main_threats and 'Steel' not in team_types:
-            suggestions.append("**Steel-type** (resists Rock attacks)")
-        
-        if 'Fire' in main_threats and 'Water' not in team_types:
-            suggestions.append("**Water-type** (resists Fire attacks)")
-        
-        if not suggestions:
-            # Default suggestions if no specific gaps found
-            missing_types = ['Electric', 'Steel', 'Water', 'Fighting'] 
-            for t in missing_types:
-                if t not in team_types:
-                    suggestions.append(f"**{t}-type** (good coverage)")
-                    break
-        
-        response = f"🎯 **Recommended Types for Your Team:**\n\n"
-        response += f"• {suggestions[0] if suggestions else '**Electric-type** (good offensive coverage)'}\n"
-        if len(suggestions) > 1:
-            response += f"• {suggestions[1]}\n"
+        # Rank the whole Pokédex by how much each entry improves the team
+        try:
+            recommender = Recommender.from_files(self.pokemon_csv_path, self.types_csv_path)
+            if len(current_team) >= 6:
+                # Full team: best single swap over every member
+                swaps = [(recommender.recommend(current_team, 1, replace=i), i) for i in range(len(current_team))]
+                swaps = [(picks[0], i) for picks, i in swaps if picks]
+                pick, index = max(swaps, key=lambda swap: swap[0]['score'], default=(None, None))
+                if pick is None or pick['score'] <= 0:
+                    return "Your team is full and no single swap improves it - nice work!"
+                response = f"🔁 **Best Swap for Your Full Team:**\n\n"
+                response += (f"• Replace **{current_team[index].get('pokemon', 'Unknown')}** with "
+                             f"{self._format_recommendation(pick)}\n")
+            else:
+                picks = recommender.recommend(current_team, 3)
+                response = f"🎯 **Recommended Pokemon for Your Team:**\n\n"
+                for pick in picks:
+                    response += f"• {self._format_recommendation(pick)}\n"
+        except ValueError as e:
+            return f"I couldn't rank suggestions for this team: {e}"
         
         if coverage_gaps:
             response += f"\n📊 **Coverage Gaps:** {', '.join(coverage_gaps[:3])}"
@@ -244,43 +180,34 @@ class PokemonTeamChatAssistant:
         
         return response
     
+    def _format_recommendation(self, pick: Dict) -> str:
+        """One recommended Pokemon with its types and KPI gains"""
+        entry = pick['pokemon']
+        types = "/".join(t for t in (entry['type1'], entry['type2']) if t)
+        gains = pick['gains']
+        details = []
+        if gains['team_coverage_score']:
+            details.append(f"{gains['team_coverage_score']:+.0f}% resisted")
+        if gains['type_coverage_index']:
+            details.append(f"{gains['type_coverage_index']:+.0f}% coverage")
+        if gains['defensive_holes']:
+            details.append(f"{gains['defensive_holes']:+d} holes")
+        return f"**{entry['pokemon']}** ({types}): {', '.join(details) or 'no change'}"
+    
     def get_instant_rating(self, current_team: List[Dict]) -> str:
         """Instant team rating based on coverage metrics"""
         if not current_team:
             return "I can't rate an empty team! Add some Pokemon first."
         
         # Calculate metrics
-        team_types = set()
-        offensive_coverage = set()
-        vulnerabilities = {}
-        
-        for pokemon in current_team:
-            type1 = pokemon.get('type1', '')
-            type2 = pokemon.get('type2', '')
-            
-            if type1: team_types.add(type1)
-            if type2 and type2 != '': team_types.add(type2)
-            
-            # Offensive coverage
-            for defending_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(type1, {}).get(defending_type, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(type2, {}).get(defending_type, 1.0) if type2 and type2 != '' else 1.0
-                
-                if max(eff1, eff2) >= 2.0:
-                    offensive_coverage.add(defending_type)
-            
-            # Defensive vulnerabilities
-            for attacking_type in self.type_chart.keys():
-                eff1 = self.type_chart.get(attacking_type, {}).get(type1, 1.0) if type1 else 1.0
-                eff2 = self.type_chart.get(attacking_type, {}).get(type2, 1.0) if type2 and type2 != '' else 1.0
-                
-                if eff1 * eff2 >= 2.0:
-                    vulnerabilities[attacking_type] = vulnerabilities.get(attacking_type, 0) + 1
+        profile = self._team_profile(current_team)
+        team_types = profile.team_types
+        offensive_coverage = profile.offensive_coverage
         
         # Calculate scores
         type_diversity_score = min(len(team_types) * 2, 10)  # Max 10 for 5+ types
         offensive_score = min(len(offensive_coverage) * 0.6, 10)  # Max 10 for hitting ~17 types
-        defensive_holes = len([t for t, count in vulnerabilities.items() if count >= 2])
+        defensive_holes = len(profile.main_threats())
         defensive_score = max(10 - defensive_holes * 2, 0)  # Lose 2 points per major hole
         
         overall_score = (type_diversity_score + offensive_score + defensive_score) / 3
@@ -312,26 +239,49 @@ class PokemonTeamChatAssistant:
         Optional LLM interaction for detailed questions (still available for text input)
         """
         try:
-            # Shorter context for faster processing
-            team_context = self._prepare_short_team_context(current_team)
+            response_text = "".join(self.stream_deepseek_chat(user_question, current_team))
+            return visible_answer(response_text)
             
-            # Shorter system prompt for faster responses
-            system_prompt = f"""You are a Pokemon expert. Current team: {team_context}
+        except Exception as e:
+            return f"Sorry, I'm having trouble connecting right now. Error: {str(e)}"
+    
+    def stream_deepseek_chat(self, user_question: str, current_team: List[Dict]) -> Iterator[str]:
+        """
+        Stream the raw LLM response chunk by chunk (including any <think> block)
+        """
+        # Shorter context for faster processing
+        team_context = self._prepare_short_team_context(current_team)
+        
+        # Same question about the same team: answer from the cache in milliseconds
+        cached = self.response_cache.get(self.model_name, user_question, team_context)
+        if cached is not None:
+            LLM_CALLS.inc("cached")
+            yield cached
+            return
+        
+        # Shorter system prompt for faster responses
+        system_prompt = f"""You are a Pokemon expert. Current team: {team_context}
 
 Keep responses to 2-3 sentences. Be specific and helpful."""
 
-            response: ChatResponse = chat(model=self.model_name, messages=[
+        try:
+            stream = self.chat_fn(model=self.model_name, messages=[
                 {'role': 'system', 'content': system_prompt},
                 {'role': 'user', 'content': user_question}
-            ])
-            
-            response_text = response['message']['content']
-            clean_response = re.sub(r'<think>.*?</think>', '', response_text, flags=re.DOTALL).strip()
-            
-            return clean_response
+            ], stream=True)
             
-        except Exception as e:
-            return f"Sorry, I'm having trouble connecting right now. Error: {str(e)}"
+            chunks = []
+            for part in stream:
+                chunks.append(part['message']['content'])
+                yield chunks[-1]
+        except Exception:
+            LLM_CALLS.inc("error")
+            raise
+        LLM_CALLS.inc("ok")
+        
+        answer = visible_answer("".join(chunks))
+        if answer:
+            self.response_cache.put(self.model_name, user_question, team_context, answer)
     
     def _prepare_short_team_context(self, team_data: List[Dict]) -> str:
         """Prepare shorter team information for faster LLM processing"""
@@ -376,6 +326,13 @@ Keep responses to 2-3 sentences. Be specific and helpful."""
 
 app = dash.Dash(__name__)
 
+# The sprite atlas URL is versioned by content, so browsers and proxies can keep it
+@app.server.after_request
+def cache_sprite_atlas(response):
+    if flask.request.path.startswith('/assets/sprites/'):
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 app.index_string = '''
 <!DOCTYPE html>
 <html>
@@ -412,16 +369,14 @@ app.index_string = '''
 </html>
 '''
 
-# Load Pokemon data
-new_df = pd.read_csv("151pokemon.csv")
+# Load Pokemon data; the grid pages through it on the server
+PokedexQuery.from_files("151pokemon.csv")
 
-# Column definitions for AG Grid
+# Column definitions for AG Grid (the infinite row model has no select-all
+# header checkbox: only the loaded rows could be selected)
 newColDefs = [
-    {"field": "pokedex"},
-    {
-        "field": "pokemon",
-        "headerCheckboxSelection": True,
-    },
+    {"field": "pokedex", "filter": "agNumberColumnFilter"},
+    {"field": "pokemon"},
     {"field": "type1"},
     {"field": "type2"},
 ]
@@ -436,8 +391,29 @@ except Exception as e:
     llm_available = False
     print(f"❌ Chat Assistant failed to initialize: {e}")
 
-# Store current team globally for chat context
-current_team_data = []
+# Per-session teams and their analyses, kept server-side
+team_sessions = TeamSessionStore()
+
+# Teams one click away from each session's team are analysed in the background
+team_speculator = TeamSpeculator()
+
+# LLM answers are streamed on worker threads so chat callbacks return at once;
+# their progress is kept in llm_cache.sqlite3 so any gunicorn worker can
+# answer the stream polls
+chat_jobs = ChatJobs("llm_cache.sqlite3")
+
+# Per-callback latency, errors and payload sizes plus cache stats at /metrics
+instrument_dash(app)
+caches = {'team_analysis': TeamAnalysis.cache, 'speculative_analysis': TeamAnalysis.speculative,
+          'team_sessions': team_sessions.sessions, 'next_pick_hints': team_speculator.hints}
+if chat_assistant is not None:
+    caches['llm_responses'] = chat_assistant.response_cache
+REGISTRY.register_collector(cache_collector(caches))
+REGISTRY.register_collector(startup.collect)
+
+# JSON analysis API for other services (/api/...)
+register_api(app.server)
+startup.mark("data")
 
 # Helper functions for creating chat messages
 def create_user_message(text):
@@ -468,6 +444,19 @@ def create_ai_message(text):
         'boxShadow': '0 1px 3px rgba(0,0,0,0.1)'
     })
 
+def create_loading_message():
+    """Placeholder shown while an LLM answer is on its way"""
+    return html.Div([
+        html.Strong("🤖 Assistant: ", style={'color': '#52c41a'}),
+        html.Span("🤔 Thinking... This may take 10-30 seconds.", style={'fontStyle': 'italic'})
+    ], style={
+        'padding': '10px 15px',
+        'backgroundColor': '#fff7e6',
+        'borderRadius': '10px', 
+        'marginBottom': '10px',
+        'border': '1px solid #ffd591'
+    })
+
 def create_error_message(text):
     """Enhanced error message with better styling"""
     return html.Div([
@@ -483,6 +472,16 @@ def create_error_message(text):
     })
 
 
+def radar_patch(analysis):
+    """Partial radar update carrying only the two traces' r arrays"""
+    _, defensive_r, offensive_r = radar_values(analysis)
+    patched_fig = Patch()
+    # 4 decimals is far finer than the chart can show and keeps the payload small
+    patched_fig['data'][0]['r'] = [round(v, 4) for v in defensive_r]
+    patched_fig['data'][1]['r'] = [round(v, 4) for v in offensive_r]
+    return patched_fig
+
+
 # Example function that can be called from main.py for individual Pokemon
 def get_pokemon_data(pokedex_number):
     pokemon_name, info_output, type1, type2 = pokemon_info(pokedex_number)
@@ -500,14 +499,19 @@ app.layout = html.Div([
             html.H3("Select Your Pokémon Team (up to 6)"),
             dcc.Input(id="input-radio-row-selection-checkbox-header-filtered-only", 
                      placeholder="Quick filter...",
+                     debounce=0.3,
                      style={'marginBottom': '10px', 'width': '100%'}),
             dag.AgGrid(
                 id="row-selection-checkbox-header-filtered-only",
                 columnDefs=newColDefs,
-                rowData=new_df.to_dict("records"),
+                # Rows are fetched a block at a time (serve_pokedex_rows), so
+                # the page doesn't grow with the Pokédex
+                rowModelType="infinite",
+                getRowId="params.data.pokedex",
                 columnSize="sizeToFit",
                 defaultColDef={"filter": True},
-                dashGridOptions={"rowSelection": "multiple", "animateRows": False, "rowMultiSelectWithClick" : True},
+                dashGridOptions={"rowSelection": "multiple", "animateRows": False, "rowMultiSelectWithClick" : True,
+                                 "cacheBlockSize": 100, "maxBlocksInCache": 20, "infiniteInitialRowCount": 100},
                 rowStyle= {"cursor": "pointer"},
                 style={'height': '350px', 'width': '100%'}
             ),
@@ -515,7 +519,8 @@ app.layout = html.Div([
         
         html.Div([
             html.H3("Team Type Effectiveness"),
-            dcc.Graph(id="radar-chart", style={'height': '350px'}),
+            # Built once; selection changes only patch the two r arrays
+            dcc.Graph(id="radar-chart", figure=generate_radar([]), style={'height': '350px'}),
         ], style={'width': '48%', 'float': 'right', 'display': 'inline-block'}),
     ]),
     
@@ -613,69 +618,99 @@ app.layout = html.Div([
         dcc.Input(id="pokemon-input", type="number", placeholder="Enter Pokédex #"),
         html.Div(id="pokemon-info")], style={'marginTop': '30px', 'textAlign': 'center'}),
 
-    html.Div(id="dummy-div", style={'display': 'none'}),
+    # Session ID (per browser tab) and the session's team as Pokédex numbers;
+    # the team itself and its analysis live in team_sessions on the server
+    dcc.Store(id="session-id", storage_type="session"),
+    dcc.Store(id="team-session"),
+
+    # Pending LLM answer being streamed into the chat history
+    dcc.Store(id="chat-job"),
+    dcc.Interval(id="chat-stream-interval", interval=300, disabled=True),
 
 ], style={'padding': '20px'})
+startup.mark("layout")
 
-# Update current team when selection changes
+# Update the session's team when selection changes
 @app.callback(
-    Output("dummy-div", "children"),
-    [Input("row-selection-checkbox-header-filtered-only", "selectedRows")]
+    [Output("team-session", "data"),
+     Output("session-id", "data")],
+    [Input("row-selection-checkbox-header-filtered-only", "selectedRows")],
+    [State("session-id", "data")]
 )
-def update_current_team(selected_rows):
-    global current_team_data
-    current_team_data = selected_rows[:6] if selected_rows else []
-    return ""
+def update_current_team(selected_rows, session_id):
+    session_id = session_id or TeamSessionStore.new_session_id()
+    numbers = TeamSessionStore.team_numbers(selected_rows)
+    entry = team_sessions.set_team(session_id, numbers)
+    # Precompute every next addition and removal so the next click is a cache hit
+    team_speculator.submit(session_id, entry['team'])
+    return {'session': session_id, 'numbers': numbers}, session_id
 
 # Handle text input
 @app.callback(
     [Output("chat-history", "children"),
-     Output("chat-input", "value")],
+     Output("chat-input", "value"),
+     Output("chat-job", "data"),
+     Output("chat-stream-interval", "disabled")],
     [Input("chat-send-btn", "n_clicks"),
      Input("chat-input", "n_submit")],
     [State("chat-input", "value"),
      State("chat-history", "children"),
-     State("row-selection-checkbox-header-filtered-only", "selectedRows")]
+     State("team-session", "data")]
 )
-def handle_chat_input(send_clicks, input_submit, user_input, chat_history, selected_rows):
+def handle_chat_input(send_clicks, input_submit, user_input, chat_history, team_session):
     if not llm_available:
-        return chat_history + [create_error_message("Chat Assistant not available")], ""
+        return chat_history + [create_error_message("Chat Assistant not available")], "", dash.no_update, dash.no_update
     
     if not user_input or user_input.strip() == "":
-        return chat_history, ""
+        return chat_history, "", dash.no_update, dash.no_update
     
     # SHOW USER MESSAGE IMMEDIATELY (this fixes the feedback issue)
     user_message = create_user_message(user_input)
     
-    # Add loading message
-    loading_message = html.Div([
-        html.Strong("🤖 Assistant: ", style={'color': '#52c41a'}),
-        html.Span("🤔 Thinking... This may take 10-30 seconds.", style={'fontStyle': 'italic'})
-    ], style={
-        'padding': '10px 15px',
-        'backgroundColor': '#fff7e6',
-        'borderRadius': '10px', 
-        'marginBottom': '10px',
-        'border': '1px solid #ffd591'
-    })
+    # Start the LLM request in the background and return right away; the
+    # loading message is replaced as the answer streams in
+    team_data = team_sessions.team(team_session)
+    job_id = chat_jobs.submit(lambda: chat_assistant.stream_deepseek_chat(user_input, team_data))
     
-    # Update chat history with user message + loading immediately
-    temp_history = chat_history + [user_message, loading_message]
+    history = chat_history + [user_message, create_loading_message()]
+    return history, "", {'job': job_id, 'index': len(history) - 1}, False
+
+# Stream the pending LLM answer into its chat message
+@app.callback(
+    [Output("chat-history", "children", allow_duplicate=True),
+     Output("chat-job", "data", allow_duplicate=True),
+     Output("chat-stream-interval", "disabled", allow_duplicate=True)],
+    Input("chat-stream-interval", "n_intervals"),
+    State("chat-job", "data"),
+    prevent_initial_call=True
+)
+def stream_chat_response(n_intervals, job):
+    if not job:
+        return dash.no_update, None, True
     
-    # Get AI response (this is the slow part)
-    try:
-        team_data = selected_rows[:6] if selected_rows else []
-        ai_response = chat_assistant.ask_deepseek_chat(user_input, team_data)
-        ai_message = create_ai_message(ai_response)
-        
-        # Replace loading message with actual response
-        final_history = chat_history + [user_message, ai_message]
-        return final_history, ""  # Clear input
-        
-    except Exception as e:
-        error_message = create_error_message(f"Error: {str(e)}")
-        final_history = chat_history + [user_message, error_message]
-        return final_history, ""
+    status = chat_jobs.poll(job['job'])
+    patched_history = Patch()
+    
+    if status is None:
+        patched_history[job['index']] = create_error_message("The response was lost. Please ask again.")
+        return patched_history, None, True
+    
+    if status['error'] is not None:
+        patched_history[job['index']] = create_ai_message(
+            f"Sorry, I'm having trouble connecting right now. Error: {status['error']}")
+        return patched_history, None, True
+    
+    text = visible_answer(status['text'])
+    if status['done']:
+        patched_history[job['index']] = create_ai_message(text)
+        return patched_history, None, True
+    
+    if not text:
+        # Still thinking, nothing to show yet
+        return dash.no_update, dash.no_update, False
+    
+    patched_history[job['index']] = create_ai_message(text + " ▌")
+    return patched_history, dash.no_update, False
 
 # Handle quick action buttons with loading
 @app.callback(
@@ -685,11 +720,10 @@ def handle_chat_input(send_clicks, input_submit, user_input, chat_history, selec
      Input("btn-suggest-pokemon", "n_clicks"),
      Input("btn-rate-team", "n_clicks")],
     [State("chat-history", "children"),
-    State("row-selection-checkbox-header-filtered-only", "selectedRows")],
+    State("team-session", "data")],
     prevent_initial_call=True
 )
-def handle_quick_buttons(analyze_clicks, weakness_clicks, suggest_clicks, rate_clicks, chat_history, selected_rows):
-    team_data = selected_rows[:6] if selected_rows else []
+def handle_quick_buttons(analyze_clicks, weakness_clicks, suggest_clicks, rate_clicks, chat_history, team_session):
     if not llm_available:
         return chat_history
     
@@ -715,11 +749,11 @@ def handle_quick_buttons(analyze_clicks, weakness_clicks, suggest_clicks, rate_c
         
         # Get response (this handles the different suggestion logic)
         try:
-            team_data = selected_rows[:6] if selected_rows else []
+            team_data = team_sessions.team(team_session)
             ai_response = chat_assistant.get_quick_response(question_type, team_data)       
             
             # For the suggestion button, we might get instant response or LLM response
-            if question_type == "suggest" and (not current_team_data or len(current_team_data) >= 6):
+            if question_type == "suggest" and (not team_data or len(team_data) >= 6):
                 # These cases have instant responses, show immediately
                 ai_message = create_ai_message(ai_response)
                 return chat_history + [user_message, ai_message]
@@ -752,27 +786,31 @@ def handle_quick_buttons(analyze_clicks, weakness_clicks, suggest_clicks, rate_c
     [Output("radar-chart", "figure"), 
      Output("team-kpi-display", "children"),
      Output("team-recommendations", "children")],  # 3 outputs declared
-    [Input("row-selection-checkbox-header-filtered-only", "selectedRows")]
+    [Input("team-session", "data")]
 )
 
-def update_team_analysis(selected_rows):
-    if not selected_rows or len(selected_rows) == 0:
-        # Return empty figure and message if no Pokémon selected
-        return {}, html.Div("Select Pokémon to see team metrics"), html.Div("Select Pokémon to see type recommendations")
+def update_team_analysis(team_session):
+    # The session already holds the team's analysis
+    analysis = team_sessions.analysis(team_session)
+    if analysis is None:
+        # Flatten the radar and show a message if no Pokémon selected
+        return radar_patch([]), html.Div("Select Pokémon to see team metrics"), html.Div("Select Pokémon to see type recommendations")
     
     
-    # Limit to maximum 6 Pokémon (standard team size)
-    team_data = selected_rows[:6]
+    kpis = analysis.kpis
     
-    # Calculate team KPIs
-    kpis = calculate_team_kpis(team_data)
+    # Shared matchup profile: built once here, then the chat quick buttons
+    # answer from the cached copy
+    profile = analysis.profile
+    threat_counts = profile.threat_counts()
     
-    # Generate radar chart for the selected team
-    bar_fig = generate_bar(team_data) #unused bar fig for offensive/defensive type effectiveness
-    radar_fig = generate_radar(team_data)
+    # Update the radar chart for the selected team
+    radar_fig = radar_patch(analysis)
     
+    team_summary = generate_team_summary(analysis)
     
-    team_summary = generate_team_summary(team_data)  # Import this function
+    # Precomputed in the background as soon as the team changed
+    next_pick = team_speculator.best_next_pick(analysis.team_data)
     
     summary_card = html.Div([ #initialize summary card
         html.H4("Team Analysis", style={'color': '#722ed1'}),
@@ -821,7 +859,21 @@ def update_team_analysis(selected_rows):
                     'borderRadius': '15px',
                     'color': '#cf1322'
                 }) for type_name in kpis.get('vulnerable_types', [])
-            ])
+            ]),
+            # Types hitting several members super effectively, with how many
+            html.Div([
+                html.H5("Threatens Several Members:", style={'margin': '5px 0'}),
+                html.Div([
+                    html.Span(f"{type_name} ×{threat_counts[type_name]}", style={
+                        'display': 'inline-block',
+                        'margin': '3px',
+                        'padding': '5px 10px',
+                        'backgroundColor': '#fff1f0',
+                        'borderRadius': '15px',
+                        'color': '#cf1322'
+                    }) for type_name in profile.main_threats()
+                ])
+            ]) if profile.main_threats() else None
         ], style={'width': '25%', 'padding': '15px', 'borderRadius': '10px', 'boxShadow': '0 2px 8px rgba(0,0,0,0.1)'}),
         
         # Second card: offensive gaps
@@ -872,7 +924,19 @@ def update_team_analysis(selected_rows):
                             'color': '#52c41a'
                         }) for type_name in kpis.get('offensive_recommendations', [])[:3]
                     ])
-                ])
+                ]),
+                # Best concrete Pokémon to add next
+                html.Div([
+                    html.H5("Best Next Pick:", style={'margin': '5px 0'}),
+                    html.Span(next_pick['pokemon']['pokemon'], style={
+                        'display': 'inline-block',
+                        'margin': '3px',
+                        'padding': '5px 10px',
+                        'backgroundColor': '#f9f0ff',
+                        'borderRadius': '15px',
+                        'color': '#722ed1'
+                    })
+                ]) if next_pick else None
             ])
         ], style={'width': '25%', 'padding': '15px', 'borderRadius': '10px', 'boxShadow': '0 2px 8px rgba(0,0,0,0.1)'}),
         summary_card,
@@ -880,15 +944,30 @@ def update_team_analysis(selected_rows):
     
     return radar_fig, kpi_cards, recommendation_cards
 
-# Callback to filter Pokemon list
+# Serve the grid's rows: one sorted, filtered block per request
 @app.callback(
-    Output("row-selection-checkbox-header-filtered-only", "dashGridOptions"),
+    Output("row-selection-checkbox-header-filtered-only", "getRowsResponse"),
+    Input("row-selection-checkbox-header-filtered-only", "getRowsRequest"),
+    State("input-radio-row-selection-checkbox-header-filtered-only", "value"),
+)
+def serve_pokedex_rows(request, filter_value):
+    if not request:
+        return dash.no_update
+    try:
+        # Resolved per request so an edited CSV is picked up
+        return PokedexQuery.from_files("151pokemon.csv").get_rows(request, filter_value)
+    except ValueError as e:
+        print(f"Invalid grid query: {e}")
+        return {'rowData': [], 'rowCount': 0}
+
+# The quick filter is applied server-side, so a new filter text drops the
+# grid's loaded blocks and they are requested again (assets/pokedex_grid.js)
+app.clientside_callback(
+    ClientsideFunction(namespace="pokedex_grid", function_name="refresh"),
     Input("input-radio-row-selection-checkbox-header-filtered-only", "value"),
+    State("row-selection-checkbox-header-filtered-only", "id"),
+    prevent_initial_call=True,
 )
-def update_filter(filter_value):
-    gridOptions_patch = Patch()
-    gridOptions_patch["quickFilterText"] = filter_value
-    return gridOptions_patch
 
 # Callback to update individual Pokemon info (original functionality)
 @app.callback(
@@ -901,128 +980,23 @@ def display_pokemon_info(pokedex_number):
         return [html.Div([html.Pre(info_output)])]
     return ["Enter a valid Pokémon Pokédex number."]
 
-@app.callback(
+# Selected-team cards and their delete buttons are rendered in the browser
+# (assets/team_cards.js), straight from the grid selection
+app.clientside_callback(
+    ClientsideFunction(namespace="team_cards", function_name="render"),
     Output("selected-pokemon-display", "children"),
-    [Input("row-selection-checkbox-header-filtered-only", "selectedRows")]
+    Input("row-selection-checkbox-header-filtered-only", "selectedRows")
 )
-def update_selected_pokemon_display(selected_rows):
-    if not selected_rows or len(selected_rows) == 0:
-        return html.Div("No Pokémon selected yet. Select up to 6 Pokémon for your team.", 
-                       style={'textAlign': 'center', 'color': '#999'})
-    
-    team_data = selected_rows[:6]  # Limit to 6 Pokémon
-    
-    pokemon_cards = []
-    for i, pokemon in enumerate(team_data):
-        # Create a card for each selected Pokémon
-        pokemon_number = int(pokemon.get('pokedex', 0))
-        pokemon_name = pokemon.get('pokemon', 'Unknown')
-        type1 = pokemon.get('type1', '')
-        type2 = pokemon.get('type2', '')
-        
-        # Get type colors
-        type_colors = {
-            'Normal': '#A8A878', 'Fire': '#F08030', 'Water': '#6890F0', 'Electric': '#F8D030',
-            'Grass': '#78C850', 'Ice': '#98D8D8', 'Fighting': '#C03028', 'Poison': '#A040A0',
-            'Ground': '#E0C068', 'Flying': '#A890F0', 'Psychic': '#F85888', 'Bug': '#A8B820',
-            'Rock': '#B8A038', 'Ghost': '#705898', 'Dragon': '#7038F8', 'Dark': '#705848',
-            'Steel': '#B8B8D0', 'Fairy': '#EE99AC'
-        }
-        
-        type1_color = type_colors.get(type1, '#AAAAAA')
-        type2_color = type_colors.get(type2, '#AAAAAA')
-        
-        # Sprite URL (using PokeAPI sprites)
-        sprite_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_number}.png"
-        
-        # Create a delete button with a unique ID based on pokemon index
-        delete_button = html.Button(
-            "✕", 
-            id={'type': 'delete-button', 'index': i},
-            style={
-                'position': 'absolute',
-                'top': '5px',
-                'right': '5px',
-                'backgroundColor': '#ff4d4f',
-                'color': 'white',
-                'border': 'none',
-                'borderRadius': '50%',
-                'width': '24px',
-                'height': '24px',
-                'cursor': 'pointer',
-                'fontSize': '12px',
-                'display': 'flex',
-                'justifyContent': 'center',
-                'alignItems': 'center',
-                'padding': '0',
-            }
-        )
-        
-        card = html.Div([
-            delete_button,
-            html.Img(src=sprite_url, style={'width': '96px', 'height': '96px'}),
-            html.Div(pokemon_name, style={'fontWeight': 'bold', 'marginTop': '5px'}),
-            html.Div([
-                html.Span(type1, style={
-                    'backgroundColor': type1_color,
-                    'color': 'white',
-                    'padding': '2px 8px',
-                    'borderRadius': '10px',
-                    'fontSize': '12px',
-                    'marginRight': '5px' if type2 else '0px'
-                }),
-                html.Span(type2, style={
-                    'backgroundColor': type2_color,
-                    'color': 'white',
-                    'padding': '2px 8px',
-                    'borderRadius': '10px',
-                    'fontSize': '12px',
-                    'display': 'inline-block' if type2 else 'none'
-                })
-            ], style={'marginTop': '5px'})
-        ], style={
-            'width': '120px',
-            'textAlign': 'center',
-            'padding': '10px',
-            'backgroundColor': 'white',
-            'borderRadius': '10px',
-            'boxShadow': '0 2px 5px rgba(0,0,0,0.1)',
-            'position': 'relative'  # Added for absolute positioning of the delete button
-        })
-        
-        pokemon_cards.append(card)
-    
-    return pokemon_cards
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="team_cards", function_name="remove"),
     Output("row-selection-checkbox-header-filtered-only", "selectedRows"),
-    [Input({'type': 'delete-button', 'index': ALL}, 'n_clicks')],
-    [State("row-selection-checkbox-header-filtered-only", "selectedRows")]
+    Input({'type': 'delete-button', 'index': ALL}, 'n_clicks'),
+    State("row-selection-checkbox-header-filtered-only", "selectedRows")
 )
-def delete_pokemon(n_clicks, selected_rows):
-    # Check if any button was clicked
-    if not any(n_clicks) or not selected_rows:
-        return dash.no_update
-    
-    # Find which button was clicked
-    ctx = callback_context
-    if not ctx.triggered:
-        return dash.no_update
-    
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    try:
-        # Parse the JSON string to get the index
-        import json
-        button_data = json.loads(button_id)
-        index_to_remove = button_data['index']
-        
-        # Remove the pokemon at the specified index
-        if 0 <= index_to_remove < len(selected_rows):
-            selected_rows.pop(index_to_remove)
-            
-        return selected_rows
-    except:
-        return dash.no_update
+
+startup.mark("callbacks")
+print(f"⏱️ Startup: {startup.summary()}")
 
 
 if __name__ == "__main__":
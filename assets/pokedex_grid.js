@@ -0,0 +1,14 @@
+// The Pokédex grid uses AG Grid's infinite row model, so filtering happens
+// on the server. When the quick filter changes, the loaded blocks are
+// dropped and the grid asks the server for them again.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    pokedex_grid: {
+        refresh: function (filterValue, gridId) {
+            dash_ag_grid.getApiAsync(gridId).then(function (api) {
+                api.purgeInfiniteCache();
+                api.ensureIndexVisible(0, 'top');
+            });
+        }
+    }
+});
@@ -0,0 +1,88 @@
+// Clientside rendering of the selected-team cards and their delete buttons.
+// Colours come from team_cards.css and sprites from the atlas built into
+// assets/sprites (python -m src.sprite_atlas), so callbacks only ship class
+// names. Without a built atlas, cards load each sprite from PokeAPI.
+
+function teamCardComponent(type, props) {
+    return {namespace: 'dash_html_components', type: type, props: props};
+}
+
+// Dash links every stylesheet under assets/, so the atlas is there once built
+function hasSpriteAtlas() {
+    return document.querySelector('link[href*="sprites/atlas.css"]') !== null;
+}
+
+function teamCardSprite(number) {
+    if (hasSpriteAtlas()) {
+        // Offset into the local sprite atlas (assets/sprites/atlas.css)
+        return teamCardComponent('Div', {className: 'team-card-sprite sprite sprite-' + number});
+    }
+    return teamCardComponent('Img', {
+        className: 'team-card-sprite',
+        src: 'https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/' + number + '.png'
+    });
+}
+
+function teamCard(pokemon, index) {
+    var number = parseInt(pokemon.pokedex, 10) || 0;
+    var types = [pokemon.type1, pokemon.type2].filter(function (t) { return t; });
+
+    return teamCardComponent('Div', {
+        className: 'team-card',
+        children: [
+            teamCardComponent('Button', {
+                id: {type: 'delete-button', index: index},
+                className: 'team-card-delete',
+                n_clicks: 0,
+                children: '✕'
+            }),
+            teamCardSprite(number),
+            teamCardComponent('Div', {className: 'team-card-name', children: pokemon.pokemon || 'Unknown'}),
+            teamCardComponent('Div', {
+                className: 'team-card-types',
+                children: types.map(function (t) {
+                    return teamCardComponent('Span', {className: 'type-badge type-' + t, children: t});
+                })
+            })
+        ]
+    });
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    team_cards: {
+        // Cards for up to 6 selected rows
+        render: function (selectedRows) {
+            if (!selectedRows || selectedRows.length === 0) {
+                return teamCardComponent('Div', {
+                    className: 'team-card-empty',
+                    children: 'No Pokémon selected yet. Select up to 6 Pokémon for your team.'
+                });
+            }
+            return selectedRows.slice(0, 6).map(teamCard);
+        },
+
+        // Drop the row whose delete button was clicked
+        remove: function (nClicks, selectedRows) {
+            var noUpdate = window.dash_clientside.no_update;
+            if (!nClicks || !nClicks.some(function (n) { return n; }) || !selectedRows) {
+                return noUpdate;
+            }
+
+            var triggered = window.dash_clientside.callback_context.triggered;
+            if (!triggered || triggered.length === 0 || !triggered[0].value) {
+                return noUpdate;
+            }
+
+            try {
+                var propId = triggered[0].prop_id;
+                var index = JSON.parse(propId.slice(0, propId.lastIndexOf('.'))).index;
+                if (index < 0 || index >= selectedRows.length) {
+                    return noUpdate;
+                }
+                return selectedRows.filter(function (row, i) { return i !== index; });
+            } catch (e) {
+                return noUpdate;
+            }
+        }
+    }
+});
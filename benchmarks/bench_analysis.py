@@ -0,0 +1,166 @@
+"""
+Benchmarks for the team analysis hot path.
+
+Times the analysis functions, the Pokémon recommender, the Pokédex grid
+query, the chat assistant's instant handlers and the full KPI panel
+callback over randomized teams of 1-6 Pokémon. "cold" runs clear the
+team analysis caches before every call; "warm" runs repeat a team that
+is already cached.
+
+Usage:
+    python -m benchmarks.bench_analysis [--teams 300] [--seed 0] [--out FILE]
+
+Emits a JSON report so results can be tracked over time.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.equivalence import random_teams
+from src import pokemon_analysis
+from src.pokedex_query import query_pokedex
+from src.pokedex import Pokedex
+from src.pokemon_analysis import TeamAnalysis
+from src.recommender import recommend_pokemon
+
+
+def time_calls(func, inputs, clear_cache=False, warm=False):
+    """
+    Time one call of ``func`` per input.
+
+    Args:
+        func: Function taking a single input
+        inputs: Inputs to call it with
+        clear_cache: Clear the team analysis caches, speculative entries
+            included, before every call
+        warm: Call ``func`` on every input once, untimed, beforehand
+
+    Returns:
+        dict: calls, mean/median/p95/min/max latency in microseconds
+    """
+    samples = []
+    # Silence the per-call error prints some handlers emit
+    with contextlib.redirect_stdout(io.StringIO()):
+        if warm:
+            for item in inputs:
+                func(item)
+        for item in inputs:
+            if clear_cache:
+                TeamAnalysis.cache.clear()
+                TeamAnalysis.speculative.clear()
+            started = time.perf_counter_ns()
+            func(item)
+            samples.append((time.perf_counter_ns() - started) / 1000)
+    return {
+        'calls': len(samples),
+        'mean_us': statistics.fmean(samples),
+        'median_us': statistics.median(samples),
+        'p95_us': float(np.percentile(samples, 95)),
+        'min_us': min(samples),
+        'max_us': max(samples),
+    }
+
+
+def _load_app():
+    """Import app.py for the handler and callback benchmarks, if its dependencies are installed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    return app
+
+
+def run(team_count=300, seed=0):
+    """
+    Run every benchmark.
+
+    Args:
+        team_count: Random teams (and Pokédex lookups) per benchmark
+        seed: Random seed
+
+    Returns:
+        dict: 'meta' describing the run and 'results' keyed by benchmark name
+    """
+    teams = random_teams(team_count, seed)
+    rng = random.Random(seed)
+    # Lookups of Pokémon that exist in the CSV the analysis functions use
+    pokedex_numbers = Pokedex.load("151pokemon.csv").numbers.tolist()
+    numbers = [rng.choice(pokedex_numbers) for _ in range(team_count)]
+    results = {}
+
+    # Load the chart and Pokédex once so the first timed call isn't a cold parse
+    pokemon_analysis.calculate_team_kpis(teams[0])
+    pokemon_analysis.pokemon_info(1)
+    # Keep every team cached for the warm runs
+    TeamAnalysis.cache.maxsize = max(TeamAnalysis.cache.maxsize, 4 * team_count)
+
+    results['calculate_type_effectiveness'] = time_calls(pokemon_analysis.calculate_type_effectiveness, teams)
+    results['calculate_team_kpis[cold]'] = time_calls(pokemon_analysis.calculate_team_kpis, teams, clear_cache=True)
+    results['calculate_team_kpis[warm]'] = time_calls(pokemon_analysis.calculate_team_kpis, teams, warm=True)
+    results['generate_team_summary[cold]'] = time_calls(pokemon_analysis.generate_team_summary, teams, clear_cache=True)
+    results['generate_team_summary[warm]'] = time_calls(pokemon_analysis.generate_team_summary, teams, warm=True)
+    results['get_pokemon_info'] = time_calls(pokemon_analysis.pokemon_info, numbers)
+    results['recommend_pokemon'] = time_calls(recommend_pokemon, [team[:5] for team in teams])
+    # One grid block: a random page, sorted by type then name, quick-filtered
+    sort_model = [{'colId': 'type1', 'sort': 'asc'}, {'colId': 'pokemon', 'sort': 'desc'}]
+    results['query_pokedex'] = time_calls(
+        lambda team: query_pokedex(rng.randrange(0, len(pokedex_numbers)), None, sort_model, None,
+                                   team[0]['type1'][:3]),
+        teams)
+
+    try:
+        app = _load_app()
+    except ImportError as e:
+        results['app'] = {'skipped': f"app.py could not be imported: {e}"}
+    else:
+        assistant = app.chat_assistant
+        for handler in ('get_instant_analysis', 'get_instant_weaknesses', 'get_instant_suggestions',
+                        'get_instant_rating'):
+            results[f'{handler}[cold]'] = time_calls(getattr(assistant, handler), teams, clear_cache=True)
+
+        def kpi_panel(team):
+            # Selection change -> session update -> KPI panel, as Dash runs them
+            team_session, _ = app.update_current_team(team, 'benchmark')
+            return app.update_team_analysis(team_session)
+
+        results['update_team_analysis[cold]'] = time_calls(kpi_panel, teams, clear_cache=True)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            'commit': commit or None,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'teams': team_count,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the team analysis layer.")
+    parser.add_argument("--teams", type=int, default=300, help="Random teams per benchmark (default: 300)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args.teams, args.seed), indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    else:
+        sys.stdout.write(report + "\n")
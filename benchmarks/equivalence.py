@@ -0,0 +1,114 @@
+"""
+Legacy-equivalence harness for the team analysis engines.
+
+Every engine must produce byte-identical KPIs (compared as JSON) to the
+dictionary-based reference in benchmarks/reference.py over randomized
+teams of 1-6 Pokémon plus a few edge cases.
+
+Usage:
+    python -m benchmarks.equivalence [--teams 2000] [--seed 0] [--out FILE]
+
+Prints (or writes) a JSON report and exits non-zero on any mismatch.
+"""
+import argparse
+import json
+import random
+import sys
+
+from benchmarks import reference
+from src.batch_scoring import team_kpis
+from src.pokedex import Pokedex
+from src.pokemon_analysis import TeamAnalysis
+from src.type_chart import TypeChart
+
+EDGE_TEAMS = [
+    [],
+    [{'pokemon': 'Solo', 'type1': 'Normal', 'type2': None}],
+    [{'pokemon': 'Same', 'type1': 'Fire', 'type2': 'Fire'}],
+    [{'pokemon': 'Blank', 'type1': '', 'type2': 'Water'}, {'pokemon': 'Ghost', 'type1': 'Ghost', 'type2': ''}],
+]
+
+
+def random_teams(count, seed=0, pokemon_csv_path="151pokemon.csv"):
+    """
+    Randomized teams of 1-6 Pokédex entries (repeats allowed, as in the app's grid).
+
+    Args:
+        count: Number of teams
+        seed: Random seed
+        pokemon_csv_path: Path to the Pokemon CSV file
+
+    Returns:
+        list: Teams as lists of Pokédex entry dicts
+    """
+    rng = random.Random(seed)
+    entries = list(Pokedex.load(pokemon_csv_path))
+    return [[rng.choice(entries) for _ in range(rng.randint(1, 6))] for _ in range(count)]
+
+
+def _uncached_kpis(team, types_csv_path):
+    TeamAnalysis.cache.clear()
+    return TeamAnalysis.calculate_team_kpis(team, types_csv_path)
+
+
+def _cached_kpis(team, types_csv_path):
+    TeamAnalysis.calculate_team_kpis(team, types_csv_path)
+    return TeamAnalysis.calculate_team_kpis(team, types_csv_path)
+
+
+def _batch_kpis(team, types_csv_path):
+    kpis = TeamAnalysis.score_teams([team], types_csv_path)
+    return team_kpis(kpis, 0, TypeChart.load(types_csv_path))
+
+
+# Engine name -> function(team, types_csv_path) returning a KPI dict
+ENGINES = {
+    'calculate_team_kpis': _uncached_kpis,
+    'calculate_team_kpis[cached]': _cached_kpis,
+    'score_teams': _batch_kpis,
+}
+
+
+def check(teams, types_csv_path="types.csv", engines=None, max_examples=5):
+    """
+    Compare engines against the reference implementation.
+
+    Args:
+        teams: List of teams
+        types_csv_path: Path to the types CSV file
+        engines: Dict of engines to check (defaults to ENGINES)
+        max_examples: Mismatching teams kept per engine in the report
+
+    Returns:
+        dict: Per engine, 'teams' checked, 'mismatches' and 'examples'
+    """
+    expected = [json.dumps(reference.calculate_team_kpis(team, types_csv_path)) for team in teams]
+    report = {}
+    for name, engine in (engines or ENGINES).items():
+        mismatches = 0
+        examples = []
+        for team, want in zip(teams, expected):
+            got = json.dumps(engine(team, types_csv_path))
+            if got != want:
+                mismatches += 1
+                if len(examples) < max_examples:
+                    examples.append({'team': team, 'expected': json.loads(want), 'got': json.loads(got)})
+        report[name] = {'teams': len(teams), 'mismatches': mismatches, 'examples': examples}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check analysis engines against the reference KPIs.")
+    parser.add_argument("--teams", type=int, default=2000, help="Random teams to check (default: 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = check(EDGE_TEAMS + random_teams(args.teams, args.seed))
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    sys.exit(1 if any(result['mismatches'] for result in report.values()) else 0)
@@ -0,0 +1,138 @@
+"""
+Reference implementation of the team KPIs.
+
+A direct, dictionary-based port of the original TeamAnalysis code (before
+the type chart was vectorized) that any faster engine must match exactly.
+The only intended difference from the original is that a repeated type
+(Fire/Fire) counts once, like the profile table in src/type_chart.py.
+"""
+import csv
+
+
+def load_type_chart(types_csv_path="types.csv"):
+    """
+    Read types.csv into an ``{attacking: {defending: multiplier}}`` dict.
+
+    Returns:
+        tuple: (defending types in column order, nested dict)
+    """
+    with open(types_csv_path, "r", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        defending_types = [col for col in reader.fieldnames if col != "Type"]
+        chart = {row["Type"]: {t: float(row[t]) for t in defending_types} for row in reader}
+    return defending_types, chart
+
+
+def calculate_type_effectiveness(team_data, types_csv_path="types.csv"):
+    """Per-type defensive and offensive scores, computed one member at a time."""
+    all_types, chart = load_type_chart(types_csv_path)
+    defensive_metrics = {t: 0 for t in all_types}
+    offensive_metrics = {t: 0 for t in all_types}
+
+    for pokemon in team_data:
+        type1 = pokemon.get('type1')
+        type2 = pokemon.get('type2')
+
+        if not type1 or type1 == 'None':
+            continue
+        if type2 == type1:
+            type2 = None
+
+        try:
+            for t in all_types:
+                value = chart[t][type1]
+                if type2 and type2 != 'None':
+                    value *= chart[t][type2]
+                if value == 4.0:
+                    defensive_metrics[t] += 2
+                elif value == 2.0:
+                    defensive_metrics[t] += 1
+                elif value == 0.5:
+                    defensive_metrics[t] += -1
+                elif value == 0.25:
+                    defensive_metrics[t] += -2
+                elif value == 0:
+                    defensive_metrics[t] += -3
+        except KeyError as e:
+            print(f"Error processing defensive metrics for {type1}/{type2}: {e}")
+
+        try:
+            for stab_type in (type1, type2):
+                if not stab_type or stab_type == 'None':
+                    continue
+                for t in all_types:
+                    value = chart[stab_type][t]
+                    if value == 2.0:
+                        offensive_metrics[t] += 1
+                    elif value == 0.5:
+                        offensive_metrics[t] += -1
+                    elif value == 0:
+                        offensive_metrics[t] += -3
+        except KeyError as e:
+            print(f"Error processing offensive metrics for {type1}/{type2}: {e}")
+
+    return defensive_metrics, offensive_metrics
+
+
+def recommend_types_for_defense(vulnerable_types, types_csv_path="types.csv"):
+    """Top 5 types resisting the team's 3 worst vulnerabilities."""
+    all_types, chart = load_type_chart(types_csv_path)
+    scores = {t: 0 for t in chart}
+    for v_type in vulnerable_types[:3]:
+        for def_type in scores:
+            effectiveness = chart[v_type][def_type]
+            if effectiveness < 1.0:
+                scores[def_type] += (1.0 - effectiveness) * 2
+            elif effectiveness > 1.0:
+                scores[def_type] -= (effectiveness - 1.0)
+    return [t for t, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]]
+
+
+def recommend_types_for_offense(offensive_gaps, types_csv_path="types.csv"):
+    """Top 5 types hitting the team's 3 worst offensive gaps."""
+    all_types, chart = load_type_chart(types_csv_path)
+    scores = {t: 0 for t in chart}
+    for gap_type in offensive_gaps[:3]:
+        for atk_type in scores:
+            effectiveness = chart[atk_type][gap_type]
+            if effectiveness > 1.0:
+                scores[atk_type] += (effectiveness - 1.0) * 2
+    return [t for t, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]]
+
+
+def calculate_team_kpis(team_data, types_csv_path="types.csv"):
+    """
+    Team KPIs in the calculate_team_kpis format.
+
+    ``missing_types`` is listed in chart order; the original built it from
+    a set, so its order was arbitrary.
+    """
+    defensive_metrics, offensive_metrics = calculate_type_effectiveness(team_data, types_csv_path)
+    all_types = list(defensive_metrics.keys())
+    team_size = len(team_data)
+
+    vulnerable_types = [t for t in all_types if defensive_metrics[t] > 0]
+    vulnerable_types.sort(key=lambda t: defensive_metrics[t], reverse=True)
+    offensive_gaps = [t for t in all_types if offensive_metrics[t] <= -1]
+    offensive_gaps.sort(key=lambda t: offensive_metrics[t])
+
+    unique_types = set()
+    for pokemon in team_data:
+        for key in ('type1', 'type2'):
+            if pokemon.get(key) and pokemon.get(key) != 'None':
+                unique_types.add(pokemon.get(key))
+
+    return {
+        'defensive_metrics': defensive_metrics,
+        'offensive_metrics': offensive_metrics,
+        'defensive_vulnerability_index': sum(defensive_metrics.values()),
+        'team_coverage_score': (sum(1 for v in defensive_metrics.values() if v < 0) / len(all_types)) * 100,
+        'defensive_holes': sum(1 for v in defensive_metrics.values() if v >= (team_size / 2)),
+        'type_coverage_index': (sum(1 for v in offensive_metrics.values() if v > 0) / len(all_types)) * 100,
+        'stab_diversity': len(unique_types),
+        'vulnerable_types': vulnerable_types[:3],
+        'offensive_gaps': offensive_gaps[:3],
+        'missing_types': [t for t in all_types if t not in unique_types],
+        'defensive_recommendations': recommend_types_for_defense(vulnerable_types, types_csv_path),
+        'offensive_recommendations': recommend_types_for_offense(offensive_gaps, types_csv_path),
+    }
@@ -0,0 +1,198 @@
+import hashlib
+import json
+
+from src.batch_scoring import MAX_TEAM_SIZE, team_kpis
+from src.pokedex import Pokedex
+from src.pokedex_query import PokedexQuery
+from src.pokemon_analysis import TeamAnalysis
+from src.type_chart import TypeChart
+
+# Teams accepted by one /api/teams/analyze-batch request
+MAX_BATCH_TEAMS = 10000
+
+
+class ApiError(ValueError):
+    """A request the API rejects, with the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def resolve_member(member, pokedex, chart=None):
+    """
+    Turn one team member from a request into a Pokémon dict.
+
+    Args:
+        member: Pokédex number, Pokémon name, or a dict with a 'type1' and
+            an optional 'type2' type name
+        pokedex: Pokedex to look numbers and names up in
+        chart: TypeChart whose types a dict member may use, or None to only
+            check that its types are strings
+
+    Returns:
+        dict: Pokédex entry, or the member dict itself
+
+    Raises:
+        ApiError: If the Pokémon is unknown or the member is malformed
+    """
+    if isinstance(member, dict):
+        for field in ('type1', 'type2'):
+            value = member.get(field)
+            if field == 'type1' and not value:
+                raise ApiError(f"Team member {member!r} needs a 'type1'")
+            if value in (None, ''):
+                continue
+            if not isinstance(value, str):
+                raise ApiError(f"Team member {member!r} has a non-string '{field}'")
+            if chart is not None and value not in chart.type_ids:
+                raise ApiError(f"Team member {member!r} has an unknown type: {value!r}")
+        return member
+    if isinstance(member, bool):
+        raise ApiError(f"Unknown Pokémon: {member!r}")
+    if isinstance(member, int):
+        entry = pokedex.get(member)
+    elif isinstance(member, str):
+        entry = pokedex.get(int(member)) if member.strip().isdigit() else pokedex.get_by_name(member.strip())
+    else:
+        entry = None
+    if entry is None:
+        raise ApiError(f"Unknown Pokémon: {member!r}", 404 if isinstance(member, (int, str)) else 400)
+    return entry
+
+
+def resolve_team(members, pokedex, chart=None):
+    """
+    Resolve a request's team, checking its size.
+
+    Args:
+        members: List of members as accepted by resolve_member
+        pokedex: Pokedex to look numbers and names up in
+        chart: TypeChart whose types dict members may use, or None to only
+            check that their types are strings
+
+    Returns:
+        list: Pokémon dicts
+
+    Raises:
+        ApiError: If the team isn't a list of 1-6 known members
+    """
+    if not isinstance(members, list) or not members:
+        raise ApiError("A team must be a non-empty list of Pokémon")
+    if len(members) > MAX_TEAM_SIZE:
+        raise ApiError(f"Teams can have at most {MAX_TEAM_SIZE} members, got {len(members)}")
+    return [resolve_member(member, pokedex, chart) for member in members]
+
+
+def register_api(server, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+    """
+    Serve team analysis as JSON on a Flask server, without the Dash UI.
+
+    Routes:
+        GET /api/pokemon?start=0&end=100&sort=-type1,pokemon&q=fire: One
+            page of the Pokédex, sorted by the listed columns ('-' for
+            descending) and quick-filtered, as {"rowData": [...], "rowCount": n}
+        POST /api/pokemon/query: The same for an AG Grid getRowsRequest
+            {"startRow", "endRow", "sortModel", "filterModel"} with an
+            optional "quickFilter"
+        GET /api/pokemon/<number>: The Pokédex entry
+        GET /api/team/analyze?pokemon=1,4,7: calculate_team_kpis for a team
+            of Pokédex numbers or names
+        POST /api/team/analyze: The same for {"team": [...]}, whose members
+            may also be dicts with 'type1'/'type2'
+        POST /api/teams/analyze-batch: {"teams": [[...], ...]} scored with
+            the vectorized engine, answered as {"results": [...]} in order
+
+    Every response carries an ETag hashed from its body; a request whose
+    If-None-Match matches gets an empty 304 instead. Errors are JSON
+    objects with an 'error' message.
+
+    Args:
+        server: The Flask server (app.server for a Dash app)
+        pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+        types_csv_path: Path to the types CSV file (defaults to "types.csv")
+    """
+    import flask
+
+    def json_response(payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        response = flask.Response(body, status=status, mimetype="application/json")
+        if status == 200:
+            response.set_etag(hashlib.sha1(body).hexdigest())
+            # Cacheable, but revalidated against the ETag on every use
+            response.headers["Cache-Control"] = "no-cache"
+            response = response.make_conditional(flask.request)
+        return response
+
+    def request_json(key):
+        body = flask.request.get_json(silent=True)
+        if not isinstance(body, dict) or key not in body:
+            raise ApiError(f"Expected a JSON object with a '{key}' list")
+        return body[key]
+
+    @server.errorhandler(ApiError)
+    def api_error(error):
+        return json_response({'error': str(error)}, error.status)
+
+    def query_rows(start_row, end_row, sort_model, filter_model, quick_filter):
+        try:
+            return PokedexQuery.from_files(pokemon_csv_path).rows(
+                start_row, end_row, sort_model, filter_model, quick_filter)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ApiError(f"Invalid Pokédex query: {e}") from None
+
+    @server.route("/api/pokemon")
+    def api_pokemon_page():
+        args = flask.request.args
+        sort_model = [
+            {'colId': column.lstrip('-'), 'sort': 'desc' if column.startswith('-') else 'asc'}
+            for column in (c.strip() for c in args.get("sort", "").split(",")) if column
+        ]
+        return json_response(query_rows(args.get("start", 0), args.get("end", 100), sort_model, None, args.get("q")))
+
+    @server.route("/api/pokemon/query", methods=["POST"])
+    def api_pokemon_query():
+        body = flask.request.get_json(silent=True)
+        if not isinstance(body, dict):
+            raise ApiError("Expected a JSON object with 'startRow' and 'endRow'")
+        return json_response(query_rows(body.get('startRow'), body.get('endRow'), body.get('sortModel'),
+                                        body.get('filterModel'), body.get('quickFilter')))
+
+    @server.route("/api/pokemon/<int:number>")
+    def api_pokemon(number):
+        entry = Pokedex.load(pokemon_csv_path).get(number)
+        if entry is None:
+            raise ApiError(f"Unknown Pokémon: {number}", 404)
+        return json_response(entry)
+
+    @server.route("/api/team/analyze", methods=["GET", "POST"])
+    def api_analyze_team():
+        if flask.request.method == "GET":
+            members = [m for m in flask.request.args.get("pokemon", "").split(",") if m.strip()]
+        else:
+            members = request_json("team")
+        team = resolve_team(members, Pokedex.load(pokemon_csv_path), TypeChart.load(types_csv_path))
+        return json_response({'team': team, 'kpis': TeamAnalysis.calculate_team_kpis(team, types_csv_path)})
+
+    @server.route("/api/teams/analyze-batch", methods=["POST"])
+    def api_analyze_batch():
+        teams = request_json("teams")
+        if not isinstance(teams, list):
+            raise ApiError("'teams' must be a list of teams")
+        if len(teams) > MAX_BATCH_TEAMS:
+            raise ApiError(f"At most {MAX_BATCH_TEAMS} teams per request, got {len(teams)}", 413)
+
+        pokedex = Pokedex.load(pokemon_csv_path)
+        chart = TypeChart.load(types_csv_path)
+        resolved = []
+        for i, members in enumerate(teams):
+            try:
+                resolved.append(resolve_team(members, pokedex, chart))
+            except ApiError as e:
+                raise ApiError(f"Team {i}: {e}", e.status) from None
+
+        try:
+            kpis = TeamAnalysis.score_teams(resolved, types_csv_path)
+        except ValueError as e:
+            raise ApiError(str(e)) from None
+        return json_response({'results': [team_kpis(kpis, i, chart) for i in range(len(resolved))]})
@@ -0,0 +1,241 @@
+import numpy as np
+
+from src.type_chart import clean_type
+
+MAX_TEAM_SIZE = 6
+
+# Scalar KPIs, in the same order as calculate_team_kpis
+SCALAR_KPIS = (
+    'defensive_vulnerability_index',
+    'team_coverage_score',
+    'defensive_holes',
+    'type_coverage_index',
+    'stab_diversity',
+)
+
+
+def encode_teams(teams, chart):
+    """
+    Encode teams as an (N, 6, 2) array of type IDs.
+
+    Empty slots and missing types are ``chart.no_type``. A member without
+    a primary type contributes no metrics but still counts towards the
+    team size and type diversity, matching calculate_team_kpis.
+
+    Args:
+        teams: Iterable of teams; each team is a list of Pokémon dicts with
+            'type1'/'type2' keys or of (type1, type2) pairs
+        chart: TypeChart the IDs refer to
+
+    Returns:
+        tuple: (encoded, team_sizes) with encoded of shape (N, 6, 2) and
+        team_sizes of shape (N,)
+
+    Raises:
+        ValueError: If a team has more than 6 members or uses a type that
+            isn't a type name in the chart
+    """
+    no_type = chart.no_type
+    type_ids = chart.type_ids
+    encoded = []
+    team_sizes = []
+
+    for team in teams:
+        if len(team) > MAX_TEAM_SIZE:
+            raise ValueError(f"Teams can have at most {MAX_TEAM_SIZE} members, got {len(team)}")
+        slots = [(no_type, no_type)] * MAX_TEAM_SIZE
+        for i, member in enumerate(team):
+            if isinstance(member, dict):
+                type1, type2 = clean_type(member.get('type1')), clean_type(member.get('type2'))
+            else:
+                type1, type2 = clean_type(member[0]), clean_type(member[1] if len(member) > 1 else None)
+            for type_name in (type1, type2):
+                if type_name is not None and not isinstance(type_name, str):
+                    raise ValueError(f"Type {type_name!r} in team {team!r} is not a type name")
+            try:
+                # A member without a primary type scores nothing, but its
+                # second type still counts towards stab_diversity
+                slots[i] = (type_ids[type1] if type1 is not None else no_type,
+                            type_ids[type2] if type2 is not None else no_type)
+            except KeyError as e:
+                raise ValueError(f"Unknown type {e.args[0]!r} in team {team!r}") from None
+        encoded.append(slots)
+        team_sizes.append(len(team))
+
+    encoded = np.array(encoded, dtype=np.intp).reshape(-1, MAX_TEAM_SIZE, 2)
+    return encoded, np.array(team_sizes, dtype=np.int64)
+
+
+def _recommendation_rows(chart):
+    """
+    Per-type score rows behind recommend_types_for_defense/_offense, with a
+    trailing zero row for padding.
+    """
+    n = len(chart)
+    defense_rows = np.zeros((n + 1, n))
+    offense_rows = np.zeros((n + 1, n))
+
+    # Row v: how well each defending type holds up against attacking type v
+    eff = chart.matrix
+    defense_rows[:n] = np.where(eff < 1.0, (1.0 - eff) * 2, np.where(eff > 1.0, -(eff - 1.0), 0.0))
+    # Row g: how well each attacking type hits gap type g
+    eff = chart.matrix.T
+    offense_rows[:n] = np.where(eff > 1.0, (eff - 1.0) * 2, 0.0)
+    return defense_rows, offense_rows
+
+
+def _top_types(keys, valid, count):
+    """
+    Stable ranking of type IDs by ascending key, keeping only ``valid`` types.
+
+    Returns an (N, count) array padded with -1.
+    """
+    ranked = np.argsort(np.where(valid, keys, np.inf), axis=1, kind='stable')[:, :count]
+    kept = np.take_along_axis(valid, ranked, axis=1)
+    return np.where(kept, ranked, -1)
+
+
+def _recommend(score_rows, focus, count):
+    """Top ``count`` types for the summed score rows of up to 3 focus types per team."""
+    totals = np.zeros((focus.shape[0], score_rows.shape[1]))
+    for j in range(focus.shape[1]):
+        # Accumulate one focus type at a time, like the per-team loop
+        totals = totals + score_rows[focus[:, j]]
+    return np.argsort(-totals, axis=1, kind='stable')[:, :count]
+
+
+def score_encoded(encoded, team_sizes, chart):
+    """
+    Vectorized calculate_team_kpis for encoded teams.
+
+    Args:
+        encoded: (N, 6, 2) array of type IDs from encode_teams
+        team_sizes: (N,) number of members per team
+        chart: TypeChart the IDs refer to
+
+    Returns:
+        dict: KPI arrays keyed like calculate_team_kpis. Metric dicts become
+        (N, types) arrays, type lists become arrays of type IDs padded with
+        -1, and missing_types is an (N, types) boolean mask.
+    """
+    n_types = len(chart)
+    type1 = encoded[:, :, 0]
+    type2 = encoded[:, :, 1]
+
+    defensive = chart.pair_defense[type1, type2].sum(axis=1, dtype=np.int64)
+    offensive = chart.pair_offense[type1, type2].sum(axis=1, dtype=np.int64)
+
+    types_resisted = (defensive < 0).sum(axis=1)
+    super_effective_count = (offensive > 0).sum(axis=1)
+    defensive_holes = (defensive >= (team_sizes / 2)[:, None]).sum(axis=1)
+
+    # Unique types present in each team
+    present = np.zeros((len(encoded), n_types + 1), dtype=bool)
+    rows = np.arange(len(encoded))[:, None]
+    present[rows, type1] = True
+    present[rows, type2] = True
+    present = present[:, :n_types]
+
+    vulnerable_types = _top_types(-defensive, defensive > 0, 3)
+    offensive_gaps = _top_types(offensive, offensive <= -1, 3)
+
+    defense_rows, offense_rows = _recommendation_rows(chart)
+    defensive_recommendations = _recommend(defense_rows, vulnerable_types, 5)
+    offensive_recommendations = _recommend(offense_rows, offensive_gaps, 5)
+
+    return {
+        'defensive_metrics': defensive,
+        'offensive_metrics': offensive,
+        'defensive_vulnerability_index': defensive.sum(axis=1),
+        'team_coverage_score': types_resisted / n_types * 100,
+        'defensive_holes': defensive_holes,
+        'type_coverage_index': super_effective_count / n_types * 100,
+        'stab_diversity': present.sum(axis=1),
+        'vulnerable_types': vulnerable_types,
+        'offensive_gaps': offensive_gaps,
+        'missing_types': ~present,
+        'defensive_recommendations': defensive_recommendations,
+        'offensive_recommendations': offensive_recommendations,
+    }
+
+
+def kpis_to_frame(kpis, chart):
+    """
+    Tabulate batch KPIs, one row per team.
+
+    Scalar KPIs become columns, type-ID arrays become lists of type names and
+    the per-type metrics become ``defensive_<Type>``/``offensive_<Type>`` columns.
+
+    Args:
+        kpis: Dictionary returned by score_encoded
+        chart: TypeChart the IDs refer to
+
+    Returns:
+        pandas.DataFrame: The KPI table
+    """
+    # pandas is only needed here, so importing the scoring engine stays cheap
+    import pandas as pd
+
+    names = np.array(chart.types + ('',), dtype=object)
+    frame = pd.DataFrame({kpi: kpis[kpi] for kpi in SCALAR_KPIS})
+
+    for kpi in ('vulnerable_types', 'offensive_gaps', 'defensive_recommendations', 'offensive_recommendations'):
+        frame[kpi] = [[t for t in row if t] for row in names[kpis[kpi]].tolist()]
+    frame['missing_types'] = [[chart.types[i] for i in np.flatnonzero(row)] for row in kpis['missing_types']]
+
+    metrics = pd.DataFrame(
+        np.hstack([kpis['defensive_metrics'], kpis['offensive_metrics']]),
+        columns=[f'defensive_{t}' for t in chart.types] + [f'offensive_{t}' for t in chart.types],
+    )
+    return pd.concat([frame, metrics], axis=1)
+
+
+def weighted_objective(kpis, weights):
+    """
+    Weighted sum of scalar KPIs for every team.
+
+    Args:
+        kpis: Dictionary returned by score_encoded
+        weights: Dict of weights keyed by scalar KPI names
+
+    Returns:
+        numpy.ndarray: Objective value per team
+    """
+    unknown = set(weights) - set(SCALAR_KPIS)
+    if unknown:
+        raise ValueError(f"Unsupported objective metrics: {sorted(unknown)}")
+    total = np.zeros(len(kpis['team_coverage_score']))
+    for kpi, weight in weights.items():
+        total = total + weight * kpis[kpi]
+    return total
+
+
+def team_kpis(kpis, i, chart):
+    """
+    One team's KPIs from a batch, in the calculate_team_kpis format.
+
+    Args:
+        kpis: Dictionary returned by score_encoded
+        i: Index of the team in the batch
+        chart: TypeChart the IDs refer to
+
+    Returns:
+        dict: Dictionary of KPI values and type recommendations
+    """
+    def names(ids):
+        return [chart.types[t] for t in ids.tolist() if t >= 0]
+
+    return {
+        'defensive_metrics': dict(zip(chart.types, kpis['defensive_metrics'][i].tolist())),
+        'offensive_metrics': dict(zip(chart.types, kpis['offensive_metrics'][i].tolist())),
+        'defensive_vulnerability_index': int(kpis['defensive_vulnerability_index'][i]),
+        'team_coverage_score': float(kpis['team_coverage_score'][i]),
+        'defensive_holes': int(kpis['defensive_holes'][i]),
+        'type_coverage_index': float(kpis['type_coverage_index'][i]),
+        'stab_diversity': int(kpis['stab_diversity'][i]),
+        'vulnerable_types': names(kpis['vulnerable_types'][i]),
+        'offensive_gaps': names(kpis['offensive_gaps'][i]),
+        'missing_types': [chart.types[t] for t in np.flatnonzero(kpis['missing_types'][i])],
+        'defensive_recommendations': names(kpis['defensive_recommendations'][i]),
+        'offensive_recommendations': names(kpis['offensive_recommendations'][i]),
+    }
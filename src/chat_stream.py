@@ -0,0 +1,125 @@
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# deepseek-r1 wraps its reasoning in <think> tags before the answer
+THINK_BLOCK = re.compile(r'<think>.*?</think>', flags=re.DOTALL)
+
+
+def visible_answer(text):
+    """
+    The part of a (possibly partial) model response that should be shown.
+
+    Completed reasoning blocks are removed, and an unfinished one hides
+    everything after its opening tag until the closing tag streams in.
+
+    Args:
+        text: Response text received so far
+
+    Returns:
+        str: Text to display
+    """
+    text = THINK_BLOCK.sub('', text)
+    start = text.find('<think>')
+    if start != -1:
+        text = text[:start]
+    return text.strip()
+
+
+class ChatJobs:
+    """
+    Run streaming LLM requests on worker threads so callbacks return at once.
+
+    A job accumulates the chunks of its token stream in a SQLite table;
+    callers poll it for the text received so far until it is done. Since
+    the table is a file, a poll can be answered by any process sharing it
+    (e.g. another gunicorn worker than the one streaming the answer). Jobs
+    are dropped once read to completion or after ``ttl`` seconds without
+    progress.
+    """
+
+    def __init__(self, path="llm_cache.sqlite3", max_workers=4, ttl=600, flush_interval=0.2):
+        """
+        Args:
+            path: SQLite database file shared by the workers (":memory:"
+                for jobs visible to this process only)
+            max_workers: Number of requests streamed concurrently
+            ttl: Seconds after which a job that stopped updating is discarded
+            flush_interval: Seconds between writes of a job's partial text
+        """
+        self.path = path
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chat")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_jobs ("
+                " job_id TEXT PRIMARY KEY, text TEXT, done INTEGER, error TEXT, updated REAL)"
+            )
+
+    def submit(self, stream_factory):
+        """
+        Start a job in the background.
+
+        Args:
+            stream_factory: Callable returning an iterator of text chunks
+
+        Returns:
+            str: Job ID to poll
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chat_jobs WHERE updated < ?", (now - self.ttl,))
+            self._conn.execute("INSERT INTO chat_jobs VALUES (?, '', 0, NULL, ?)", (job_id, now))
+        self._executor.submit(self._run, job_id, stream_factory)
+        return job_id
+
+    def _save(self, job_id, text, done=False, error=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE chat_jobs SET text = ?, done = ?, error = ?, updated = ? WHERE job_id = ?",
+                (text, int(done), error, time.time(), job_id),
+            )
+
+    def _run(self, job_id, stream_factory):
+        chunks = []
+        error = None
+        last_flush = time.monotonic()
+        try:
+            for chunk in stream_factory():
+                chunks.append(chunk)
+                # Partial text is written every flush_interval, not per token
+                if time.monotonic() - last_flush >= self.flush_interval:
+                    self._save(job_id, ''.join(chunks))
+                    last_flush = time.monotonic()
+        except Exception as e:
+            error = str(e)
+        finally:
+            self._save(job_id, ''.join(chunks), True, error)
+
+    def poll(self, job_id):
+        """
+        Text streamed so far for a job.
+
+        Args:
+            job_id: ID returned by submit
+
+        Returns:
+            dict or None: 'text', 'done' and 'error' (None unless the stream
+            failed), or None for an unknown or expired job. A finished job is
+            forgotten once polled.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT text, done, error, updated FROM chat_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None or time.time() - row[3] > self.ttl:
+                return None
+            if row[1]:
+                self._conn.execute("DELETE FROM chat_jobs WHERE job_id = ?", (job_id,))
+        return {'text': row[0], 'done': bool(row[1]), 'error': row[2]}
@@ -0,0 +1,264 @@
+import bisect
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow LLM calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Response size buckets in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        """Add ``amount`` to the series for the given label values."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_label_text(self.labels, key)} {value}" for key, value in items]
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """Record one observation for the given label values."""
+        # Only the matching bucket is incremented; render() accumulates
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_label_text(self.labels + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrics exposed in the Prometheus text format.
+
+    Counters and histograms are updated in place at a small fixed cost
+    (a lock and a dict update); gauges from collectors are only computed
+    when the registry is rendered, i.e. when someone scrapes /metrics.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labels=()):
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """
+        Add a scrape-time gauge source.
+
+        Args:
+            collector: Callable returning (name, documentation, labels, samples)
+                tuples, samples being a list of (label values, value)
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text
+        """
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            for name, documentation, labels, samples in collector():
+                lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+                lines += [f"{name}{_label_text(labels, key)} {value}" for key, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Shared metrics updated across the code base
+TYPE_CHART_LOADS = REGISTRY.counter("pokemon_type_chart_loads_total", "Type charts parsed from CSV")
+SNAPSHOT_LOADS = REGISTRY.counter("pokemon_snapshot_loads_total", "Data snapshots memory-mapped", ("kind",))
+LLM_CALLS = REGISTRY.counter("pokemon_llm_calls_total", "Requests sent to the LLM", ("outcome",))
+CALLBACK_CALLS = REGISTRY.counter("pokemon_callback_calls_total", "Dash callback requests", ("callback",))
+CALLBACK_ERRORS = REGISTRY.counter("pokemon_callback_errors_total", "Dash callback requests that failed", ("callback",))
+CALLBACK_LATENCY = REGISTRY.histogram(
+    "pokemon_callback_latency_seconds", "Dash callback request latency", ("callback",))
+CALLBACK_PAYLOAD = REGISTRY.histogram(
+    "pokemon_callback_response_bytes", "Dash callback response size", ("callback",), buckets=SIZE_BUCKETS)
+
+
+def cache_collector(caches):
+    """
+    Collector reporting hits, misses, hit rate and size of named caches.
+
+    Args:
+        caches: Dict of cache name to an object with an info() method like
+            LRUCache.info
+
+    Returns:
+        callable: Collector for MetricsRegistry.register_collector
+    """
+    def collect():
+        stats = {name: cache.info() for name, cache in caches.items()}
+        return [
+            (f"pokemon_cache_{field}", f"Cache {field.replace('_', ' ')}", ("cache",),
+             [((name,), info[field]) for name, info in stats.items()])
+            for field in ('hits', 'misses', 'hit_rate', 'size')
+        ]
+    return collect
+
+
+class StartupReport:
+    """
+    Wall-clock time spent in each phase of starting the app.
+
+    Phases are marked in order as startup progresses; each one lasts from
+    the previous mark (or ``began``) to its own mark.
+    """
+
+    def __init__(self, began=None):
+        """
+        Args:
+            began: time.perf_counter() value startup is measured from,
+                e.g. taken before the app's first import (defaults to now)
+        """
+        self.began = time.perf_counter() if began is None else began
+        self.phases = []
+        self._last = self.began
+
+    def mark(self, phase):
+        """End the current phase and name it."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.began
+
+    def summary(self):
+        """One-line report, e.g. 'imports 0.412s, data 0.006s, total 0.418s'."""
+        parts = [f"{phase} {seconds:.3f}s" for phase, seconds in self.phases]
+        return ", ".join(parts + [f"total {self.total():.3f}s"])
+
+    def collect(self):
+        """Collector for MetricsRegistry.register_collector."""
+        samples = [((phase,), round(seconds, 6)) for phase, seconds in self.phases]
+        samples.append((("total",), round(self.total(), 6)))
+        return [("pokemon_startup_seconds", "Time spent starting the app, by phase", ("phase",), samples)]
+
+
+def instrument_dash(app, registry=REGISTRY):
+    """
+    Record per-callback metrics for a Dash app and serve them at /metrics.
+
+    Every server-side callback request (/_dash-update-component) counts
+    towards the calls, errors (HTTP status >= 500), latency and response
+    size of the callback it targets, named after the callback function.
+
+    Args:
+        app: The dash.Dash app
+        registry: Registry to render at /metrics
+    """
+    import flask
+
+    server = app.server
+
+    def callback_name(output):
+        entry = app.callback_map.get(output)
+        function = entry.get('callback') if entry else None
+        return getattr(function, '__name__', None) or output
+
+    @server.before_request
+    def start_callback_timer():
+        if flask.request.path.endswith('/_dash-update-component'):
+            flask.g.callback_started = time.perf_counter()
+
+    @server.after_request
+    def record_callback(response):
+        started = flask.g.pop('callback_started', None)
+        if started is not None:
+            body = flask.request.get_json(silent=True) or {}
+            name = callback_name(body.get('output', ''))
+            CALLBACK_CALLS.inc(name)
+            CALLBACK_LATENCY.observe(time.perf_counter() - started, name)
+            CALLBACK_PAYLOAD.observe(response.calculate_content_length() or 0, name)
+            if response.status_code >= 500:
+                CALLBACK_ERRORS.inc(name)
+        return response
+
+    @server.teardown_request
+    def record_callback_exception(exc):
+        # after_request is skipped when a callback raises, so the timer is still set
+        started = flask.g.pop('callback_started', None)
+        if started is not None:
+            body = flask.request.get_json(silent=True) or {}
+            name = callback_name(body.get('output', ''))
+            CALLBACK_CALLS.inc(name)
+            CALLBACK_ERRORS.inc(name)
+            CALLBACK_LATENCY.observe(time.perf_counter() - started, name)
+
+    @server.route('/metrics')
+    def metrics():
+        return flask.Response(registry.render(), mimetype='text/plain; version=0.0.4')
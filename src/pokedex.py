@@ -0,0 +1,208 @@
+import csv
+import os
+
+import numpy as np
+
+from src.snapshot import read_snapshot, source_stamp, write_snapshot
+
+# Code of a missing type in the categorical type1/type2 columns
+NO_TYPE_CODE = -1
+
+
+def type_pair_key(type1, type2=None):
+    """
+    Order-independent key for a single or dual type.
+
+    Args:
+        type1: Primary type name
+        type2: Secondary type name, or None
+
+    Returns:
+        tuple: Sorted tuple of the distinct type names present
+    """
+    return tuple(sorted({t for t in (type1, type2) if t}))
+
+
+class Pokedex:
+    """
+    In-memory Pokédex indexed by number, lowercase name and type pair.
+
+    Alongside the entry dicts, ``numbers``, ``type1_codes`` and
+    ``type2_codes`` hold the table column-wise in entry order, the types
+    as categorical codes into ``type_names`` (NO_TYPE_CODE when missing).
+    """
+
+    # Stores already loaded, keyed by absolute path and file mtime
+    _loaded = {}
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries: Iterable of dicts with 'pokedex' (int), 'pokemon',
+                'type1' and 'type2' (None when missing, e.g. for
+                single-type Pokémon) keys
+        """
+        self.entries = list(entries)
+        self.by_number = {}
+        self.by_name = {}
+        self.by_type_pair = {}
+
+        for entry in self.entries:
+            self.by_number[entry['pokedex']] = entry
+            self.by_name[entry['pokemon'].lower()] = entry
+            self.by_type_pair.setdefault(type_pair_key(entry['type1'], entry['type2']), []).append(entry)
+
+        self.type_names = tuple(sorted({e[t] for e in self.entries for t in ('type1', 'type2') if e[t]}))
+        codes = {t: i for i, t in enumerate(self.type_names)}
+        self.numbers = np.array([e['pokedex'] for e in self.entries], dtype=np.int32)
+        self.type1_codes = np.array([codes.get(e['type1'], NO_TYPE_CODE) for e in self.entries], dtype=np.int16)
+        self.type2_codes = np.array([codes.get(e['type2'], NO_TYPE_CODE) for e in self.entries], dtype=np.int16)
+
+    @classmethod
+    def from_csv(cls, pokemon_csv_path="151pokemon.csv"):
+        """
+        Parse a Pokédex CSV with pokedex, pokemon, type1 and type2 columns.
+
+        Args:
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+
+        Returns:
+            Pokedex: The indexed store
+        """
+        with open(pokemon_csv_path, "r", encoding="utf-8") as file:
+            entries = [
+                {
+                    'pokedex': int(row["pokedex"]),
+                    'pokemon': row["pokemon"],
+                    # Missing types are None, as in a snapshot (NO_TYPE_CODE)
+                    'type1': row["type1"] or None,
+                    'type2': row["type2"] or None,
+                }
+                for row in csv.DictReader(file)
+            ]
+        return cls(entries)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a Pokédex from its column arrays, e.g. a memory-mapped snapshot.
+
+        Args:
+            arrays: Dict with the arrays returned by to_arrays
+
+        Returns:
+            Pokedex: The indexed store
+        """
+        type_names = arrays['type_names'].tolist()
+
+        def type_name(code):
+            return type_names[code] if code != NO_TYPE_CODE else None
+
+        entries = [
+            {'pokedex': number, 'pokemon': name, 'type1': type_name(code1), 'type2': type_name(code2)}
+            for number, name, code1, code2 in zip(
+                arrays['numbers'].tolist(), arrays['names'].tolist(),
+                arrays['type1_codes'].tolist(), arrays['type2_codes'].tolist())
+        ]
+        return cls(entries)
+
+    def to_arrays(self):
+        """
+        Column arrays of the table, as stored in its snapshot.
+
+        Returns:
+            dict: numbers, names, type_names, type1_codes and type2_codes
+        """
+        return {
+            'numbers': self.numbers,
+            'names': np.array([e['pokemon'] for e in self.entries], dtype=str),
+            'type_names': np.array(self.type_names, dtype=str),
+            'type1_codes': self.type1_codes,
+            'type2_codes': self.type2_codes,
+        }
+
+    @classmethod
+    def load(cls, pokemon_csv_path="151pokemon.csv"):
+        """
+        Return the shared store for a CSV, parsing it only the first time or
+        after the file has been modified.
+
+        A parsed CSV is compiled into a snapshot next to it (see
+        src/snapshot.py), which other processes memory-map instead.
+
+        Args:
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+
+        Returns:
+            Pokedex: The shared store
+        """
+        path = os.path.abspath(pokemon_csv_path)
+        stamp = source_stamp(path)
+        cached = cls._loaded.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        snapshot = read_snapshot(path, 'pokedex', stamp)
+        if snapshot is not None:
+            store = cls.from_arrays(snapshot[1])
+        else:
+            store = cls.from_csv(path)
+            write_snapshot(path, 'pokedex', stamp, store.to_arrays())
+        cls._loaded[path] = (stamp, store)
+        return store
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def get(self, pokedex_number):
+        """
+        Look up a Pokémon by Pokédex number.
+
+        Args:
+            pokedex_number: The Pokédex number (integer)
+
+        Returns:
+            dict or None: The entry, or None if there is no such Pokémon
+        """
+        return self.by_number.get(pokedex_number)
+
+    def get_by_name(self, name):
+        """
+        Look up a Pokémon by name, ignoring case.
+
+        Args:
+            name: The Pokémon's name
+
+        Returns:
+            dict or None: The entry, or None if there is no such Pokémon
+        """
+        return self.by_name.get(name.lower())
+
+    def get_by_types(self, type1, type2=None):
+        """
+        All Pokémon with the given single or dual type, in either order.
+
+        Args:
+            type1: Primary type name
+            type2: Secondary type name, or None for single-type Pokémon
+
+        Returns:
+            list: Matching entries in Pokédex order
+        """
+        return list(self.by_type_pair.get(type_pair_key(type1, type2), []))
+
+    def get_many(self, pokedex_numbers):
+        """
+        Look up several Pokémon at once.
+
+        Args:
+            pokedex_numbers: Iterable of Pokédex numbers
+
+        Returns:
+            list: Entries in the same order, with None for unknown numbers
+        """
+        by_number = self.by_number
+        return [by_number.get(n) for n in pokedex_numbers]
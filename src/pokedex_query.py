@@ -0,0 +1,228 @@
+import os
+
+import numpy as np
+
+from src.pokedex import Pokedex
+from src.snapshot import source_stamp
+
+# Columns the grid can sort and filter on
+COLUMNS = ('pokedex', 'pokemon', 'type1', 'type2')
+
+# Rows returned by one query, whatever range is asked for
+MAX_PAGE_ROWS = 1000
+
+# AG Grid text and number filter options
+TEXT_FILTERS = ('contains', 'notContains', 'equals', 'notEqual', 'startsWith', 'endsWith', 'blank', 'notBlank')
+NUMBER_FILTERS = ('equals', 'notEqual', 'lessThan', 'lessThanOrEqual', 'greaterThan', 'greaterThanOrEqual',
+                  'inRange', 'blank', 'notBlank')
+
+
+class PokedexQuery:
+    """
+    Paginated, sorted and filtered queries over a Pokédex, for grids that
+    fetch rows on demand (AG Grid's infinite row model) instead of
+    receiving the whole table.
+
+    Requests follow AG Grid's getRows parameters: a startRow/endRow range,
+    a sortModel and a filterModel, plus an optional quick filter that, like
+    the grid's own, keeps rows containing every word of the text. Filtering
+    and sorting run on column arrays built once per Pokédex.
+    """
+
+    # Queries already built, keyed by absolute CSV path with the file's stamp
+    _loaded = {}
+
+    def __init__(self, pokedex):
+        """
+        Args:
+            pokedex: Pokedex to query
+        """
+        self.pokedex = pokedex
+
+        # Lowercase type names by code; a missing type (code -1) picks the trailing ''
+        type_names = np.array([t.lower() for t in pokedex.type_names] + [''], dtype=str)
+        self.numbers = pokedex.numbers
+        self.text = {
+            'pokedex': pokedex.numbers.astype(str),
+            'pokemon': np.array([e['pokemon'].lower() for e in pokedex.entries], dtype=str),
+            'type1': type_names[pokedex.type1_codes],
+            'type2': type_names[pokedex.type2_codes],
+        }
+        # Dense ranks, so descending sorts are a negation for lexsort
+        self.ranks = {'pokedex': np.unique(self.numbers, return_inverse=True)[1]}
+        for column in ('pokemon', 'type1', 'type2'):
+            self.ranks[column] = np.unique(self.text[column], return_inverse=True)[1]
+        self.search_text = np.array(
+            ['\n'.join(row) for row in zip(*(self.text[column].tolist() for column in COLUMNS))], dtype=str)
+
+    @classmethod
+    def from_files(cls, pokemon_csv_path="151pokemon.csv"):
+        """
+        Return the shared query over the Pokédex of a CSV, building it only
+        the first time or after the file has been modified.
+
+        Args:
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+
+        Returns:
+            PokedexQuery: The shared query
+        """
+        path = os.path.abspath(pokemon_csv_path)
+        stamp = source_stamp(path)
+        cached = cls._loaded.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        query = cls(Pokedex.load(path))
+        cls._loaded[path] = (stamp, query)
+        return query
+
+    def _text_condition(self, column, condition):
+        option = condition.get('type') or 'contains'
+        if option not in TEXT_FILTERS:
+            raise ValueError(f"Unknown text filter {option!r} on {column}")
+        values = self.text[column]
+        if option in ('blank', 'notBlank'):
+            return (values == '') == (option == 'blank')
+        text = str(condition.get('filter') or '').lower()
+        if not text:
+            return np.ones(len(values), dtype=bool)
+        if option in ('contains', 'notContains'):
+            return (np.char.find(values, text) >= 0) == (option == 'contains')
+        if option in ('equals', 'notEqual'):
+            return (values == text) == (option == 'equals')
+        if option == 'startsWith':
+            return np.char.startswith(values, text)
+        return np.char.endswith(values, text)
+
+    def _number_condition(self, column, condition):
+        option = condition.get('type') or 'equals'
+        if option not in NUMBER_FILTERS:
+            raise ValueError(f"Unknown number filter {option!r} on {column}")
+        values = self.numbers
+        if option in ('blank', 'notBlank'):
+            # Every entry has a number
+            return np.full(len(values), option == 'notBlank')
+        bound = condition.get('filter')
+        if bound is None:
+            return np.ones(len(values), dtype=bool)
+        bound = float(bound)
+        if option == 'inRange':
+            upper = condition.get('filterTo')
+            return (values > bound) & (values < float(upper)) if upper is not None else values > bound
+        return {
+            'equals': values == bound,
+            'notEqual': values != bound,
+            'lessThan': values < bound,
+            'lessThanOrEqual': values <= bound,
+            'greaterThan': values > bound,
+            'greaterThanOrEqual': values >= bound,
+        }[option]
+
+    def _column_filter(self, column, model):
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column!r}")
+        # Combined models list their conditions (older grids use condition1/2)
+        conditions = model.get('conditions') or [model[key] for key in ('condition1', 'condition2') if key in model]
+        if conditions:
+            masks = [self._column_filter(column, condition) for condition in conditions]
+            combine = np.logical_or if str(model.get('operator', 'AND')).upper() == 'OR' else np.logical_and
+            return combine.reduce(masks)
+        if model.get('filterType') == 'number' or (column == 'pokedex' and model.get('filterType') != 'text'):
+            return self._number_condition(column, model)
+        return self._text_condition(column, model)
+
+    def matches(self, filter_model=None, quick_filter=None):
+        """
+        Entries passing a filter model and a quick filter.
+
+        Args:
+            filter_model: AG Grid filterModel, a dict of column name to filter
+            quick_filter: Text whose every word must appear in a row
+
+        Returns:
+            numpy.ndarray: Boolean mask over the Pokédex entries
+
+        Raises:
+            ValueError: If the model names an unknown column or filter
+        """
+        mask = np.ones(len(self.pokedex), dtype=bool)
+        for column, model in (filter_model or {}).items():
+            mask &= self._column_filter(column, model)
+        for word in str(quick_filter or '').lower().split():
+            mask &= np.char.find(self.search_text, word) >= 0
+        return mask
+
+    def order(self, indexes, sort_model=None):
+        """
+        Sort entry indexes by a sort model, ties kept in Pokédex order.
+
+        Args:
+            indexes: Entry indexes to sort
+            sort_model: AG Grid sortModel, a list of {'colId', 'sort'} dicts,
+                most significant first
+
+        Returns:
+            numpy.ndarray: The sorted indexes
+
+        Raises:
+            ValueError: If the model names an unknown column
+        """
+        keys = [indexes]
+        for sort in reversed(sort_model or []):
+            column = sort.get('colId')
+            if column not in COLUMNS:
+                raise ValueError(f"Unknown column: {column!r}")
+            ranks = self.ranks[column][indexes]
+            keys.append(-ranks if sort.get('sort') == 'desc' else ranks)
+        return indexes[np.lexsort(keys)]
+
+    def rows(self, start_row=0, end_row=100, sort_model=None, filter_model=None, quick_filter=None):
+        """
+        One page of the filtered and sorted Pokédex.
+
+        Args:
+            start_row: Index of the first row
+            end_row: Index past the last row (at most MAX_PAGE_ROWS after start_row)
+            sort_model: AG Grid sortModel
+            filter_model: AG Grid filterModel
+            quick_filter: Text whose every word must appear in a row
+
+        Returns:
+            dict: 'rowData' (the page of Pokédex entries) and 'rowCount'
+            (the number of rows passing the filters), as the grid expects
+            in getRowsResponse
+
+        Raises:
+            ValueError: If a model names an unknown column or filter
+        """
+        start_row = max(0, int(start_row or 0))
+        end_row = min(int(end_row if end_row is not None else start_row + 100), start_row + MAX_PAGE_ROWS)
+        indexes = self.order(np.flatnonzero(self.matches(filter_model, quick_filter)), sort_model)
+        entries = self.pokedex.entries
+        return {
+            'rowData': [entries[i] for i in indexes[start_row:max(start_row, end_row)].tolist()],
+            'rowCount': len(indexes),
+        }
+
+    def get_rows(self, request, quick_filter=None):
+        """
+        Answer an AG Grid getRowsRequest.
+
+        Args:
+            request: Dict with startRow, endRow, sortModel and filterModel
+            quick_filter: Text whose every word must appear in a row
+
+        Returns:
+            dict: getRowsResponse with 'rowData' and 'rowCount'
+
+        Raises:
+            ValueError: If the request names an unknown column or filter
+        """
+        return self.rows(request.get('startRow'), request.get('endRow'), request.get('sortModel'),
+                         request.get('filterModel'), quick_filter)
+
+
+def query_pokedex(start_row=0, end_row=100, sort_model=None, filter_model=None, quick_filter=None,
+                  pokemon_csv_path="151pokemon.csv"):
+    return PokedexQuery.from_files(pokemon_csv_path).rows(start_row, end_row, sort_model, filter_model, quick_filter)
@@ -1,8 +1,12 @@
-import csv
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from src.batch_scoring import encode_teams, kpis_to_frame, score_encoded
+from src.pokedex import Pokedex
+from src.team_cache import LRUCache, team_key
+from src.team_profile import TeamProfile
+from src.type_chart import TypeChart, clean_type
+
 # Try to import pokemon_type_checker, with fallback for different import structures
 try:
     from src.types import pokemon_type_checker
@@ -63,52 +67,328 @@ class PokemonData:
             formatted string with Pokémon info, and its type(s).
         """
         try:
-            with open(pokemon_csv_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-
-                for row in reader:
-                    if int(row["pokedex"]) == pokedex_number:  # Match by Pokédex number
-                        pokemon_name = row["pokemon"].upper()
-                        type1 = row["type1"]
-                        type2 = row["type2"] if row["type2"] else None
-
-                        output = f"{pokemon_name} (Pokédex #{pokedex_number}) is a "
-
-                        if type1 and type2:
-                            output += f"{type1}/{type2} type Pokémon.\n"
-                            type_info1 = pokemon_type_checker(type1)                   
-                            type_info2 = pokemon_type_checker(type2)
-                            if isinstance(type_info1, dict):
-                                output += PokemonData.format_type_info(type1, type_info1)
-                            else:
-                                output += f"{type1}: {type_info1}\n"
-
-                            if isinstance(type_info2, dict):
-                                output += PokemonData.format_type_info(type2, type_info2)
-                            else:
-                                output += f"{type2}: {type_info2}\n"
-
-                        elif type1:
-                            output += f"{type1} type Pokémon.\n"
-                            type_info = pokemon_type_checker(type1)
-                            
-                            if isinstance(type_info, dict):
-                                output += PokemonData.format_type_info(type1, type_info)
-                            else:
-                                output += f"{type1}: {type_info}\n"
-
-                        return pokemon_name, output, type1, type2
-
-                return None, f"Pokémon with Pokédex number {pokedex_number} not found.\n", None, None
-
+            entry = Pokedex.load(pokemon_csv_path).get(pokedex_number)
         except FileNotFoundError:
             return None, f"Error: '{pokemon_csv_path}' not found. Please make sure the file is in the correct directory.", None, None
         except ValueError:
             return None, "Error: Invalid Pokédex number format. Please enter a number.", None, None
 
+        if entry is None:
+            return None, f"Pokémon with Pokédex number {pokedex_number} not found.\n", None, None
+
+        pokemon_name = entry["pokemon"].upper()
+        type1 = entry["type1"]
+        type2 = entry["type2"]
+
+        output = f"{pokemon_name} (Pokédex #{pokedex_number}) is a "
+
+        if type1 and type2:
+            output += f"{type1}/{type2} type Pokémon.\n"
+            type_info1 = pokemon_type_checker(type1)                   
+            type_info2 = pokemon_type_checker(type2)
+            if isinstance(type_info1, dict):
+                output += PokemonData.format_type_info(type1, type_info1)
+            else:
+                output += f"{type1}: {type_info1}\n"
+
+            if isinstance(type_info2, dict):
+                output += PokemonData.format_type_info(type2, type_info2)
+            else:
+                output += f"{type2}: {type_info2}\n"
+
+        elif type1:
+            output += f"{type1} type Pokémon.\n"
+            type_info = pokemon_type_checker(type1)
+            
+            if isinstance(type_info, dict):
+                output += PokemonData.format_type_info(type1, type_info)
+            else:
+                output += f"{type1}: {type_info}\n"
+
+        return pokemon_name, output, type1, type2
+
+    @staticmethod
+    def get_many(pokedex_numbers, pokemon_csv_path="151pokemon.csv"):
+        """
+        Retrieves several Pokémon entries at once by Pokédex number.
+
+        Args:
+            pokedex_numbers: Iterable of Pokédex numbers (integers).
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+
+        Returns:
+            list: Entry dicts (pokedex, pokemon, type1, type2) in the same order,
+            with None for numbers that aren't in the Pokédex.
+        """
+        return Pokedex.load(pokemon_csv_path).get_many(pokedex_numbers)
+
+class TeamAnalysisResult:
+    """
+    KPIs, summary and matchup profile for one team, computed once and shared
+    by the KPI panel, figure builders, summary generator and chat assistant.
+    """
+    
+    def __init__(self, team_data, kpis, types_csv_path="types.csv"):
+        self.team_data = team_data
+        self.kpis = kpis
+        self.types_csv_path = types_csv_path
+        self._summary = None
+        self._profile = None
+    
+    @property
+    def profile(self):
+        """The team's TeamProfile, built on first access."""
+        if self._profile is None:
+            self._profile = TeamAnalysis.team_profile(self.team_data, self.types_csv_path)
+        return self._profile
+    
+    @property
+    def summary(self):
+        """The 2-3 sentence team summary, generated on first access."""
+        if self._summary is None:
+            key = ('summary', TypeChart.load(self.types_csv_path).fingerprint, team_key(self.team_data))
+            summary = TeamAnalysis.cache.get(key)
+            if summary is None:
+                summary = TeamAnalysis.summarize(self.team_data, self.kpis)
+                TeamAnalysis.cache.put(key, summary)
+            self._summary = summary
+        return self._summary
+
+
+class IncrementalTeamAnalysis:
+    """
+    Team metrics kept as running sums, for one-member edits.
+    
+    The defensive and offensive metrics are sums of per-member
+    contributions, so add() and remove() only touch one row per type; the
+    other KPIs are derived from the sums on demand and match
+    calculate_team_kpis for the same members. copy() makes "what if"
+    previews cheap: ``analysis.copy().swap(old, new).kpis()``.
+    """
+    
+    def __init__(self, team_data=(), types_csv_path="types.csv"):
+        """
+        Args:
+            team_data: Initial list of dictionaries with Pokémon data
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+        """
+        self.types_csv_path = types_csv_path
+        self.chart = TypeChart.load(types_csv_path)
+        self.team_data = []
+        self.defensive = np.zeros(len(self.chart), dtype=np.int64)
+        self.offensive = np.zeros(len(self.chart), dtype=np.int64)
+        # Members having each type name, for STAB diversity and missing types
+        self.type_counts = {}
+        for pokemon in team_data:
+            self.add(pokemon)
+    
+    def _update(self, pokemon, sign):
+        """Add (sign 1) or subtract (sign -1) one member's contribution."""
+        defensive, offensive = TeamAnalysis.effectiveness_arrays([pokemon], self.chart)
+        self.defensive += sign * defensive
+        self.offensive += sign * offensive
+        for type_name in {clean_type(pokemon.get('type1')), clean_type(pokemon.get('type2'))} - {None}:
+            count = self.type_counts.get(type_name, 0) + sign
+            if count:
+                self.type_counts[type_name] = count
+            else:
+                del self.type_counts[type_name]
+    
+    def add(self, pokemon):
+        """
+        Add a member.
+        
+        Args:
+            pokemon: Dictionary with Pokémon data (including types)
+            
+        Returns:
+            IncrementalTeamAnalysis: self, so edits can be chained
+        """
+        self._update(pokemon, 1)
+        self.team_data.append(pokemon)
+        return self
+    
+    def remove(self, pokemon):
+        """
+        Remove a member.
+        
+        Args:
+            pokemon: The member to remove (its first occurrence is removed)
+            
+        Returns:
+            IncrementalTeamAnalysis: self, so edits can be chained
+            
+        Raises:
+            ValueError: If the Pokémon isn't on the team
+        """
+        self.team_data.remove(pokemon)
+        self._update(pokemon, -1)
+        return self
+    
+    def swap(self, old, new):
+        """
+        Replace a member, keeping its position in the team.
+        
+        Args:
+            old: The member to replace
+            new: The Pokémon taking its place
+            
+        Returns:
+            IncrementalTeamAnalysis: self, so edits can be chained
+            
+        Raises:
+            ValueError: If ``old`` isn't on the team
+        """
+        index = self.team_data.index(old)
+        self._update(old, -1)
+        self._update(new, 1)
+        self.team_data[index] = new
+        return self
+    
+    def copy(self):
+        """Independent copy, e.g. to preview an edit."""
+        other = IncrementalTeamAnalysis.__new__(IncrementalTeamAnalysis)
+        other.types_csv_path = self.types_csv_path
+        other.chart = self.chart
+        other.team_data = list(self.team_data)
+        other.defensive = self.defensive.copy()
+        other.offensive = self.offensive.copy()
+        other.type_counts = dict(self.type_counts)
+        return other
+    
+    def kpis(self):
+        """
+        The team's KPIs, derived from the running sums.
+        
+        Returns:
+            dict: Dictionary of KPI values and type recommendations, as
+            returned by calculate_team_kpis
+        """
+        return TeamAnalysis.derive_kpis(
+            dict(zip(self.chart.types, self.defensive.tolist())),
+            dict(zip(self.chart.types, self.offensive.tolist())),
+            len(self.team_data),
+            set(self.type_counts),
+            self.types_csv_path,
+        )
+    
+    def result(self, team_data=None):
+        """
+        The team's TeamAnalysisResult, sharing TeamAnalysis.cache with analyze().
+        
+        Args:
+            team_data: The same members in display order (defaults to the
+                order they were added in)
+            
+        Returns:
+            TeamAnalysisResult: KPIs and summary for the team
+        """
+        team_data = self.team_data if team_data is None else team_data
+        key = ('kpis', self.chart.fingerprint, team_key(self.team_data))
+        kpis = TeamAnalysis.cached_kpis(key)
+        if kpis is None:
+            kpis = self.kpis()
+            TeamAnalysis.cache.put(key, kpis)
+        return TeamAnalysisResult(team_data, TeamAnalysis.copy_kpis(kpis), self.types_csv_path)
+
+
 class TeamAnalysis:
     """Class for analyzing Pokemon team composition and effectiveness."""
     
+    # Memoized KPIs, summaries and profiles keyed by (kind, chart fingerprint, team key)
+    cache = LRUCache(maxsize=4096)
+    
+    # KPIs precomputed ahead of a click (see TeamSpeculator), kept apart so
+    # they can't evict entries that were actually asked for
+    speculative = LRUCache(maxsize=1024)
+    
+    @staticmethod
+    def analyze(team_data, types_csv_path="types.csv"):
+        """
+        Run the full team analysis once.
+        
+        Args:
+            team_data: List of dictionaries with Pokémon data, or an existing
+                TeamAnalysisResult (returned unchanged)
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            
+        Returns:
+            TeamAnalysisResult: KPIs and summary for the team
+        """
+        if isinstance(team_data, TeamAnalysisResult):
+            return team_data
+        kpis = TeamAnalysis.calculate_team_kpis(team_data, types_csv_path)
+        return TeamAnalysisResult(team_data, kpis, types_csv_path)
+    
+    @staticmethod
+    def encode_team(team_data, chart):
+        """
+        Convert team rows into type IDs for vectorized lookups.
+
+        Members without a primary type are skipped and a repeated type counts
+        once. A member with an unknown type contributes no defensive metrics,
+        and only its known primary type is used for offense.
+
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+            chart: TypeChart the IDs refer to
+
+        Returns:
+            tuple: (defending_ids, stab_ids) where defending_ids is an (n, 2)
+            array of type-pair IDs (``chart.no_type`` for a missing second type)
+            and stab_ids lists the attacking type IDs used for offense
+        """
+        defending_ids = []
+        stab_ids = []
+
+        for pokemon in team_data:
+            type1 = clean_type(pokemon.get('type1'))
+            type2 = clean_type(pokemon.get('type2'))
+
+            # Skip if type1 is None or empty
+            if type1 is None:
+                continue
+
+            id1 = chart.type_id(type1)
+            # A repeated type (Fire/Fire) is just that single type
+            id2 = chart.type_id(type2) if type2 not in (None, type1) else chart.no_type
+
+            if id1 is None or id2 is None:
+                print(f"Error processing metrics for {type1}/{type2}: unknown type")
+                if id1 is not None:
+                    stab_ids.append(id1)
+                continue
+
+            defending_ids.append((id1, id2))
+            stab_ids.append(id1)
+            if id2 != chart.no_type:
+                stab_ids.append(id2)
+
+        defending_ids = np.array(defending_ids, dtype=np.intp).reshape(-1, 2)
+        return defending_ids, np.array(stab_ids, dtype=np.intp)
+
+    @staticmethod
+    def effectiveness_arrays(team_data, chart):
+        """
+        Vectorized defensive and offensive metrics for a team.
+
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+            chart: TypeChart to evaluate the team against
+
+        Returns:
+            tuple: (defensive, offensive) integer arrays indexed by type ID
+        """
+        defending_ids, stab_ids = TeamAnalysis.encode_team(team_data, chart)
+
+        # Precomputed defensive weighting of every attacking type against each member
+        defensive = chart.pair_defense[defending_ids[:, 0], defending_ids[:, 1]].sum(axis=0, dtype=np.int64)
+
+        # STAB coverage: one chart row per attacking type the team carries
+        offensive = chart.offense_scores[stab_ids].sum(axis=0)
+
+        return defensive, offensive
+
     @staticmethod
     def calculate_type_effectiveness(team_data, types_csv_path="types.csv"):
         """
@@ -121,107 +401,11 @@ class TeamAnalysis:
         Returns:
             tuple: (defensive_metrics, offensive_metrics)
         """
-        # Load the type effectiveness data
-        types_df = pd.read_csv(types_csv_path)
-        
-        # Determine column names dynamically
-        # First column should be "Type" containing the attacking types
-        attacking_col = "Type"
-        # Remaining columns are the defending types
-        defending_types = [col for col in types_df.columns if col != attacking_col]
+        chart = TypeChart.load(types_csv_path)
+        defensive, offensive = TeamAnalysis.effectiveness_arrays(team_data, chart)
         
-        # Initialize metrics dictionaries for all types
-        all_types = defending_types
-        
-        defensive_metrics = {t: 0 for t in all_types}
-        offensive_metrics = {t: 0 for t in all_types}
-        
-        # For each Pokémon in the team
-        for pokemon in team_data:
-            type1 = pokemon.get('type1')
-            type2 = pokemon.get('type2')
-            
-            # Skip if type1 is None or empty
-            if not type1 or type1 == 'None':
-                continue
-                
-            # Calculate defensive effectiveness (how vulnerable team is to each type)
-            try:
-                # Get type1 defensive multipliers (how effective each type is against this type)
-                # We need to look at the column for this type across all attacking types
-                type1_defense = {}
-                for attacking_type in all_types:
-                    # Get how effective 'attacking_type' is against 'type1'
-                    type1_defense[attacking_type] = float(types_df.loc[types_df[attacking_col] == attacking_type, type1].iloc[0])
-                
-                # For dual-type Pokémon, calculate combined effectiveness
-                if type2 and type2 != 'None':
-                    type2_defense = {}
-                    for attacking_type in all_types:
-                        # Get how effective 'attacking_type' is against 'type2'
-                        type2_defense[attacking_type] = float(types_df.loc[types_df[attacking_col] == attacking_type, type2].iloc[0])
-                    
-                    # Multiply effectiveness values to get combined effectiveness
-                    for t in all_types:
-                        combined_value = type1_defense[t] * type2_defense[t]
-                        
-                        # Add weighted value to defensive metrics
-                        # 4x weakness (2), 2x weakness (1), neutral (0), 0.5x resist (-1), 0.25x resist (-2), immune (-3)
-                        if combined_value == 4.0:
-                            defensive_metrics[t] += 2
-                        elif combined_value == 2.0:
-                            defensive_metrics[t] += 1
-                        elif combined_value == 1.0:
-                            defensive_metrics[t] += 0
-                        elif combined_value == 0.5:
-                            defensive_metrics[t] += -1
-                        elif combined_value == 0.25:
-                            defensive_metrics[t] += -2
-                        elif combined_value == 0:
-                            defensive_metrics[t] += -3
-                else:
-                    # Single-type Pokémon
-                    for t in all_types:
-                        value = type1_defense[t]
-                        if value == 2.0:
-                            defensive_metrics[t] += 1
-                        elif value == 1.0:
-                            defensive_metrics[t] += 0
-                        elif value == 0.5:
-                            defensive_metrics[t] += -1
-                        elif value == 0:
-                            defensive_metrics[t] += -3
-            except Exception as e:
-                print(f"Error processing defensive metrics for {type1}/{type2}: {e}")
-            
-            # Calculate offensive effectiveness (how well this Pokémon hits each type)
-            # Using STAB as a proxy for offensive capability
-            try:
-                # Get types that this Pokémon hits super effectively with STAB from its first type
-                if type1 and type1 != 'None':
-                    type1_row = types_df.loc[types_df[attacking_col] == type1].iloc[0]
-                    for t in all_types:
-                        value = float(type1_row[t])
-                        if value == 2.0:
-                            offensive_metrics[t] += 1
-                        elif value == 0.5:
-                            offensive_metrics[t] += -1
-                        elif value == 0:
-                            offensive_metrics[t] += -3
-                            
-                # Add STAB coverage from second type if present
-                if type2 and type2 != 'None':
-                    type2_row = types_df.loc[types_df[attacking_col] == type2].iloc[0]
-                    for t in all_types:
-                        value = float(type2_row[t])
-                        if value == 2.0:
-                            offensive_metrics[t] += 1
-                        elif value == 0.5:
-                            offensive_metrics[t] += -1
-                        elif value == 0:
-                            offensive_metrics[t] += -3
-            except Exception as e:
-                print(f"Error processing offensive metrics for {type1}/{type2}: {e}")
+        defensive_metrics = dict(zip(chart.types, defensive.tolist()))
+        offensive_metrics = dict(zip(chart.types, offensive.tolist()))
         
         return defensive_metrics, offensive_metrics
     
@@ -238,29 +422,24 @@ class TeamAnalysis:
         Returns:
             list: Recommended types to add for better defense
         """
-        # Load the type effectiveness data
-        types_df = pd.read_csv(types_csv_path)
+        chart = TypeChart.load(types_csv_path)
         
-        # Initialize counters for how well each type defends against vulnerable types
-        type_defense_scores = {t: 0 for t in types_df['Type'].values}
+        # How well each type defends against vulnerable types
+        type_defense_scores = np.zeros(len(chart))
         
-        # For each vulnerable type, find types that resist it
         for v_type in vulnerable_types[:3]:  # Focus on top 3 vulnerabilities
-            for def_type in type_defense_scores.keys():
-                # Check how effective the vulnerable type is against this defensive type
-                effectiveness = float(types_df.loc[types_df['Type'] == v_type, def_type].iloc[0])
-                # If this type resists the vulnerable type, increase its score
-                if effectiveness < 1.0:
-                    type_defense_scores[def_type] += (1.0 - effectiveness) * 2
-                # If this type is weak to the vulnerable type, decrease its score
-                elif effectiveness > 1.0:
-                    type_defense_scores[def_type] -= (effectiveness - 1.0)
-        
-        # Sort types by their defensive utility score
-        recommended_types = sorted(type_defense_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Return top 5 recommended types
-        return [t[0] for t in recommended_types[:5]]
+            # How effective the vulnerable type is against every defensive type
+            effectiveness = chart.matrix[chart.type_ids[v_type]]
+            # Resisting types gain score, weak types lose it
+            type_defense_scores += np.where(
+                effectiveness < 1.0,
+                (1.0 - effectiveness) * 2,
+                np.where(effectiveness > 1.0, -(effectiveness - 1.0), 0.0),
+            )
+        
+        # Return top 5 recommended types, keeping chart order between ties
+        ranking = np.argsort(-type_defense_scores, kind='stable')
+        return [chart.types[i] for i in ranking[:5]]
     
     @staticmethod
     def recommend_types_for_offense(offensive_gaps, offensive_metrics, types_csv_path="types.csv"):
@@ -275,32 +454,116 @@ class TeamAnalysis:
         Returns:
             list: Recommended types to add for better offense
         """
-        # Load the type effectiveness data
-        types_df = pd.read_csv(types_csv_path)
+        chart = TypeChart.load(types_csv_path)
         
-        # Initialize counters for how well each type attacks the gap types
-        type_offense_scores = {t: 0 for t in types_df['Type'].values}
+        # How well each type attacks the gap types
+        type_offense_scores = np.zeros(len(chart))
         
-        # For each offensive gap, find types that are super effective against it
         for gap_type in offensive_gaps[:3]:  # Focus on top 3 gaps
-            for atk_type in type_offense_scores.keys():
-                # Check how effective this attacking type is against the gap type
-                effectiveness = float(types_df.loc[types_df['Type'] == atk_type, gap_type].iloc[0])
-                # If this type is super effective against the gap type, increase its score
-                if effectiveness > 1.0:
-                    type_offense_scores[atk_type] += (effectiveness - 1.0) * 2
+            # How effective every attacking type is against the gap type
+            effectiveness = chart.matrix[:, chart.type_ids[gap_type]]
+            type_offense_scores += np.where(effectiveness > 1.0, (effectiveness - 1.0) * 2, 0.0)
         
-        # Sort types by their offensive utility score
-        recommended_types = sorted(type_offense_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Return top 5 recommended types
-        return [t[0] for t in recommended_types[:5]]
+        # Return top 5 recommended types, keeping chart order between ties
+        ranking = np.argsort(-type_offense_scores, kind='stable')
+        return [chart.types[i] for i in ranking[:5]]
     
     @staticmethod
     def calculate_team_kpis(team_data, types_csv_path="types.csv"):
         """
         Calculate team KPIs based on type effectiveness with specific type recommendations.
         
+        Results are memoized by the team's canonical type-pair key and the type
+        chart's content, so repeat analyses of the same team are served from
+        TeamAnalysis.cache.
+        
+        Args:
+            team_data: List of dictionaries with Pokémon data
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            
+        Returns:
+            dict: Dictionary of KPI values and type recommendations
+        """
+        key = ('kpis', TypeChart.load(types_csv_path).fingerprint, team_key(team_data))
+        kpis = TeamAnalysis.cached_kpis(key)
+        if kpis is None:
+            kpis = TeamAnalysis.compute_team_kpis(team_data, types_csv_path)
+            TeamAnalysis.cache.put(key, kpis)
+        return TeamAnalysis.copy_kpis(kpis)
+    
+    @staticmethod
+    def cached_kpis(key):
+        """
+        Look up memoized KPIs, moving a precomputed entry from
+        TeamAnalysis.speculative into TeamAnalysis.cache on first use.
+        
+        Args:
+            key: ('kpis', chart fingerprint, team key)
+            
+        Returns:
+            dict or None: The shared KPI dictionary (treat as read-only), or
+            None if the team hasn't been analysed
+        """
+        kpis = TeamAnalysis.cache.get(key)
+        if kpis is None:
+            kpis = TeamAnalysis.speculative.pop(key)
+            if kpis is not None:
+                TeamAnalysis.cache.put(key, kpis)
+        return kpis
+    
+    @staticmethod
+    def team_profile(team_data, types_csv_path="types.csv"):
+        """
+        Per-member matchups of a team, memoized like the KPIs.
+        
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            
+        Returns:
+            TeamProfile: Shared profile of the team (treat as read-only)
+        """
+        chart = TypeChart.load(types_csv_path)
+        # Member names and order show up in the answers, so they're part of the key
+        members = tuple(
+            (pokemon.get('pokemon'), clean_type(pokemon.get('type1')), clean_type(pokemon.get('type2')))
+            for pokemon in team_data
+        )
+        key = ('profile', chart.fingerprint, members)
+        profile = TeamAnalysis.cache.get(key)
+        if profile is None:
+            profile = TeamProfile(team_data, chart)
+            TeamAnalysis.cache.put(key, profile)
+        return profile
+    
+    @staticmethod
+    def copy_kpis(kpis):
+        """
+        Copy a KPI dictionary so callers can't mutate a cached result.
+        
+        Args:
+            kpis: Dictionary returned by calculate_team_kpis
+            
+        Returns:
+            dict: Copy with its nested dicts and lists copied as well
+        """
+        return {k: v.copy() if isinstance(v, (dict, list)) else v for k, v in kpis.items()}
+    
+    @staticmethod
+    def cache_info():
+        """
+        Hit/miss statistics of the team analysis cache.
+        
+        Returns:
+            dict: hits, misses, hit_rate, size and maxsize
+        """
+        return TeamAnalysis.cache.info()
+    
+    @staticmethod
+    def compute_team_kpis(team_data, types_csv_path="types.csv"):
+        """
+        Calculate team KPIs without consulting the cache.
+        
         Args:
             team_data: List of dictionaries with Pokémon data
             types_csv_path: Path to the types CSV file (defaults to "types.csv")
@@ -310,6 +573,33 @@ class TeamAnalysis:
         """
         # Get raw type effectiveness
         defensive_metrics, offensive_metrics = TeamAnalysis.calculate_type_effectiveness(team_data, types_csv_path)
+        
+        # Count unique types in team (for STAB diversity)
+        unique_types = set()
+        for pokemon in team_data:
+            for key in ('type1', 'type2'):
+                type_name = clean_type(pokemon.get(key))
+                if type_name is not None:
+                    unique_types.add(type_name)
+        
+        return TeamAnalysis.derive_kpis(defensive_metrics, offensive_metrics, len(team_data), unique_types,
+                                        types_csv_path)
+    
+    @staticmethod
+    def derive_kpis(defensive_metrics, offensive_metrics, team_size, unique_types, types_csv_path="types.csv"):
+        """
+        Derive every KPI from a team's summed metrics.
+        
+        Args:
+            defensive_metrics: Dictionary of defensive metric sums, in chart order
+            offensive_metrics: Dictionary of offensive metric sums, in chart order
+            team_size: Number of members in the team
+            unique_types: Set of the type names the members have
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            
+        Returns:
+            dict: Dictionary of KPI values and type recommendations
+        """
         all_types = list(defensive_metrics.keys())
         
         # Calculate defensive KPIs
@@ -325,7 +615,6 @@ class TeamAnalysis:
         
         # Count defensive holes (types where 3+ team members are weak)
         # This is a simplified approximation based on team size and vulnerability score
-        team_size = len(team_data)
         defensive_holes = sum(1 for v in defensive_metrics.values() if v >= (team_size / 2))
         
         # Calculate offensive KPIs
@@ -337,17 +626,10 @@ class TeamAnalysis:
         offensive_gaps = [t for t in all_types if offensive_metrics[t] <= -1]
         offensive_gaps.sort(key=lambda t: offensive_metrics[t])
         
-        # Count unique types in team (for STAB diversity)
-        unique_types = set()
-        for pokemon in team_data:
-            if pokemon.get('type1') and pokemon.get('type1') != 'None':
-                unique_types.add(pokemon.get('type1'))
-            if pokemon.get('type2') and pokemon.get('type2') != 'None':
-                unique_types.add(pokemon.get('type2'))
         stab_diversity = len(unique_types)
         
         # Missing types (types not represented in the team)
-        missing_types = set(all_types) - unique_types
+        missing_types = [t for t in all_types if t not in unique_types]
         
         # Find recommended types to add based on overall analysis
         # 1. Types that would help address defensive vulnerabilities
@@ -366,25 +648,72 @@ class TeamAnalysis:
             'stab_diversity': stab_diversity,
             'vulnerable_types': vulnerable_types[:3],  # Top 3 types team is weak to
             'offensive_gaps': offensive_gaps[:3],      # Top 3 types team struggles to hit
-            'missing_types': list(missing_types),
+            'missing_types': missing_types,
             'defensive_recommendations': defensive_recommendations,
             'offensive_recommendations': offensive_recommendations
         }
         
+    @staticmethod
+    def score_teams(teams, types_csv_path="types.csv", as_frame=False, team_sizes=None):
+        """
+        Score many teams at once with the same KPIs as calculate_team_kpis.
+        
+        Args:
+            teams: List of teams (each a list of Pokémon dicts or (type1, type2)
+                pairs), or an (N, 6, 2) array of type IDs from encode_teams
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            as_frame: Return a DataFrame with one row per team instead of arrays
+            team_sizes: Member count of each team, as returned by encode_teams.
+                Required with an encoded array, since a member without types
+                is encoded like an empty slot but still counts
+            
+        Returns:
+            dict or pandas.DataFrame: KPI arrays keyed like calculate_team_kpis
+            (see batch_scoring.score_encoded), or the equivalent table
+            
+        Raises:
+            ValueError: If a team can't be encoded, or if an encoded array
+                comes without one team size per team
+        """
+        chart = TypeChart.load(types_csv_path)
+        
+        if isinstance(teams, np.ndarray):
+            if team_sizes is None or len(team_sizes) != len(teams):
+                raise ValueError("Encoded teams need team_sizes with one size per team")
+            encoded = teams
+            team_sizes = np.asarray(team_sizes, dtype=np.int64)
+        else:
+            encoded, team_sizes = encode_teams(teams, chart)
+        
+        kpis = score_encoded(encoded, team_sizes, chart)
+        return kpis_to_frame(kpis, chart) if as_frame else kpis
+    
     @staticmethod
     def generate_team_summary(team_data, types_csv_path="types.csv"):
         """
         Generate a concise 2-3 sentence summary of the team's strengths and weaknesses.
         
         Args:
-            team_data: List of dictionaries with Pokémon data
+            team_data: List of dictionaries with Pokémon data, or a TeamAnalysisResult
             types_csv_path: Path to the types CSV file (defaults to "types.csv")
             
         Returns:
             str: A 2-3 sentence summary analyzing the team
         """
-        kpis = TeamAnalysis.calculate_team_kpis(team_data, types_csv_path)
+        return TeamAnalysis.analyze(team_data, types_csv_path).summary
+    
+    @staticmethod
+    def summarize(team_data, kpis):
+        """
+        Build the team summary from already computed KPIs.
         
+        Args:
+            team_data: List of dictionaries with Pokémon data
+            kpis: Dictionary returned by calculate_team_kpis for the team
+            
+        Returns:
+            str: A 2-3 sentence summary analyzing the team
+        """
         # Get key metrics for summary
         defensive_coverage = kpis['team_coverage_score']
         defensive_holes = kpis['defensive_holes']
@@ -448,19 +777,19 @@ class TeamVisualization:
     """Class for visualizing Pokemon team data."""
     
     @staticmethod
-    def generate_radar_chart(team_data, types_csv_path="types.csv"):
+    def radar_values(team_data, types_csv_path="types.csv"):
         """
-        Generate a radar chart for team type effectiveness.
+        The radius arrays plotted by the radar chart.
         
         Args:
-            team_data: List of dictionaries with Pokémon data
+            team_data: List of dictionaries with Pokémon data, or a TeamAnalysisResult
             types_csv_path: Path to the types CSV file (defaults to "types.csv")
             
         Returns:
-            plotly.graph_objects.Figure: Radar chart figure
+            tuple: (types, defensive_r, offensive_r) where the r lists are the
+            normalized metrics of the defensive and offensive traces
         """
-        # Calculate KPIs
-        kpis = TeamAnalysis.calculate_team_kpis(team_data, types_csv_path)
+        kpis = TeamAnalysis.analyze(team_data, types_csv_path).kpis
         
         # Extract metrics for radar chart
         defensive_metrics = kpis['defensive_metrics']
@@ -473,16 +802,32 @@ class TeamVisualization:
         max_def = max(abs(v) for v in defensive_metrics.values()) or 1
         max_off = max(abs(v) for v in offensive_metrics.values()) or 1
         
-        # Convert metrics to lists with normalized values
-        defensive_values = [defensive_metrics[t] / max_def for t in types]
-        offensive_values = [offensive_metrics[t] / max_off for t in types]
+        # Invert defensive values since lower is better for defense
+        defensive_r = [-defensive_metrics[t] / max_def for t in types]
+        offensive_r = [offensive_metrics[t] / max_off for t in types]
+        
+        return types, defensive_r, offensive_r
+    
+    @staticmethod
+    def generate_radar_chart(team_data, types_csv_path="types.csv"):
+        """
+        Generate a radar chart for team type effectiveness.
+        
+        Args:
+            team_data: List of dictionaries with Pokémon data, or a TeamAnalysisResult
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            
+        Returns:
+            plotly.graph_objects.Figure: Radar chart figure
+        """
+        types, defensive_r, offensive_r = TeamVisualization.radar_values(team_data, types_csv_path)
         
         # Create radar chart
         fig = go.Figure()
         
         # Add defensive trace (lower is better for defense)
         fig.add_trace(go.Scatterpolar(
-            r=[-v for v in defensive_values],  # Invert values since lower is better for defense
+            r=defensive_r,
             theta=types,
             fill='toself',
             name='Defensive Effectiveness',
@@ -492,7 +837,7 @@ class TeamVisualization:
         
         # Add offensive trace (higher is better for offense)
         fig.add_trace(go.Scatterpolar(
-            r=offensive_values,
+            r=offensive_r,
             theta=types,
             fill='toself',
             name='Offensive Effectiveness',
@@ -521,14 +866,13 @@ class TeamVisualization:
         Generate a bar chart showing team type effectiveness.
         
         Args:
-            team_data: List of dictionaries with Pokémon data
+            team_data: List of dictionaries with Pokémon data, or a TeamAnalysisResult
             types_csv_path: Path to the types CSV file (defaults to "types.csv")
             
         Returns:
             plotly.graph_objects.Figure: Bar chart figure
         """
-        # Calculate KPIs
-        kpis = TeamAnalysis.calculate_team_kpis(team_data, types_csv_path)
+        kpis = TeamAnalysis.analyze(team_data, types_csv_path).kpis
         
         # Extract metrics for bar chart
         defensive_metrics = kpis['defensive_metrics']
@@ -570,12 +914,30 @@ class TeamVisualization:
 def pokemon_info(pokedex_number, pokemon_csv_path="151pokemon.csv"):
     return PokemonData.get_pokemon_info(pokedex_number, pokemon_csv_path)
 
+def get_many(pokedex_numbers, pokemon_csv_path="151pokemon.csv"):
+    return PokemonData.get_many(pokedex_numbers, pokemon_csv_path)
+
 def calculate_type_effectiveness(team_data, types_csv_path="types.csv"):
     return TeamAnalysis.calculate_type_effectiveness(team_data, types_csv_path)
 
 def calculate_team_kpis(team_data, types_csv_path="types.csv"):
     return TeamAnalysis.calculate_team_kpis(team_data, types_csv_path)
 
+def score_teams(teams, types_csv_path="types.csv", as_frame=False, team_sizes=None):
+    return TeamAnalysis.score_teams(teams, types_csv_path, as_frame, team_sizes)
+
+def team_profile(team_data, types_csv_path="types.csv"):
+    return TeamAnalysis.team_profile(team_data, types_csv_path)
+
+def team_cache_info():
+    return TeamAnalysis.cache_info()
+
+def analyze_team(team_data, types_csv_path="types.csv"):
+    return TeamAnalysis.analyze(team_data, types_csv_path)
+
+def incremental_analysis(team_data=(), types_csv_path="types.csv"):
+    return IncrementalTeamAnalysis(team_data, types_csv_path)
+
 def recommend_types_for_defense(vulnerable_types, defensive_metrics, types_csv_path="types.csv"):
     return TeamAnalysis.recommend_types_for_defense(vulnerable_types, defensive_metrics, types_csv_path)
 
@@ -585,8 +947,18 @@ def recommend_types_for_offense(offensive_gaps, offensive_metrics, types_csv_pat
 def generate_radar(team_data, types_csv_path="types.csv"):
     return TeamVisualization.generate_radar_chart(team_data, types_csv_path)
 
-def generate_bar(team_data, types_csv_path = "types.csv"):
-    return TeamVisualization.generate_bar_chart(team_data,types_csv_path="types.csv")
+def radar_values(team_data, types_csv_path="types.csv"):
+    return TeamVisualization.radar_values(team_data, types_csv_path)
+
+def generate_bar(team_data, types_csv_path="types.csv"):
+    return TeamVisualization.generate_bar_chart(team_data, types_csv_path)
 
 def generate_team_summary(team_data, types_csv_path="types.csv"):
-    return TeamAnalysis.generate_team_summary(team_data, types_csv_path)
\ No newline at end of file
+    return TeamAnalysis.generate_team_summary(team_data, types_csv_path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from src.stream_scoring import main
+    sys.exit(main())
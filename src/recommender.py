@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+
+from src.batch_scoring import MAX_TEAM_SIZE, SCALAR_KPIS, encode_teams, score_encoded, weighted_objective
+from src.pokedex import NO_TYPE_CODE, Pokedex
+from src.snapshot import source_stamp
+from src.team_search import DEFAULT_OBJECTIVE
+from src.type_chart import TypeChart
+
+
+class Recommender:
+    """
+    Ranks every Pokédex entry by how much it improves a team.
+
+    The current team plus one candidate team per Pokédex entry (the team
+    with that entry added, or swapped in for one member) are scored in a
+    single score_encoded batch, so the gains follow calculate_team_kpis
+    exactly and a full ranking takes a couple of milliseconds.
+    """
+
+    # Recommenders already built, keyed by absolute CSV paths with the
+    # files' stamps
+    _loaded = {}
+
+    def __init__(self, pokedex, chart):
+        self.pokedex = pokedex
+        self.chart = chart
+
+        # Pokédex type codes -> chart type IDs; a missing type (code -1)
+        # lands on the trailing no_type slot
+        code_ids = np.array([chart.type_ids.get(t, -1) for t in pokedex.type_names] + [chart.no_type])
+        type1_ids = code_ids[pokedex.type1_codes]
+        type2_ids = code_ids[pokedex.type2_codes]
+
+        # Entries whose types aren't all in the chart can't be scored
+        self.valid = (type1_ids >= 0) & (type2_ids >= 0) & (pokedex.type1_codes != NO_TYPE_CODE)
+        self.candidate_types = np.stack([type1_ids, type2_ids], axis=1).clip(0)
+        # Same profile row <=> same type pair in either order, so same gains
+        self.type_pairs = chart.profile_rows[self.candidate_types[:, 0], self.candidate_types[:, 1]]
+
+    @classmethod
+    def from_files(cls, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+        """
+        Return the shared recommender over the Pokédex and type chart,
+        building it only the first time or after either file has been modified.
+
+        Args:
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+
+        Returns:
+            Recommender: The shared recommender
+        """
+        paths = (os.path.abspath(pokemon_csv_path), os.path.abspath(types_csv_path))
+        stamps = tuple(source_stamp(path) for path in paths)
+        cached = cls._loaded.get(paths)
+        if cached is not None and cached[0] == stamps:
+            return cached[1]
+
+        recommender = cls(Pokedex.load(paths[0]), TypeChart.load(paths[1]))
+        cls._loaded[paths] = (stamps, recommender)
+        return recommender
+
+    def score_candidates(self, team_data, replace=None, objective=None):
+        """
+        Score the team with every Pokédex entry added, or swapped in for one member.
+
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+            replace: Index of the member to replace, or None to add a member
+            objective: Dict of weights keyed by scalar KPI names (defaults
+                to team_search.DEFAULT_OBJECTIVE)
+
+        Returns:
+            tuple: (kpis, gains) where kpis is the score_encoded batch with
+            the current team in row 0 and the team with entry i in row
+            i + 1, and gains is the objective gain of each entry
+
+        Raises:
+            ValueError: If the team is full and nothing is replaced, if
+                ``replace`` isn't a member index, or if the team uses a
+                type that isn't in the chart
+        """
+        weights = DEFAULT_OBJECTIVE if objective is None else objective
+        if replace is None and len(team_data) >= MAX_TEAM_SIZE:
+            raise ValueError(f"Team already has {MAX_TEAM_SIZE} members; pick a member to replace")
+        if replace is not None and not 0 <= replace < len(team_data):
+            raise ValueError(f"No member {replace} in a team of {len(team_data)}")
+
+        encoded, sizes = encode_teams([team_data], self.chart)
+        slot = len(team_data) if replace is None else replace
+
+        # Row 0 is the current team, then one row per Pokédex entry
+        teams = np.repeat(encoded, len(self.candidate_types) + 1, axis=0)
+        teams[1:, slot] = self.candidate_types
+        team_sizes = np.full(len(teams), sizes[0])
+        team_sizes[1:] = len(team_data) + (replace is None)
+
+        kpis = score_encoded(teams, team_sizes, self.chart)
+        scores = weighted_objective(kpis, weights)
+        return kpis, scores[1:] - scores[0]
+
+    def rank(self, team_data, kpis, gains, top_n=5, distinct_types=True):
+        """
+        Best entries from a score_candidates batch.
+
+        Args:
+            team_data: The team the batch was scored for
+            kpis: KPI batch returned by score_candidates
+            gains: Objective gains returned by score_candidates
+            top_n: Number of recommendations to return
+            distinct_types: Return at most one Pokémon per type pair (the
+                lowest Pokédex number), since they would all score the same
+
+        Returns:
+            list: Up to ``top_n`` dicts, best first, with 'pokemon' (the
+            Pokédex entry), 'score' (gain in the objective) and 'gains'
+            (change of every scalar KPI)
+        """
+        eligible = self.valid.copy()
+        in_team = {pokemon.get('pokedex') for pokemon in team_data}
+        eligible &= ~np.isin(self.pokedex.numbers, [n for n in in_team if isinstance(n, int)])
+
+        results = []
+        seen_pairs = set()
+        for i in np.argsort(-gains, kind='stable'):
+            if len(results) >= top_n:
+                break
+            if not eligible[i]:
+                continue
+            if distinct_types:
+                pair = int(self.type_pairs[i])
+                if pair in seen_pairs:
+                    continue
+                seen_pairs.add(pair)
+            results.append({
+                'pokemon': self.pokedex.entries[i],
+                'score': float(gains[i]),
+                'gains': {kpi: (kpis[kpi][i + 1] - kpis[kpi][0]).item() for kpi in SCALAR_KPIS},
+            })
+        return results
+
+    def recommend(self, team_data, top_n=5, replace=None, objective=None, distinct_types=True):
+        """
+        Best Pokémon to add to a team, or to swap in for one of its members.
+
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+            top_n: Number of recommendations to return
+            replace: Index of the member to replace, or None to add a member
+            objective: Dict of weights keyed by scalar KPI names (defaults
+                to team_search.DEFAULT_OBJECTIVE)
+            distinct_types: Return at most one Pokémon per type pair (the
+                lowest Pokédex number), since they would all score the same
+
+        Returns:
+            list: Up to ``top_n`` dicts, best first, with 'pokemon' (the
+            Pokédex entry), 'score' (gain in the objective) and 'gains'
+            (change of every scalar KPI)
+
+        Raises:
+            ValueError: If the team is full and nothing is replaced, if
+                ``replace`` isn't a member index, or if the team uses a
+                type that isn't in the chart
+        """
+        kpis, gains = self.score_candidates(team_data, replace, objective)
+        return self.rank(team_data, kpis, gains, top_n, distinct_types)
+
+
+def recommend_pokemon(team_data, top_n=5, replace=None, objective=None,
+                      pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+    return Recommender.from_files(pokemon_csv_path, types_csv_path).recommend(
+        team_data, top_n, replace, objective)
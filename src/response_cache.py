@@ -0,0 +1,161 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+
+
+def normalize_question(question):
+    """
+    Canonical form of a chat question, so trivially different phrasings of
+    the same text share a cache entry.
+
+    Lowercases, drops punctuation and collapses whitespace, e.g.
+    "What am I weak to?" and "what am i  weak to" both become
+    "what am i weak to".
+
+    Args:
+        question: The user's question
+
+    Returns:
+        str: Normalized question
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+def team_context_key(team_context):
+    """
+    Order-independent key for the team context string sent to the model.
+
+    Args:
+        team_context: Comma-separated "Name (Type1/Type2)" entries, as built
+            by PokemonTeamChatAssistant._prepare_short_team_context
+
+    Returns:
+        str: The sorted entries joined with commas
+    """
+    return ", ".join(sorted(entry.strip() for entry in team_context.split(",")))
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of LLM answers keyed by model, normalized
+    question and team.
+
+    Entries expire after ``ttl`` seconds and the least recently used ones
+    are evicted beyond ``max_entries``. Hit/miss counters cover this
+    process only.
+    """
+
+    def __init__(self, path="llm_cache.sqlite3", ttl=7 * 24 * 3600, max_entries=5000):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway cache)
+            ttl: Seconds an answer stays valid
+            max_entries: Maximum number of stored answers
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, question TEXT, team TEXT,"
+                " response TEXT, created REAL, accessed REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @staticmethod
+    def make_key(model, question, team_context):
+        """
+        Cache key for a question about a team.
+
+        Args:
+            model: Model name
+            question: The user's question
+            team_context: Team context string sent to the model
+
+        Returns:
+            str: Hex digest of the normalized question and canonical team
+        """
+        parts = (model, normalize_question(question), team_context_key(team_context))
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, model, question, team_context):
+        """
+        Look up a cached answer.
+
+        Args:
+            model: Model name
+            question: The user's question
+            team_context: Team context string sent to the model
+
+        Returns:
+            str or None: The cached answer, or None if missing or expired
+        """
+        key = self.make_key(model, question, team_context)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, model, question, team_context, response):
+        """
+        Store an answer, evicting expired and least recently used entries.
+
+        Args:
+            model: Model name
+            question: The user's question
+            team_context: Team context string sent to the model
+            response: The answer to cache
+        """
+        key = self.make_key(model, question, team_context)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, normalize_question(question), team_context_key(team_context), response, now, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def info(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict: hits, misses, hit_rate, size and maxsize
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self),
+            'maxsize': self.max_entries,
+        }
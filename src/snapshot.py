@@ -0,0 +1,86 @@
+import json
+import os
+
+import numpy as np
+
+from src.metrics import SNAPSHOT_LOADS
+
+# Bump when the layout of a snapshot changes so stale ones get rebuilt
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_dir(source_path):
+    """Directory holding the compiled snapshot of a CSV, e.g. .snapshots/types/ for types.csv."""
+    folder, name = os.path.split(os.path.abspath(source_path))
+    return os.path.join(folder, ".snapshots", os.path.splitext(name)[0])
+
+
+def source_stamp(source_path):
+    """Modification time and size identifying the current version of a file."""
+    stat = os.stat(source_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def read_snapshot(source_path, kind, stamp=None):
+    """
+    Memory-map the snapshot of a CSV, if it is up to date.
+
+    Args:
+        source_path: Path of the CSV the snapshot was compiled from
+        kind: Kind of data expected in the snapshot (e.g. 'type_chart')
+        stamp: source_stamp(source_path), if already taken
+
+    Returns:
+        tuple or None: (meta dict, dict of read-only memory-mapped arrays),
+        or None if there is no snapshot or the CSV changed since it was written
+    """
+    folder = snapshot_dir(source_path)
+    try:
+        with open(os.path.join(folder, "meta.json"), "r", encoding="utf-8") as file:
+            meta = json.load(file)
+        if (meta.get('version') != SNAPSHOT_VERSION or meta.get('kind') != kind
+                or meta.get('source') != (stamp or source_stamp(source_path))):
+            return None
+        arrays = {
+            name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+            for name in meta['arrays']
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+    SNAPSHOT_LOADS.inc(kind)
+    return meta, arrays
+
+
+def write_snapshot(source_path, kind, stamp, arrays, **meta):
+    """
+    Compile arrays parsed from a CSV into its snapshot.
+
+    Every array is written to its own .npy file so it can be memory-mapped,
+    and meta.json is replaced last: a reader never pairs new metadata with
+    old arrays. Failing to write (e.g. a read-only checkout) is not an error
+    since the CSV can always be parsed again.
+
+    Args:
+        source_path: Path of the CSV the arrays were parsed from
+        kind: Kind of data in the snapshot (e.g. 'type_chart')
+        stamp: source_stamp(source_path) taken before the CSV was parsed
+        arrays: Dict of array name to numpy array (no object arrays)
+        **meta: Extra JSON-serializable fields stored in meta.json
+    """
+    folder = snapshot_dir(source_path)
+    suffix = f".{os.getpid()}.tmp"
+    try:
+        os.makedirs(folder, exist_ok=True)
+        for name, array in arrays.items():
+            path = os.path.join(folder, f"{name}.npy")
+            with open(path + suffix, "wb") as file:
+                np.save(file, np.ascontiguousarray(array), allow_pickle=False)
+            os.replace(path + suffix, path)
+
+        meta = dict(meta, version=SNAPSHOT_VERSION, kind=kind, source=stamp, arrays=sorted(arrays))
+        path = os.path.join(folder, "meta.json")
+        with open(path + suffix, "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+        os.replace(path + suffix, path)
+    except OSError as e:
+        print(f"Could not write data snapshot to {folder}: {e}")
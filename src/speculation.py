@@ -0,0 +1,145 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.batch_scoring import MAX_TEAM_SIZE, team_kpis
+from src.pokemon_analysis import TeamAnalysis
+from src.recommender import Recommender
+from src.team_cache import LRUCache, team_key
+
+
+class TeamSpeculator:
+    """
+    Precomputes the analysis of every team one click away from the current one.
+
+    When a session's team changes, a background thread scores the team
+    with each possible next addition and with each member removed, and
+    stores the KPIs in TeamAnalysis.speculative, a separate bounded cache
+    that lookups fall back to, so the click that follows is a cache hit
+    without speculation evicting analyses that were actually requested. Additions are cached once per distinct (type1, type2) in the
+    Pokédex, since Pokémon sharing their types share a team key. The best
+    addition found along the way is kept as a "best next pick" hint.
+    """
+
+    def __init__(self, max_workers=1, max_hints=1024, pokemon_csv_path="151pokemon.csv",
+                 types_csv_path="types.csv"):
+        """
+        Args:
+            max_workers: Background threads precomputing analyses
+            max_hints: Number of teams whose best next pick is remembered
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculate")
+        self.hints = LRUCache(maxsize=max_hints)
+        self.pokemon_csv_path = pokemon_csv_path
+        self.types_csv_path = types_csv_path
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id, team_data):
+        """
+        Start precomputing around a session's new team.
+
+        A session's earlier job is cancelled if it hasn't started yet, since
+        the user has already moved on from that team.
+
+        Args:
+            session_id: Session ID
+            team_data: The session's team
+
+        Returns:
+            concurrent.futures.Future: Resolves to the number of analyses added
+        """
+        with self._lock:
+            previous = self._pending.pop(session_id, None)
+            future = self.executor.submit(self.precompute, list(team_data))
+            self._pending[session_id] = future
+
+        # Outside the lock: cancelling runs the job's forget callback right away
+        if previous is not None:
+            previous.cancel()
+
+        def forget(done):
+            with self._lock:
+                if self._pending.get(session_id) is done:
+                    del self._pending[session_id]
+
+        future.add_done_callback(forget)
+        return future
+
+    def precompute(self, team_data):
+        """
+        Cache the KPIs of every one-member addition to and removal from a team.
+
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+
+        Returns:
+            int: Number of analyses added to TeamAnalysis.speculative
+        """
+        recommender = Recommender.from_files(self.pokemon_csv_path, self.types_csv_path)
+        chart = recommender.chart
+        added = 0
+        try:
+            if len(team_data) < MAX_TEAM_SIZE:
+                kpis, gains = recommender.score_candidates(team_data)
+                picks = recommender.rank(team_data, kpis, gains, top_n=1)
+                self.hints.put(self._hint_key(chart, team_data), picks[0] if picks else None)
+
+                # One representative entry per (type1, type2), the unit of team_key
+                candidates = np.flatnonzero(recommender.valid)
+                type_ids = recommender.candidate_types[candidates]
+                _, first = np.unique(type_ids[:, 0] * (chart.no_type + 1) + type_ids[:, 1], return_index=True)
+                for i in candidates[first].tolist():
+                    added += self._store(chart, team_data + [recommender.pokedex.entries[i]], kpis, i + 1)
+
+            if team_data:
+                removals = [team_data[:i] + team_data[i + 1:] for i in range(len(team_data))]
+                kpis = TeamAnalysis.score_teams(removals, self.types_csv_path)
+                for i, team in enumerate(removals):
+                    added += self._store(chart, team, kpis, i)
+        except ValueError as e:
+            print(f"Error precomputing team analyses: {e}")
+        return added
+
+    @staticmethod
+    def _hint_key(chart, team_data):
+        # Members are never recommended, so the hint depends on who they are
+        return chart.fingerprint, team_key(team_data), frozenset(p.get('pokedex') for p in team_data)
+
+    @staticmethod
+    def _store(chart, team, kpis, row):
+        """Keep one team's KPIs from a batch, unless they're already cached."""
+        key = ('kpis', chart.fingerprint, team_key(team))
+        if key in TeamAnalysis.cache or key in TeamAnalysis.speculative:
+            return 0
+        TeamAnalysis.speculative.put(key, team_kpis(kpis, row, chart))
+        return 1
+
+    def best_next_pick(self, team_data):
+        """
+        The Pokémon that improves a team the most, from the precomputed hint
+        when there is one.
+
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+
+        Returns:
+            dict or None: Recommendation as returned by Recommender.recommend,
+            or None for a full team or when nothing can be added
+        """
+        if len(team_data) >= MAX_TEAM_SIZE:
+            return None
+        recommender = Recommender.from_files(self.pokemon_csv_path, self.types_csv_path)
+        key = self._hint_key(recommender.chart, team_data)
+        if key in self.hints:
+            return self.hints.get(key)
+        try:
+            picks = recommender.recommend(team_data, 1)
+        except ValueError:
+            picks = []
+        pick = picks[0] if picks else None
+        self.hints.put(key, pick)
+        return pick
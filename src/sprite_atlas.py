@@ -0,0 +1,108 @@
+import argparse
+import hashlib
+import json
+import os
+
+from src.pokedex import Pokedex
+
+SPRITE_SIZE = 96
+ATLAS_COLUMNS = 32
+
+
+def build_atlas(source_dir, out_dir="assets/sprites", pokemon_csv_path="151pokemon.csv",
+                size=SPRITE_SIZE, columns=ATLAS_COLUMNS):
+    """
+    Pack one sprite per Pokédex entry into a single atlas image.
+
+    Sprites are read from ``<source_dir>/<number>.png`` and centred in a
+    size x size cell (larger sprites are cropped). Entries without a
+    sprite keep an empty cell, as does cell 0, which the team cards use
+    for an unknown Pokémon.
+
+    Writes ``atlas.png``, ``atlas.json`` (cell offsets by Pokédex number)
+    and ``atlas.css`` (one ``.sprite-<number>`` background offset per
+    entry) to ``out_dir``. This is a build step, so Pillow is only needed
+    here and not by the app.
+
+    Args:
+        source_dir: Directory of <number>.png sprites
+        out_dir: Output directory, normally under Dash's assets/ folder
+        pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+        size: Sprite cell width and height in pixels
+        columns: Cells per atlas row
+
+    Returns:
+        dict: The index written to atlas.json
+
+    Raises:
+        ImportError: If Pillow isn't installed
+    """
+    from PIL import Image
+
+    numbers = [0] + sorted(entry['pokedex'] for entry in Pokedex.load(pokemon_csv_path))
+    rows = (len(numbers) + columns - 1) // columns
+    atlas = Image.new("RGBA", (columns * size, rows * size))
+    offsets = {}
+    missing = 0
+
+    for cell, number in enumerate(numbers):
+        x, y = (cell % columns) * size, (cell // columns) * size
+        offsets[number] = [x, y]
+        if not number:
+            continue
+
+        path = os.path.join(source_dir, f"{number}.png")
+        try:
+            with Image.open(path) as sprite:
+                sprite = sprite.convert("RGBA")
+        except FileNotFoundError:
+            missing += 1
+            continue
+        except OSError as e:
+            print(f"Error reading sprite {path}: {e}")
+            missing += 1
+            continue
+
+        # Cropping past the edges pads with transparent pixels, which centres small sprites
+        left, top = (sprite.width - size) // 2, (sprite.height - size) // 2
+        atlas.paste(sprite.crop((left, top, left + size, top + size)), (x, y))
+
+    os.makedirs(out_dir, exist_ok=True)
+    atlas_path = os.path.join(out_dir, "atlas.png")
+    atlas.save(atlas_path, optimize=True)
+    with open(atlas_path, "rb") as file:
+        version = hashlib.sha1(file.read()).hexdigest()[:12]
+
+    index = {
+        'image': f"atlas.png?v={version}",
+        'size': size,
+        'columns': columns,
+        'width': atlas.width,
+        'height': atlas.height,
+        'sprites': offsets,
+    }
+    with open(os.path.join(out_dir, "atlas.json"), "w", encoding="utf-8") as file:
+        json.dump(index, file)
+
+    # The versioned URL lets the atlas be cached forever and still update
+    lines = [
+        "/* Generated by python -m src.sprite_atlas; do not edit */",
+        f".sprite {{ display: inline-block; width: {size}px; height: {size}px; "
+        f"background: url(\"{index['image']}\") 0 0 no-repeat; }}",
+    ]
+    lines += [f".sprite-{number} {{ background-position: -{x}px -{y}px; }}" for number, (x, y) in offsets.items()]
+    with open(os.path.join(out_dir, "atlas.css"), "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+    print(f"Packed {len(numbers) - 1 - missing} sprites into {atlas_path} ({missing} missing)")
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack Pokémon sprites into a CSS sprite atlas (needs Pillow).")
+    parser.add_argument("--source", required=True, help="Directory of <pokedex number>.png sprites")
+    parser.add_argument("--out", default="assets/sprites", help="Output directory (default: assets/sprites)")
+    parser.add_argument("--pokemon-csv", default="151pokemon.csv", help="Pokédex CSV (default: 151pokemon.csv)")
+    parser.add_argument("--size", type=int, default=SPRITE_SIZE, help="Sprite size in pixels (default: 96)")
+    args = parser.parse_args()
+    build_atlas(args.source, args.out, args.pokemon_csv, args.size)
@@ -0,0 +1,267 @@
+"""
+Streaming team scorer for large JSONL dumps.
+
+Reads one team per line, either a JSON list of members or an object with a
+"team" list and an optional "id", where members are Pokédex numbers, names
+or dicts with 'type1'/'type2'. Teams are scored in fixed-size chunks with
+the vectorized engine (the same KPIs as calculate_team_kpis) and written to
+stdout as JSONL or CSV while the input is still being read, so memory use
+doesn't grow with the input.
+
+Usage:
+    python -m src.pokemon_analysis score [FILE] [--format jsonl|csv]
+        [--chunk-size 2000] [--workers 1] [--out FILE]
+    python -m src.pokemon_analysis export-profiles [--types-csv types.csv] [--out FILE]
+
+Lines that can't be scored are reported on stderr and skipped, along with
+a periodic progress and throughput report.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src.api import resolve_team
+from src.batch_scoring import SCALAR_KPIS, encode_teams, team_kpis
+from src.pokedex import Pokedex
+from src.pokemon_analysis import TeamAnalysis
+from src.type_chart import TypeChart, profiles_path
+
+CHUNK_SIZE = 2000
+
+# Type-list KPIs, written to CSV as '|'-separated type names
+LIST_KPIS = ('vulnerable_types', 'offensive_gaps', 'missing_types',
+             'defensive_recommendations', 'offensive_recommendations')
+
+
+def read_lines(file):
+    """Yield (line number, text) for every non-blank line of a file."""
+    for number, line in enumerate(file, 1):
+        if line.strip():
+            yield number, line
+
+
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` consecutive items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_team(text, pokedex, chart=None):
+    """
+    Parse one input line.
+
+    Args:
+        text: A JSON list of members, or an object with 'team' and optional 'id'
+        pokedex: Pokedex to look numbers and names up in
+        chart: TypeChart whose types dict members may use, or None to only
+            check that their types are strings
+
+    Returns:
+        tuple: (id or None, list of Pokémon dicts)
+
+    Raises:
+        ValueError: If the line isn't a valid team
+    """
+    record = json.loads(text)
+    team_id = None
+    if isinstance(record, dict):
+        team_id = record.get('id')
+        record = record.get('team')
+    return team_id, resolve_team(record, pokedex, chart)
+
+
+def csv_header(chart):
+    """CSV columns written by the scorer."""
+    return (['id'] + list(SCALAR_KPIS) + list(LIST_KPIS)
+            + [f"defensive_{t}" for t in chart.types] + [f"offensive_{t}" for t in chart.types])
+
+
+def _csv_row(team_id, kpis, chart):
+    return ([team_id if team_id is not None else ''] + [kpis[kpi] for kpi in SCALAR_KPIS]
+            + ['|'.join(kpis[kpi]) for kpi in LIST_KPIS]
+            + [kpis['defensive_metrics'][t] for t in chart.types]
+            + [kpis['offensive_metrics'][t] for t in chart.types])
+
+
+def score_lines(lines, output_format="jsonl", pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+    """
+    Score one chunk of input lines.
+
+    Args:
+        lines: List of (line number, text) pairs
+        output_format: 'jsonl' or 'csv'
+        pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+        types_csv_path: Path to the types CSV file (defaults to "types.csv")
+
+    Returns:
+        tuple: (rendered output text, number of teams scored, list of
+        error messages for the lines that were skipped)
+    """
+    pokedex = Pokedex.load(pokemon_csv_path)
+    chart = TypeChart.load(types_csv_path)
+    ids, teams, errors = [], [], []
+    for number, text in lines:
+        try:
+            team_id, team = parse_team(text, pokedex, chart)
+            # A bad team would fail the whole chunk, so encode each one here
+            encode_teams([team], chart)
+        except ValueError as e:
+            errors.append(f"line {number}: {e}")
+            continue
+        ids.append(team_id)
+        teams.append(team)
+
+    if not teams:
+        return "", 0, errors
+    kpis = TeamAnalysis.score_teams(teams, types_csv_path)
+
+    out = io.StringIO()
+    if output_format == "csv":
+        writer = csv.writer(out)
+        for i, team_id in enumerate(ids):
+            writer.writerow(_csv_row(team_id, team_kpis(kpis, i, chart), chart))
+    else:
+        for i, team_id in enumerate(ids):
+            record = team_kpis(kpis, i, chart)
+            if team_id is not None:
+                record = dict(id=team_id, **record)
+            out.write(json.dumps(record) + "\n")
+    return out.getvalue(), len(teams), errors
+
+
+def _score_parallel(chunks, workers, *args):
+    """Score chunks on worker processes, in input order, with a bounded number in flight."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for chunk in chunks:
+            window.append(pool.submit(score_lines, chunk, *args))
+            if len(window) >= 2 * workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+class Progress:
+    """Periodic progress and throughput report on stderr."""
+
+    def __init__(self, interval=2.0, stream=sys.stderr):
+        self.interval = interval
+        self.stream = stream
+        self.started = self.last_report = time.perf_counter()
+        self.scored = 0
+        self.errors = 0
+
+    def update(self, scored, errors):
+        self.scored += scored
+        self.errors += errors
+        now = time.perf_counter()
+        if self.interval and now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report("progress")
+
+    def report(self, label):
+        elapsed = time.perf_counter() - self.started
+        rate = self.scored / elapsed if elapsed else 0.0
+        self.stream.write(f"[{label}] {self.scored:,} teams scored, {self.errors:,} skipped, "
+                          f"{elapsed:.1f}s, {rate:,.0f} teams/s\n")
+        self.stream.flush()
+
+
+def score_stream(source, out, output_format="jsonl", chunk_size=CHUNK_SIZE, workers=1,
+                 pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv", progress=None):
+    """
+    Score every team of a JSONL stream, writing results as they're ready.
+
+    Args:
+        source: Text file of JSONL teams
+        out: Text file to write JSONL or CSV to
+        output_format: 'jsonl' or 'csv'
+        chunk_size: Teams scored per batch
+        workers: Worker processes (1 scores in this process)
+        pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+        types_csv_path: Path to the types CSV file (defaults to "types.csv")
+        progress: Progress to report to, or None
+
+    Returns:
+        tuple: (teams scored, lines skipped)
+    """
+    if output_format == "csv":
+        csv.writer(out).writerow(csv_header(TypeChart.load(types_csv_path)))
+
+    chunks = chunked(read_lines(source), chunk_size)
+    args = (output_format, pokemon_csv_path, types_csv_path)
+    if workers > 1:
+        results = _score_parallel(chunks, workers, *args)
+    else:
+        results = (score_lines(chunk, *args) for chunk in chunks)
+
+    scored = skipped = 0
+    for text, count, errors in results:
+        out.write(text)
+        out.flush()
+        for error in errors:
+            sys.stderr.write(f"Skipped {error}\n")
+        scored += count
+        skipped += len(errors)
+        if progress is not None:
+            progress.update(count, len(errors))
+    return scored, skipped
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(prog="python -m src.pokemon_analysis",
+                                     description="Pokémon team analysis tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    score = commands.add_parser("score", help="Score teams read as JSONL")
+    score.add_argument("input", nargs="?", default="-", help="JSONL file of teams (default: stdin)")
+    score.add_argument("--out", help="Write results here instead of stdout")
+    score.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="Output format (default: jsonl)")
+    score.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Teams per batch (default: {CHUNK_SIZE})")
+    score.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    score.add_argument("--pokemon-csv", default="151pokemon.csv", help="Pokédex CSV (default: 151pokemon.csv)")
+    score.add_argument("--types-csv", default="types.csv", help="Type chart CSV (default: types.csv)")
+    score.add_argument("--progress-every", type=float, default=2.0,
+                       help="Seconds between progress reports on stderr, 0 for none (default: 2)")
+    export = commands.add_parser("export-profiles", help="Write the dual-type defensive profile table as CSV")
+    export.add_argument("--types-csv", default="types.csv", help="Type chart CSV (default: types.csv)")
+    export.add_argument("--out", help="Destination CSV (default: <types csv stem>_profiles.csv)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export-profiles":
+        out = args.out or profiles_path(args.types_csv)
+        try:
+            TypeChart.load(args.types_csv).export_profiles(out)
+        except OSError as e:
+            sys.stderr.write(f"Could not write type profiles to {out}: {e}\n")
+            return 1
+        sys.stderr.write(f"Wrote type profiles to {out}\n")
+        return 0
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = sys.stdout if not args.out else open(args.out, "w", encoding="utf-8", newline="")
+    progress = Progress(args.progress_every)
+    try:
+        score_stream(source, out, args.format, max(1, args.chunk_size), max(1, args.workers),
+                     args.pokemon_csv, args.types_csv, progress)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    progress.report("done")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
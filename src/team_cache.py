@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+
+from src.type_chart import clean_type
+
+
+def team_key(team_data):
+    """
+    Canonical, order-independent key for a team.
+
+    Only the (type1, type2) pair of each member affects the analysis, so two
+    teams with the same multiset of type pairs share a key.
+
+    Args:
+        team_data: List of dictionaries with Pokémon data (including types)
+
+    Returns:
+        tuple: Sorted tuple of (type1, type2) pairs, '' standing in for no type
+    """
+    pairs = []
+    for pokemon in team_data:
+        type1 = clean_type(pokemon.get('type1')) or ''
+        type2 = clean_type(pokemon.get('type2')) or ''
+        # Fire/Fire is analysed exactly like Fire
+        pairs.append((type1, '' if type2 == type1 else type2))
+    return tuple(sorted(pairs))
+
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Look up a key, marking it as most recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The cached value, or ``default``
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def pop(self, key, default=None):
+        """
+        Remove a key and return its value.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The cached value, or ``default``
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the oldest entries beyond ``maxsize``.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict: hits, misses, hit_rate, size and maxsize
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
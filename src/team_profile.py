@@ -0,0 +1,96 @@
+import numpy as np
+
+from src.type_chart import clean_type
+
+
+class TeamProfile:
+    """
+    Per-member type matchups of a team, computed once and shared by the
+    chat assistant's quick answers.
+
+    Attributes:
+        names: Member names in team order
+        team_types: Distinct types used by the team, in first-seen order
+        multipliers: (members, types) damage multiplier of every attacking
+            type against each member
+        offensive_coverage: Defending types at least one member's own type
+            hits super effectively, in chart order
+        coverage_gaps: The remaining defending types, in chart order
+        threats: Dict of attacking type to the (member index, multiplier)
+            pairs it hits super effectively, ordered by the first member it
+            threatens and then by chart order
+        resistances: Dict of attacking type to the number of members
+            resisting it (multiplier <= 0.5)
+    """
+
+    def __init__(self, team_data, chart):
+        """
+        Args:
+            team_data: List of dictionaries with Pokémon data (including types)
+            chart: TypeChart to evaluate the team against
+        """
+        self.names = [pokemon.get('pokemon', 'Unknown') for pokemon in team_data]
+        self.team_types = []
+        type1_ids = []
+        type2_ids = []
+
+        for pokemon in team_data:
+            type1 = clean_type(pokemon.get('type1'))
+            type2 = clean_type(pokemon.get('type2'))
+            for type_name in (type1, type2):
+                if type_name and type_name not in self.team_types:
+                    self.team_types.append(type_name)
+            # Unknown types are neutral, like a missing entry in the chart
+            type1_ids.append(chart.type_ids.get(type1, chart.no_type))
+            type2_ids.append(chart.type_ids.get(type2, chart.no_type))
+
+        type1_ids = np.array(type1_ids, dtype=np.intp)
+        type2_ids = np.array(type2_ids, dtype=np.intp)
+
+        # Defence: one lookup per member in the precomputed profile table
+        self.multipliers = chart.profile_multipliers[chart.profile_rows[type1_ids, type2_ids]]
+
+        # Offence: a member covers what either of its own types hits for 2x
+        attacking = np.concatenate([type1_ids, type2_ids])
+        attacking = attacking[attacking != chart.no_type]
+        covered = (chart.matrix[attacking] >= 2.0).any(axis=0)
+        self.offensive_coverage = [t for t, hit in zip(chart.types, covered) if hit]
+        self.coverage_gaps = [t for t, hit in zip(chart.types, covered) if not hit]
+
+        weak = self.multipliers >= 2.0
+        self.threats = {}
+        if len(weak):
+            first_member = np.where(weak.any(axis=0), weak.argmax(axis=0), len(weak))
+            for type_id in np.lexsort((np.arange(len(chart)), first_member)):
+                members = np.flatnonzero(weak[:, type_id])
+                if len(members):
+                    self.threats[chart.types[type_id]] = [
+                        (int(i), float(self.multipliers[i, type_id])) for i in members
+                    ]
+
+        resisted = (self.multipliers <= 0.5).sum(axis=0)
+        self.resistances = {t: int(count) for t, count in zip(chart.types, resisted) if count}
+
+    def __len__(self):
+        return len(self.names)
+
+    def threat_counts(self):
+        """
+        Number of members each threatening type hits super effectively.
+
+        Returns:
+            dict: Counts keyed by attacking type, in ``threats`` order
+        """
+        return {attacking: len(members) for attacking, members in self.threats.items()}
+
+    def main_threats(self, min_members=2):
+        """
+        Attacking types that threaten several members.
+
+        Args:
+            min_members: Minimum number of members threatened
+
+        Returns:
+            list: Type names in ``threats`` order
+        """
+        return [attacking for attacking, members in self.threats.items() if len(members) >= min_members]
@@ -0,0 +1,208 @@
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from src.batch_scoring import encode_teams, score_encoded, team_kpis, weighted_objective
+from src.team_search import DEFAULT_OBJECTIVE
+from src.type_chart import TypeChart
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _share_chart(chart):
+    """
+    Copy a chart's arrays into shared memory blocks.
+
+    Returns:
+        tuple: (blocks, spec) where blocks must be kept alive and unlinked by
+        the caller, and spec is the picklable description workers attach to
+    """
+    blocks = []
+    arrays = {}
+    for name in TypeChart.ARRAYS:
+        array = getattr(chart, name)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        arrays[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, {'types': chart.types, 'fingerprint': chart.fingerprint, 'arrays': arrays}
+
+
+def _attach(name):
+    """
+    Attach to a shared memory block owned by the parent process.
+
+    The block must not be registered with the resource tracker again, or the
+    tracker would unlink it (or complain about it) when a worker exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _init_worker(spec, weights, top_k):
+    """Attach to the shared chart once per worker process."""
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in spec['arrays'].items():
+        block = _attach(block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    _worker['blocks'] = blocks
+    _worker['chart'] = TypeChart.from_arrays(spec['types'], spec['fingerprint'], arrays)
+    _worker['weights'] = weights
+    _worker['top_k'] = top_k
+
+
+def _score_shard(teams, offset):
+    """
+    Score one shard of teams in a worker and keep its local top-K.
+
+    Args:
+        teams: List of teams, or an (n, 6, 2) array of type IDs
+        offset: Position of the shard's first team in the whole stream
+
+    Returns:
+        dict: 'top' list of (score, index, kpis), 'teams', 'seconds' and 'pid'
+    """
+    started = time.perf_counter()
+    chart = _worker['chart']
+
+    if isinstance(teams, np.ndarray):
+        encoded = teams.astype(np.intp)
+        team_sizes = (encoded[:, :, 0] != chart.no_type).sum(axis=1)
+    else:
+        encoded, team_sizes = encode_teams(teams, chart)
+
+    kpis = score_encoded(encoded, team_sizes, chart)
+    scores = weighted_objective(kpis, _worker['weights'])
+
+    # Stable, so ties keep the team that came first
+    best = np.argsort(-scores, kind='stable')[:_worker['top_k']]
+    top = [(float(scores[i]), offset + int(i), team_kpis(kpis, i, chart)) for i in best]
+
+    return {'top': top, 'teams': len(scores), 'seconds': time.perf_counter() - started, 'pid': os.getpid()}
+
+
+def _shards(teams, shard_size):
+    """Split a team stream (or an encoded array) into shards without materializing it."""
+    if isinstance(teams, np.ndarray):
+        for start in range(0, len(teams), shard_size):
+            yield start, teams[start:start + shard_size]
+        return
+
+    iterator = iter(teams)
+    start = 0
+    while True:
+        shard = list(itertools.islice(iterator, shard_size))
+        if not shard:
+            return
+        yield start, shard
+        start += len(shard)
+
+
+class ShardedTeamRunner:
+    """
+    Score a stream of teams across a process pool and keep the global top-K.
+
+    The type chart and its precomputed type-pair tables are placed in shared
+    memory once, so tasks carry only their teams. Each worker scores its
+    shard with the vectorized scorer (same numbers as calculate_team_kpis)
+    and returns its local top-K, which the parent merges.
+    """
+
+    def __init__(self, types_csv_path="types.csv", workers=None, shard_size=20000, top_k=10, objective=None):
+        """
+        Args:
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+            workers: Number of worker processes (defaults to the CPU count)
+            shard_size: Teams per task
+            top_k: Number of best teams to keep
+            objective: Dict of weights over the scalar KPIs (defaults to
+                team_search.DEFAULT_OBJECTIVE)
+        """
+        self.types_csv_path = types_csv_path
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.top_k = top_k
+        self.objective = dict(DEFAULT_OBJECTIVE if objective is None else objective)
+
+    def run(self, teams):
+        """
+        Score every team and return the best ones.
+
+        Args:
+            teams: Iterable of teams (lists of Pokémon dicts or (type1, type2)
+                pairs), or an (N, 6, 2) array of type IDs
+
+        Returns:
+            dict: 'top' (list of dicts with 'index', 'score' and 'kpis', best
+            first), 'teams' scored, 'seconds', 'teams_per_second', and
+            'workers' mapping each worker PID to its teams, busy seconds and
+            teams per second
+        """
+        chart = TypeChart.load(self.types_csv_path)
+        blocks, spec = _share_chart(chart)
+        started = time.perf_counter()
+        heap = []
+        per_worker = {}
+        total = 0
+
+        def merge(result):
+            nonlocal total
+            total += result['teams']
+            stats = per_worker.setdefault(result['pid'], {'teams': 0, 'seconds': 0.0})
+            stats['teams'] += result['teams']
+            stats['seconds'] += result['seconds']
+            for score, index, kpis in result['top']:
+                # Ties go to the team seen first
+                item = (score, -index, kpis)
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(spec, self.objective, self.top_k)) as pool:
+                pending = set()
+                for offset, shard in _shards(teams, self.shard_size):
+                    # Keep a bounded number of shards in flight so memory stays flat
+                    if len(pending) >= 2 * self.workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            merge(future.result())
+                    pending.add(pool.submit(_score_shard, shard, offset))
+                for future in pending:
+                    merge(future.result())
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        elapsed = time.perf_counter() - started
+        for stats in per_worker.values():
+            stats['teams_per_second'] = stats['teams'] / stats['seconds'] if stats['seconds'] else 0.0
+
+        top = sorted(heap, key=lambda item: (-item[0], -item[1]))
+        return {
+            'top': [{'index': -neg_index, 'score': score, 'kpis': kpis} for score, neg_index, kpis in top],
+            'teams': total,
+            'seconds': elapsed,
+            'teams_per_second': total / elapsed if elapsed else 0.0,
+            'workers': per_worker,
+        }
@@ -0,0 +1,373 @@
+import heapq
+
+import numpy as np
+
+from src.pokedex import Pokedex, type_pair_key
+from src.type_chart import TypeChart
+
+# Weights applied to the KPIs of calculate_team_kpis. Positive weights reward
+# a metric, negative weights penalize it.
+DEFAULT_OBJECTIVE = {
+    'team_coverage_score': 1.0,
+    'type_coverage_index': 1.0,
+    'defensive_holes': -5.0,
+}
+
+SEARCHABLE_METRICS = tuple(DEFAULT_OBJECTIVE)
+
+# Partial teams expanded before giving up on a proof. Enough for teams of up
+# to 4 to be searched exhaustively (about 6,400 nodes for 4 over the current
+# Pokédex); 5-6 members stop here after a few seconds.
+DEFAULT_NODE_LIMIT = 20000
+
+
+class _NodeLimitReached(Exception):
+    """Raised inside the search to unwind once the node budget is spent."""
+
+
+class TeamSearch:
+    """
+    Branch-and-bound search for the best teams in the Pokédex.
+
+    Pokémon sharing a type pair score identically, so the search runs over
+    the distinct type-pair classes (multisets, capped by how many Pokémon
+    each class has) instead of over individual Pokémon. Every KPI used by the
+    objective is a sum of per-member contributions, which gives a cheap
+    optimistic bound for pruning partial teams. The last two members are
+    scored for all candidate class pairs at once with NumPy, and a beam
+    search seeds the top-K before the exact search starts so the bound
+    prunes from the first node.
+    """
+
+    def __init__(self, pokedex, chart):
+        self.pokedex = pokedex
+        self.chart = chart
+
+        self.class_keys = []
+        self.class_members = []
+        for key, members in pokedex.by_type_pair.items():
+            if all(t in chart.type_ids for t in key):
+                self.class_keys.append(key)
+                self.class_members.append(members)
+
+        type1_ids = [chart.type_ids[key[0]] for key in self.class_keys]
+        type2_ids = [chart.type_ids[key[1]] if len(key) > 1 else chart.no_type for key in self.class_keys]
+        self.class_defense, self.class_offense = chart.pair_scores(type1_ids, type2_ids)
+        self.class_index = {key: i for i, key in enumerate(self.class_keys)}
+
+    @classmethod
+    def from_files(cls, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+        """
+        Build a search engine over the shared Pokédex and type chart.
+
+        Args:
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+
+        Returns:
+            TeamSearch: The search engine
+        """
+        return cls(Pokedex.load(pokemon_csv_path), TypeChart.load(types_csv_path))
+
+    def _resolve(self, member):
+        """Find a Pokédex entry by number or name."""
+        entry = self.pokedex.get_by_name(member) if isinstance(member, str) else self.pokedex.get(member)
+        if entry is None:
+            raise ValueError(f"Unknown Pokémon: {member!r}")
+        return entry
+
+    def objective(self, defensive, offensive, team_size, weights):
+        """
+        Vectorized objective over team metric sums.
+
+        Args:
+            defensive: Defensive metric sums, shape (..., number of types)
+            offensive: Offensive metric sums, shape (..., number of types)
+            team_size: Final team size (defensive holes are types scoring >= team_size / 2)
+            weights: Dict of weights keyed by SEARCHABLE_METRICS
+
+        Returns:
+            numpy.ndarray: Objective value per team
+        """
+        n_types = len(self.chart)
+        resisted = (defensive < 0).sum(axis=-1)
+        covered = (offensive > 0).sum(axis=-1)
+        holes = (defensive >= team_size / 2).sum(axis=-1)
+        return (weights['team_coverage_score'] * (resisted / n_types * 100)
+                + weights['type_coverage_index'] * (covered / n_types * 100)
+                + weights['defensive_holes'] * holes)
+
+    def search(self, team_size=6, must_include=(), banned_types=(), top_k=5, objective=None,
+               node_limit=DEFAULT_NODE_LIMIT, beam_width=64):
+        """
+        Find the top-K teams for an objective built from the team KPIs.
+
+        Args:
+            team_size: Number of members in each team (1-6)
+            must_include: Pokédex numbers or names that every team must contain
+            banned_types: Types no added member may have
+            top_k: Number of teams to return
+            objective: Dict of weights keyed by 'team_coverage_score',
+                'type_coverage_index' and 'defensive_holes' (defaults to
+                DEFAULT_OBJECTIVE); missing metrics get weight 0
+            node_limit: Maximum number of partial teams to expand (defaults
+                to DEFAULT_NODE_LIMIT), or None to always search until the
+                top-K is proven optimal
+            beam_width: Width of the beam search that seeds the top-K
+
+        Returns:
+            dict: 'teams' (up to ``top_k`` dicts with 'score', 'team' and
+            'type_pairs', best first), 'exhaustive' (True when the search
+            space was fully explored or pruned, so the teams are optimal)
+            and 'nodes' (partial teams expanded)
+
+        Raises:
+            ValueError: If the objective, team size or must-include members
+                are invalid, e.g. a member with a type that isn't in the chart
+        """
+        weights = dict(DEFAULT_OBJECTIVE) if objective is None else {m: 0.0 for m in SEARCHABLE_METRICS}
+        if objective is not None:
+            unknown = set(objective) - set(SEARCHABLE_METRICS)
+            if unknown:
+                raise ValueError(f"Unsupported objective metrics: {sorted(unknown)}")
+            weights.update(objective)
+
+        if not 1 <= team_size <= 6:
+            raise ValueError("team_size must be between 1 and 6")
+
+        fixed = [self._resolve(member) for member in must_include]
+        if len(fixed) > team_size:
+            raise ValueError("must_include has more members than team_size")
+        if len({entry['pokedex'] for entry in fixed}) != len(fixed):
+            raise ValueError("must_include lists the same Pokémon twice")
+        fixed_classes = []
+        for entry in fixed:
+            key = type_pair_key(entry['type1'], entry['type2'])
+            if key not in self.class_index:
+                raise ValueError(f"{entry['pokemon']} has a type that isn't in the chart: {key!r}")
+            fixed_classes.append(self.class_index[key])
+        banned = set(banned_types)
+
+        # Classes still available, and how many more Pokémon each can supply
+        capacity = np.array([len(members) for members in self.class_members])
+        for i in fixed_classes:
+            capacity[i] -= 1
+        allowed = [i for i, key in enumerate(self.class_keys)
+                   if capacity[i] > 0 and not banned.intersection(key)]
+
+        n_types = len(self.chart)
+        base_def = np.zeros(n_types, dtype=np.int64)
+        base_off = np.zeros(n_types, dtype=np.int64)
+        for i in fixed_classes:
+            base_def += self.class_defense[i]
+            base_off += self.class_offense[i]
+
+        # Try the classes that score best on their own first, so good teams
+        # are found early and the bound prunes more
+        solo = self.objective(self.class_defense[allowed], self.class_offense[allowed], team_size, weights)
+        order = np.array([allowed[i] for i in np.argsort(-solo, kind='stable')], dtype=np.intp)
+
+        state = _SearchState(self, order, capacity[order], team_size, weights, top_k, node_limit)
+        slots = team_size - len(fixed)
+        state.seed(base_def, base_off, slots, beam_width)
+        try:
+            state.expand(0, slots, base_def, base_off, [])
+            exhaustive = True
+        except _NodeLimitReached:
+            exhaustive = False
+
+        teams = []
+        for score, chosen in state.ranked():
+            team = list(fixed)
+            used = {entry['pokedex'] for entry in fixed}
+            for pos in chosen:
+                member = next(m for m in self.class_members[order[pos]] if m['pokedex'] not in used)
+                team.append(member)
+                used.add(member['pokedex'])
+            teams.append({
+                'score': score,
+                'team': team,
+                'type_pairs': [type_pair_key(m['type1'], m['type2']) for m in team],
+            })
+        return {'teams': teams, 'exhaustive': exhaustive, 'nodes': state.nodes}
+
+
+class _SearchState:
+    """Tables and the running top-K for one TeamSearch.search call."""
+
+    def __init__(self, engine, order, caps, team_size, weights, top_k, node_limit):
+        self.engine = engine
+        self.team_size = team_size
+        self.weights = weights
+        self.top_k = top_k
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.caps = caps.copy()
+        self.n_classes = len(order)
+
+        n_types = len(engine.chart)
+        empty = np.zeros((1, n_types), dtype=np.int64)
+        self.defense = np.concatenate([engine.class_defense[order], empty])
+        self.offense = np.concatenate([engine.class_offense[order], empty])
+
+        # Suffix extremes over the remaining classes, used by the bound
+        self.suffix_min_def = np.minimum.accumulate(self.defense[::-1], axis=0)[::-1]
+        self.suffix_max_def = np.maximum.accumulate(self.defense[::-1], axis=0)[::-1]
+        self.suffix_min_off = np.minimum.accumulate(self.offense[::-1], axis=0)[::-1]
+        self.suffix_max_off = np.maximum.accumulate(self.offense[::-1], axis=0)[::-1]
+        self.resist_points = np.maximum(-self.defense[:-1], 0)
+        self.attack_points = np.maximum(self.offense[:-1], 0)
+
+        # All class pairs (i <= j) by position, sorted by i, for the last two slots
+        first, second = np.triu_indices(self.n_classes)
+        self.pair_first = first.astype(np.intp)
+        self.pair_second = second.astype(np.intp)
+        self.pair_start = np.searchsorted(first, np.arange(self.n_classes + 1))
+        self.pair_defense = (self.defense[first] + self.defense[second]).astype(np.int16)
+        self.pair_offense = (self.offense[first] + self.offense[second]).astype(np.int16)
+
+        self.heap = []
+        self.seen = set()
+
+    def threshold(self):
+        return self.heap[0][0] if len(self.heap) >= self.top_k else -np.inf
+
+    def offer(self, score, chosen):
+        chosen = tuple(sorted(chosen))
+        if chosen in self.seen:
+            return
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, (score, chosen))
+        elif score > self.heap[0][0]:
+            _, dropped = heapq.heapreplace(self.heap, (score, chosen))
+            self.seen.discard(dropped)
+        else:
+            return
+        self.seen.add(chosen)
+
+    def ranked(self):
+        return [(float(score), chosen) for score, chosen in sorted(self.heap, key=lambda item: -item[0])]
+
+    def bound(self, defensive, offensive, slots, start):
+        """Optimistic objective for a partial team with ``slots`` members left to add."""
+        weights = self.weights
+        n_types = len(self.engine.chart)
+        hole_line = self.team_size / 2
+
+        best_def = defensive + slots * self.suffix_min_def[start]
+        worst_def = defensive + slots * self.suffix_max_def[start]
+        best_off = offensive + slots * self.suffix_max_off[start]
+        worst_off = offensive + slots * self.suffix_min_off[start]
+
+        # Per type, each metric can at best reach its most favourable extreme
+        w_res, w_cov, w_holes = (weights[m] for m in SEARCHABLE_METRICS)
+        resisted = (best_def < 0).sum() if w_res >= 0 else (worst_def < 0).sum()
+        covered = (best_off > 0).sum() if w_cov >= 0 else (worst_off > 0).sum()
+        holes = (best_def >= hole_line).sum() if w_holes <= 0 else (worst_def >= hole_line).sum()
+
+        if w_res >= 0 and w_cov >= 0:
+            # A type that isn't resisted (covered) yet needs at least
+            # ``need`` points of resistance (super effectiveness) from the
+            # new members, so each member can fix at most
+            # sum(min(1, contribution / need)) types
+            available = np.minimum(self.caps[start:], slots)
+            if available.any():
+                need_def = np.where(defensive >= 0, defensive + 1, np.inf)
+                need_off = np.where(offensive <= 0, 1 - offensive, np.inf)
+                gain_def = np.minimum(1, self.resist_points[start:] / need_def).sum(axis=1)
+                gain_off = np.minimum(1, self.attack_points[start:] / need_off).sum(axis=1)
+                top_def = np.sort(np.repeat(gain_def, available))[::-1][:slots].sum()
+                top_off = np.sort(np.repeat(gain_off, available))[::-1][:slots].sum()
+                resisted = min(resisted, (defensive < 0).sum() + top_def)
+                covered = min(covered, (offensive > 0).sum() + top_off)
+
+        return (w_res * (resisted / n_types * 100)
+                + w_cov * (covered / n_types * 100)
+                + w_holes * holes)
+
+    def seed(self, base_def, base_off, slots, beam_width):
+        """Fill the top-K with a beam search so pruning starts immediately."""
+        if slots == 0 or beam_width <= 0:
+            return
+        beam = [((), base_def, base_off)]
+        for depth in range(slots):
+            candidates = {}
+            for chosen, partial_def, partial_off in beam:
+                used = np.bincount(np.array(chosen, dtype=np.intp), minlength=self.n_classes)
+                open_classes = np.nonzero(self.caps > used)[0]
+                scores = self.engine.objective(partial_def + self.defense[open_classes],
+                                               partial_off + self.offense[open_classes],
+                                               self.team_size, self.weights)
+                for i in np.argsort(-scores, kind='stable')[:beam_width]:
+                    key = tuple(sorted(chosen + (open_classes[i],)))
+                    if key not in candidates:
+                        candidates[key] = scores[i]
+            ranked = sorted(candidates.items(), key=lambda item: -item[1])[:beam_width]
+            beam = [(key, base_def + self.defense[list(key)].sum(axis=0), base_off + self.offense[list(key)].sum(axis=0))
+                    for key, _ in ranked]
+        for chosen, partial_def, partial_off in beam:
+            score = self.engine.objective(partial_def, partial_off, self.team_size, self.weights)
+            self.offer(float(score), chosen)
+
+    def expand(self, start, slots, partial_def, partial_off, chosen):
+        """Depth-first search over classes at positions >= start."""
+        if slots == 0:
+            self.offer(float(self.engine.objective(partial_def, partial_off, self.team_size, self.weights)), chosen)
+            return
+
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise _NodeLimitReached
+        self.nodes += 1
+
+        if self.bound(partial_def, partial_off, slots, start) <= self.threshold():
+            return
+
+        if slots == 1:
+            candidates = np.nonzero(self.caps[start:] > 0)[0] + start
+            self._offer_all(candidates[:, None], partial_def + self.defense[candidates],
+                            partial_off + self.offense[candidates], chosen)
+            return
+
+        if slots == 2:
+            # Score every remaining class pair as the final two members in one pass
+            lo = self.pair_start[start]
+            pairs = np.stack([self.pair_first[lo:], self.pair_second[lo:]], axis=1)
+            defensive = partial_def.astype(np.int16) + self.pair_defense[lo:]
+            offensive = partial_off.astype(np.int16) + self.pair_offense[lo:]
+            if (self.caps[start:] < 2).any():
+                first, second = pairs[:, 0], pairs[:, 1]
+                ok = (self.caps[first] > 0) & (self.caps[second] > 0) & ((first != second) | (self.caps[first] >= 2))
+                pairs, defensive, offensive = pairs[ok], defensive[ok], offensive[ok]
+            self._offer_all(pairs, defensive, offensive, chosen)
+            return
+
+        for pos in range(start, self.n_classes):
+            if self.caps[pos] == 0:
+                continue
+            self.caps[pos] -= 1
+            chosen.append(pos)
+            self.expand(pos, slots - 1, partial_def + self.defense[pos], partial_off + self.offense[pos], chosen)
+            chosen.pop()
+            self.caps[pos] += 1
+
+    def _offer_all(self, additions, defensive, offensive, chosen):
+        """Offer a batch of completed teams, best first, to the top-K."""
+        if len(additions) == 0:
+            return
+        scores = self.engine.objective(defensive, offensive, self.team_size, self.weights)
+        if len(scores) > self.top_k:
+            # Only the best few can enter the top-K
+            best = np.argpartition(-scores, self.top_k)[:self.top_k]
+            best = best[np.argsort(-scores[best], kind='stable')]
+        else:
+            best = np.argsort(-scores, kind='stable')
+        for i in best:
+            if scores[i] <= self.threshold():
+                break
+            self.offer(float(scores[i]), chosen + additions[i].tolist())
+
+
+def find_best_teams(team_size=6, must_include=(), banned_types=(), top_k=5, objective=None,
+                    node_limit=DEFAULT_NODE_LIMIT, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+    return TeamSearch.from_files(pokemon_csv_path, types_csv_path).search(
+        team_size, must_include, banned_types, top_k, objective, node_limit)
@@ -0,0 +1,164 @@
+import uuid
+from collections import Counter
+
+from src.pokedex import Pokedex
+from src.pokemon_analysis import IncrementalTeamAnalysis
+from src.team_cache import LRUCache
+from src.type_chart import TypeChart
+
+MAX_TEAM_SIZE = 6
+
+
+class TeamSessionStore:
+    """
+    Server-side team state per browser session.
+
+    Each session holds its canonical team (Pokédex entries, at most 6) and
+    the team's TeamAnalysisResult, so callbacks read precomputed results
+    instead of re-analysing the rows the browser sends. The browser keeps
+    only the session ID and the team's Pokédex numbers; a process that
+    doesn't know the session (another worker, or after eviction) rebuilds
+    the entry from those numbers.
+
+    Sessions also keep an IncrementalTeamAnalysis of their team, so adding,
+    removing or swapping one member updates the metric sums instead of
+    re-scoring every member.
+    """
+
+    def __init__(self, maxsize=1024, pokemon_csv_path="151pokemon.csv", types_csv_path="types.csv"):
+        """
+        Args:
+            maxsize: Number of sessions kept before the least recently used is dropped
+            pokemon_csv_path: Path to the Pokemon CSV file (defaults to "151pokemon.csv")
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+        """
+        self.sessions = LRUCache(maxsize=maxsize)
+        self.pokemon_csv_path = pokemon_csv_path
+        self.types_csv_path = types_csv_path
+
+    @staticmethod
+    def new_session_id():
+        """Random, unguessable session ID."""
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def team_numbers(selected_rows):
+        """
+        Pokédex numbers of a grid selection, capped at the team size.
+
+        Args:
+            selected_rows: Row dicts from the AG Grid selection (or None)
+
+        Returns:
+            list: Pokédex numbers in selection order
+        """
+        return [int(row['pokedex']) for row in (selected_rows or [])[:MAX_TEAM_SIZE]]
+
+    def set_team(self, session_id, pokedex_numbers):
+        """
+        Store a session's team and analyse it.
+
+        Args:
+            session_id: Session ID
+            pokedex_numbers: Pokédex numbers of the team members
+
+        Returns:
+            dict: Session entry with 'numbers', 'team', 'analysis' and
+            'state' (the team's IncrementalTeamAnalysis)
+        """
+        numbers = list(pokedex_numbers)[:MAX_TEAM_SIZE]
+        pokedex = Pokedex.load(self.pokemon_csv_path)
+        team = [entry for entry in pokedex.get_many(numbers) if entry is not None]
+
+        previous = self.sessions.get(session_id)
+        state = None
+        # Only edit the previous state if neither CSV has changed since it was built
+        if (previous is not None and previous['state'].chart is TypeChart.load(self.types_csv_path)
+                and all(pokedex.get(entry['pokedex']) is entry for entry in previous['team'])):
+            state = self._edit(previous['state'], previous['team'], team)
+        if state is None:
+            state = IncrementalTeamAnalysis(team, self.types_csv_path)
+
+        entry = {
+            'numbers': numbers,
+            'team': team,
+            'analysis': state.result(team),
+            'state': state,
+        }
+        self.sessions.put(session_id, entry)
+        return entry
+
+    @staticmethod
+    def _edit(state, old_team, new_team):
+        """
+        Apply a one-member add, remove or swap to a copy of ``state``.
+
+        Returns:
+            IncrementalTeamAnalysis or None: The updated copy, or None when
+            the teams differ by more than one member
+        """
+        old_counts = Counter(entry['pokedex'] for entry in old_team)
+        new_counts = Counter(entry['pokedex'] for entry in new_team)
+        removed = list((old_counts - new_counts).elements())
+        added = list((new_counts - old_counts).elements())
+        if len(removed) > 1 or len(added) > 1:
+            return None
+
+        by_number = {entry['pokedex']: entry for entry in old_team + new_team}
+        state = state.copy()
+        try:
+            if removed and added:
+                state.swap(by_number[removed[0]], by_number[added[0]])
+            elif removed:
+                state.remove(by_number[removed[0]])
+            elif added:
+                state.add(by_number[added[0]])
+        except ValueError:
+            # The state doesn't hold the old team's members
+            return None
+        return state
+
+    def get(self, session_id, pokedex_numbers=None):
+        """
+        A session's team and analysis.
+
+        Args:
+            session_id: Session ID
+            pokedex_numbers: The team as the browser last saw it; if given and
+                the stored team differs or is missing, it is rebuilt from these
+
+        Returns:
+            dict or None: Session entry with 'numbers', 'team', 'analysis' and
+            'state', or None for an unknown session without numbers to rebuild from
+        """
+        entry = self.sessions.get(session_id)
+        if pokedex_numbers is None:
+            return entry
+        if entry is None or entry['numbers'] != list(pokedex_numbers):
+            entry = self.set_team(session_id, pokedex_numbers)
+        return entry
+
+    def team(self, session_state):
+        """
+        Convenience lookup from the browser-side session store.
+
+        Args:
+            session_state: dcc.Store data with 'session' and 'numbers' keys (or None)
+
+        Returns:
+            list: The session's team (empty without a session)
+        """
+        if not session_state:
+            return []
+        return self.get(session_state['session'], session_state['numbers'])['team']
+
+    def analysis(self, session_state):
+        """
+        The session's TeamAnalysisResult, or None without a session or team.
+
+        Args:
+            session_state: dcc.Store data with 'session' and 'numbers' keys (or None)
+        """
+        if not session_state or not session_state['numbers']:
+            return None
+        return self.get(session_state['session'], session_state['numbers'])['analysis']
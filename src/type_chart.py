@@ -0,0 +1,366 @@
+import csv
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from src.metrics import TYPE_CHART_LOADS
+from src.snapshot import read_snapshot, source_stamp, write_snapshot
+
+
+def clean_type(type_name):
+    """
+    Normalize a raw type value coming from the grid or the CSV.
+
+    Args:
+        type_name: A type string, or an empty/placeholder value
+
+    Returns:
+        str or None: The type name, or None for '', 'None', None and NaN
+    """
+    if type_name is None or type_name == '' or type_name == 'None':
+        return None
+    if isinstance(type_name, float) and math.isnan(type_name):
+        return None
+    return type_name
+
+
+def defense_scores(multipliers):
+    """
+    Map defensive damage multipliers to the -3..2 weighting used by the KPIs.
+
+    4x weakness (2), 2x weakness (1), neutral (0), 0.5x resist (-1),
+    0.25x resist (-2), immune (-3). Any other value scores 0.
+
+    Args:
+        multipliers: Array of combined damage multipliers
+
+    Returns:
+        numpy.ndarray: Integer scores with the same shape as ``multipliers``
+    """
+    m = np.asarray(multipliers)
+    return np.select(
+        [m == 4.0, m == 2.0, m == 0.5, m == 0.25, m == 0],
+        [2, 1, -1, -2, -3],
+        0,
+    ).astype(np.int64)
+
+
+def offense_scores(multipliers):
+    """
+    Map STAB attack multipliers to the offensive weighting used by the KPIs.
+
+    Super effective (1), not very effective (-1), no effect (-3), otherwise 0.
+
+    Args:
+        multipliers: Array of attacking multipliers
+
+    Returns:
+        numpy.ndarray: Integer scores with the same shape as ``multipliers``
+    """
+    m = np.asarray(multipliers)
+    return np.select([m == 2.0, m == 0.5, m == 0], [1, -1, -3], 0).astype(np.int64)
+
+
+def profiles_path(types_csv_path):
+    """Default path of the exported defensive profile table of a types CSV."""
+    stem, ext = os.path.splitext(types_csv_path)
+    return f"{stem}_profiles{ext or '.csv'}"
+
+
+class TypeChart:
+    """
+    Immutable attacking x defending type-effectiveness matrix.
+
+    ``matrix[a, d]`` is how effective attacking type ``a`` is against
+    defending type ``d``. Types are addressed by integer IDs in the column
+    order of ``types.csv``.
+    """
+
+    # Charts already parsed, keyed by absolute path and file mtime
+    _loaded = {}
+
+    # Arrays that fully describe a chart once its types are known
+    ARRAYS = ('matrix', 'defense_matrix', 'offense_scores', 'offense_rows', 'profile_multipliers',
+              'profile_scores', 'profile_rows', 'pair_defense', 'pair_offense')
+
+    def __init__(self, types, matrix):
+        self.types = tuple(types)
+        self.type_ids = {t: i for i, t in enumerate(self.types)}
+
+        matrix = np.array(matrix, dtype=np.float64)
+        if matrix.shape != (len(self.types), len(self.types)):
+            raise ValueError(f"Type chart must be square over {len(self.types)} types, got {matrix.shape}")
+        matrix.setflags(write=False)
+        self.matrix = matrix
+
+        # Content hash, so results cached against this chart are invalidated
+        # whenever types.csv changes
+        digest = hashlib.sha1(repr(self.types).encode())
+        digest.update(matrix.tobytes())
+        self.fingerprint = digest.hexdigest()
+
+        # Defending columns padded with a neutral column so that "no second
+        # type" can be gathered like any other type ID
+        self.no_type = len(self.types)
+        padded = np.ones((len(self.types), len(self.types) + 1))
+        padded[:, :self.no_type] = matrix
+        padded.setflags(write=False)
+        self.defense_matrix = padded
+
+        # Integer weightings precomputed once for every cell of the chart
+        offense = offense_scores(matrix)
+        offense.setflags(write=False)
+        self.offense_scores = offense
+
+        # Offensive rows padded with a zero row for "no second type"
+        offense_rows = np.zeros((len(self.types) + 1, len(self.types)), dtype=np.int64)
+        offense_rows[:self.no_type] = offense
+        offense_rows.setflags(write=False)
+        self.offense_rows = offense_rows
+
+        # Defensive profile of every single type and unordered dual type,
+        # plus a trailing neutral row for "no type at all"
+        n = len(self.types)
+        pairs = [(i, self.no_type) for i in range(n)]
+        pairs += [(i, j) for i in range(n) for j in range(i + 1, n)]
+        self.profile_pairs = tuple(pairs)
+        pair_ids = np.array(pairs + [(self.no_type, self.no_type)], dtype=np.intp)
+
+        profile_multipliers = padded[:, pair_ids[:, 0]].T * padded[:, pair_ids[:, 1]].T
+        profile_scores = defense_scores(profile_multipliers).astype(np.int8)
+
+        # Row of the profile table for any (type1, type2) ID pair. Order
+        # doesn't matter and a repeated type counts once (Fire/Fire is Fire).
+        profile_rows = np.empty((n + 1, n + 1), dtype=np.intp)
+        for row, (i, j) in enumerate(pair_ids):
+            profile_rows[i, j] = profile_rows[j, i] = row
+        profile_rows[np.arange(n), np.arange(n)] = np.arange(n)
+
+        # Metric contributions of a member for every (type1, type2) ID pair.
+        # A member without a primary type contributes nothing.
+        pair_defense = profile_scores[profile_rows]
+        pair_offense = (offense_rows[:, None, :] + offense_rows[None, :, :]).astype(np.int8)
+        pair_offense[np.arange(n), np.arange(n)] = offense_rows[:n]
+        pair_defense[self.no_type] = 0
+        pair_offense[self.no_type] = 0
+
+        for name, array in (('profile_multipliers', profile_multipliers), ('profile_scores', profile_scores),
+                            ('profile_rows', profile_rows), ('pair_defense', pair_defense),
+                            ('pair_offense', pair_offense)):
+            array.setflags(write=False)
+            setattr(self, name, array)
+
+    @classmethod
+    def from_arrays(cls, types, fingerprint, arrays):
+        """
+        Rebuild a chart around existing arrays without recomputing them, e.g.
+        views onto shared memory in a worker process.
+
+        Args:
+            types: Type names in ID order
+            fingerprint: Content hash of the original chart
+            arrays: Dict of every name in TypeChart.ARRAYS to its array
+
+        Returns:
+            TypeChart: A chart backed by the given arrays
+        """
+        chart = cls.__new__(cls)
+        chart.types = tuple(types)
+        chart.type_ids = {t: i for i, t in enumerate(chart.types)}
+        chart.no_type = len(chart.types)
+        chart.fingerprint = fingerprint
+        n = len(chart.types)
+        chart.profile_pairs = tuple([(i, chart.no_type) for i in range(n)]
+                                    + [(i, j) for i in range(n) for j in range(i + 1, n)])
+        for name in cls.ARRAYS:
+            array = arrays[name]
+            array.setflags(write=False)
+            setattr(chart, name, array)
+        return chart
+
+    @classmethod
+    def from_csv(cls, types_csv_path="types.csv"):
+        """
+        Parse a type chart from a CSV with a 'Type' column of attacking types
+        and one column per defending type.
+
+        Args:
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+
+        Returns:
+            TypeChart: The parsed chart
+        """
+        with open(types_csv_path, newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        defending_types = [col for col in rows[0] if col != "Type"] if rows else []
+        by_attacker = {row["Type"]: row for row in rows}
+        # Attacking rows are reordered to match the defending columns
+        matrix = [[float(by_attacker[a][d]) for d in defending_types] for a in defending_types]
+        return cls(defending_types, matrix)
+
+    @classmethod
+    def load(cls, types_csv_path="types.csv"):
+        """
+        Return the shared chart for a CSV, parsing it only the first time or
+        after the file has been modified.
+
+        A parsed chart is compiled into a snapshot next to the CSV (see
+        src/snapshot.py), so other processes memory-map its arrays instead
+        of parsing the CSV and recomputing the profile tables.
+
+        Args:
+            types_csv_path: Path to the types CSV file (defaults to "types.csv")
+
+        Returns:
+            TypeChart: The shared, read-only chart
+        """
+        path = os.path.abspath(types_csv_path)
+        stamp = source_stamp(path)
+        cached = cls._loaded.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        snapshot = read_snapshot(path, 'type_chart', stamp)
+        if snapshot is not None:
+            meta, arrays = snapshot
+            chart = cls.from_arrays(meta['types'], meta['fingerprint'], arrays)
+        else:
+            chart = cls.from_csv(path)
+            TYPE_CHART_LOADS.inc()
+            write_snapshot(path, 'type_chart', stamp, {name: getattr(chart, name) for name in cls.ARRAYS},
+                           types=list(chart.types), fingerprint=chart.fingerprint)
+        cls._loaded[path] = (stamp, chart)
+        return chart
+
+    def __len__(self):
+        return len(self.types)
+
+    def type_id(self, type_name):
+        """
+        Look up the integer ID of a type.
+
+        Args:
+            type_name: The name of the type
+
+        Returns:
+            int or None: The type ID, or None if the type is not in the chart
+        """
+        return self.type_ids.get(type_name)
+
+    def effectiveness(self, attacking_type, defending_type):
+        """
+        Get how effective one type is when attacking another.
+
+        Args:
+            attacking_type: Name of the attacking type
+            defending_type: Name of the defending type
+
+        Returns:
+            float: The damage multiplier
+        """
+        return float(self.matrix[self.type_ids[attacking_type], self.type_ids[defending_type]])
+
+    def defense_multipliers(self, type1_id, type2_id=None):
+        """
+        Damage multipliers of every attacking type against a single or dual type.
+
+        Args:
+            type1_id: ID of the primary defending type
+            type2_id: ID of the secondary defending type, or None
+
+        Returns:
+            numpy.ndarray: Multipliers indexed by attacking type ID
+        """
+        column = self.matrix[:, type1_id]
+        if type2_id is None:
+            return column
+        return column * self.matrix[:, type2_id]
+
+    def pair_scores(self, type1_ids, type2_ids):
+        """
+        Per-member defensive and offensive metric contributions for type pairs.
+
+        Args:
+            type1_ids: Array of primary type IDs
+            type2_ids: Array of secondary type IDs (``no_type`` for single types)
+
+        Returns:
+            tuple: (defensive, offensive) integer arrays of shape (n, number of types)
+        """
+        type1_ids = np.asarray(type1_ids, dtype=np.intp)
+        type2_ids = np.asarray(type2_ids, dtype=np.intp)
+        defensive = self.pair_defense[type1_ids, type2_ids].astype(np.int64)
+        offensive = self.pair_offense[type1_ids, type2_ids].astype(np.int64)
+        return defensive, offensive
+
+    def profile_row(self, type1, type2=None):
+        """
+        Row of the defensive profile table for a single or dual type.
+
+        Args:
+            type1: Primary type name
+            type2: Secondary type name, or None
+
+        Returns:
+            int: Index into ``profile_multipliers``/``profile_scores``. Order
+            doesn't matter, Fire/Fire is the same row as Fire, and unknown or
+            missing types map to the trailing neutral row.
+        """
+        id1 = self.type_ids.get(clean_type(type1), self.no_type)
+        id2 = self.type_ids.get(clean_type(type2), self.no_type)
+        return int(self.profile_rows[id1, id2])
+
+    def defense_profile(self, type1, type2=None):
+        """
+        Damage multiplier of every attacking type against a single or dual type.
+
+        Args:
+            type1: Primary type name
+            type2: Secondary type name, or None
+
+        Returns:
+            dict: Multipliers keyed by attacking type, in chart order
+        """
+        row = self.profile_multipliers[self.profile_row(type1, type2)]
+        return dict(zip(self.types, row.tolist()))
+
+    def export_profiles(self, path):
+        """
+        Write the defensive profile table to a CSV for inspection.
+
+        One row per single or dual type (type2 empty for single types) with
+        the chart fingerprint, every attacking type's multiplier and its
+        defensive score. Nothing reads the file back: the table lives in
+        memory and in the chart's snapshot.
+
+        Args:
+            path: Destination CSV path
+
+        Raises:
+            OSError: If the file can't be written
+        """
+        header = ["type1", "type2", "fingerprint"] + list(self.types) + [f"{t}_score" for t in self.types]
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for row, (id1, id2) in enumerate(self.profile_pairs):
+                type2 = self.types[id2] if id2 != self.no_type else ""
+                writer.writerow(
+                    [self.types[id1], type2, self.fingerprint]
+                    + [f"{m:g}" for m in self.profile_multipliers[row].tolist()]
+                    + self.profile_scores[row].tolist()
+                )
+
+    def to_dict(self):
+        """
+        Nested ``{attacking: {defending: multiplier}}`` view of the chart.
+
+        Returns:
+            dict: Effectiveness values keyed by attacking then defending type
+        """
+        return {
+            attacking: dict(zip(self.types, row))
+            for attacking, row in zip(self.types, self.matrix.tolist())
+        }
@@ -57,6 +57,3 @@ def pokemon_type_checker(pokemon_type):
         return output
     else:
         return f"'{pokemon_type}' is an invalid Pokémon type."
-
-# Example usage:
-print("Types Called!")
\ No newline at end of file
@@ -0,0 +1,37 @@
+import flask
+import pytest
+
+from src.api import register_api
+
+
+@pytest.fixture
+def client():
+    server = flask.Flask(__name__)
+    register_api(server)
+    return server.test_client()
+
+
+@pytest.mark.parametrize("member", [
+    {'type1': ['Fire']},
+    {'type1': 'Fire', 'type2': {'a': 1}},
+    {'type1': 'Fire', 'type2': 5},
+    {'type1': 'Fyre'},
+    {'type1': 'Fire', 'type2': 'Fyre'},
+])
+def test_malformed_types_are_rejected_by_both_routes(client, member):
+    single = client.post("/api/team/analyze", json={'team': [member]})
+    batch = client.post("/api/teams/analyze-batch", json={'teams': [[member]]})
+
+    for response in (single, batch):
+        assert response.status_code == 400
+        assert response.is_json and 'error' in response.get_json()
+
+
+def test_dict_members_with_known_types_are_scored(client):
+    team = [{'type1': 'Fire', 'type2': 'Flying'}, {'type1': 'Water', 'type2': None}, {'type1': 'Grass', 'type2': ''}]
+
+    single = client.post("/api/team/analyze", json={'team': team})
+    batch = client.post("/api/teams/analyze-batch", json={'teams': [team]})
+
+    assert single.status_code == batch.status_code == 200
+    assert single.get_json()['kpis'] == batch.get_json()['results'][0]
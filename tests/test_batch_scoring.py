@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from src.batch_scoring import encode_teams
+from src.pokemon_analysis import TeamAnalysis
+from src.type_chart import TypeChart
+
+
+@pytest.mark.parametrize("team", [
+    [{'type1': ['Fire']}],
+    [{'type1': 'Fire', 'type2': {'a': 1}}],
+    [('Fire', ['Water'])],
+    [{'type1': 'Fyre'}],
+])
+def test_bad_types_raise_value_error(team):
+    with pytest.raises(ValueError):
+        encode_teams([team], TypeChart.load("types.csv"))
+
+
+def test_encoded_teams_keep_typeless_members_in_their_size():
+    teams = [[{'type1': 'Fire', 'type2': None}, {'type1': None, 'type2': None}],
+             [{'type1': None, 'type2': 'Water'}, {'type1': 'Grass', 'type2': 'Poison'}]]
+    encoded, team_sizes = encode_teams(teams, TypeChart.load("types.csv"))
+
+    from_arrays = TeamAnalysis.score_teams(encoded, team_sizes=team_sizes)
+    from_lists = TeamAnalysis.score_teams(teams)
+    for kpi, values in from_lists.items():
+        np.testing.assert_array_equal(from_arrays[kpi], values)
+
+    with pytest.raises(ValueError):
+        TeamAnalysis.score_teams(encoded)
@@ -0,0 +1,24 @@
+from src.metrics import SNAPSHOT_LOADS
+from src.pokedex import Pokedex
+
+CSV = """pokedex,pokemon,type1,type2
+1,Bulbasaur,Grass,Poison
+4,Charmander,Fire,
+999,Missingno,,
+"""
+
+
+def test_snapshot_entries_match_csv(tmp_path, monkeypatch):
+    path = tmp_path / "pokemon.csv"
+    path.write_text(CSV, encoding="utf-8")
+    monkeypatch.setattr(Pokedex, "_loaded", {})
+
+    parsed = Pokedex.load(str(path))
+    # Forget the parsed store so the next load maps the snapshot just written
+    Pokedex._loaded.clear()
+    loads = SNAPSHOT_LOADS.value('pokedex')
+    mapped = Pokedex.load(str(path))
+
+    assert SNAPSHOT_LOADS.value('pokedex') == loads + 1
+    assert mapped.entries == parsed.entries == Pokedex.from_csv(str(path)).entries
+    assert parsed.get(999) == {'pokedex': 999, 'pokemon': 'Missingno', 'type1': None, 'type2': None}
@@ -0,0 +1,25 @@
+import os
+
+from src.pokedex_query import PokedexQuery
+
+CSV = """pokedex,pokemon,type1,type2
+1,Bulbasaur,Grass,Poison
+4,Charmander,Fire,
+"""
+
+
+def test_edited_csv_is_picked_up(tmp_path):
+    path = tmp_path / "pokemon.csv"
+    path.write_text(CSV, encoding="utf-8")
+    query = PokedexQuery.from_files(str(path))
+    assert PokedexQuery.from_files(str(path)) is query
+    assert query.rows(0, 10, quick_filter="fire")['rowCount'] == 1
+
+    path.write_text(CSV + "6,Charizard,Fire,Flying\n", encoding="utf-8")
+    # Make sure the stamp changes even on filesystems with coarse mtimes
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+    edited = PokedexQuery.from_files(str(path))
+    assert edited is not query
+    assert [e['pokemon'] for e in edited.rows(0, 10, [{'colId': 'pokemon', 'sort': 'desc'}], None, "fire")['rowData']] \
+        == ['Charmander', 'Charizard']
@@ -0,0 +1,82 @@
+import pytest
+
+from app import PokemonTeamChatAssistant
+from src import response_cache
+from src.response_cache import ResponseCache
+
+TEAM = [{'pokedex': 6, 'pokemon': 'Charizard', 'type1': 'Fire', 'type2': 'Flying'},
+        {'pokedex': 9, 'pokemon': 'Blastoise', 'type1': 'Water', 'type2': None}]
+
+
+class FakeChat:
+    """Stand-in for ollama's chat: streams a fixed answer and counts calls."""
+
+    def __init__(self, answer="<think>hmm</think>Rock and Electric hit you hard."):
+        self.answer = answer
+        self.calls = 0
+
+    def __call__(self, model, messages, stream):
+        self.calls += 1
+        return iter([{'message': {'content': self.answer[:10]}}, {'message': {'content': self.answer[10:]}}])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def chat():
+    return FakeChat()
+
+
+@pytest.fixture
+def assistant(chat):
+    return PokemonTeamChatAssistant(response_cache=ResponseCache(":memory:", ttl=60), chat_fn=chat)
+
+
+def test_miss_then_hit(assistant, chat):
+    first = assistant.ask_deepseek_chat("What am I weak to?", TEAM)
+    # Same question up to case and punctuation, same team in another order
+    second = assistant.ask_deepseek_chat("what am i weak to", list(reversed(TEAM)))
+
+    assert first == second == "Rock and Electric hit you hard."
+    assert chat.calls == 1
+    assert (assistant.response_cache.hits, assistant.response_cache.misses) == (1, 1)
+
+
+def test_other_question_or_team_misses(assistant, chat):
+    assistant.ask_deepseek_chat("What am I weak to?", TEAM)
+    assistant.ask_deepseek_chat("Who should I add?", TEAM)
+    assistant.ask_deepseek_chat("What am I weak to?", TEAM[:1])
+
+    assert chat.calls == 3
+    assert assistant.response_cache.hits == 0
+
+
+def test_expired_answers_are_asked_again(assistant, chat, clock):
+    assistant.ask_deepseek_chat("What am I weak to?", TEAM)
+    clock[0] += 59
+    assistant.ask_deepseek_chat("What am I weak to?", TEAM)
+    assert chat.calls == 1
+
+    clock[0] += 2
+    assistant.ask_deepseek_chat("What am I weak to?", TEAM)
+    assert chat.calls == 2
+    assert assistant.response_cache.info()['hit_rate'] == pytest.approx(1 / 3)
+
+
+def test_least_recently_used_answers_are_evicted(clock):
+    cache = ResponseCache(":memory:", max_entries=2)
+    for question in ("a", "b"):
+        cache.put("model", question, "team", question.upper())
+        clock[0] += 1
+    assert cache.get("model", "a", "team") == "A"
+    clock[0] += 1
+    cache.put("model", "c", "team", "C")
+
+    assert len(cache) == 2
+    assert cache.get("model", "b", "team") is None
+    assert cache.get("model", "a", "team") == "A"
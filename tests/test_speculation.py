@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from src.pokedex import Pokedex
+from src.pokemon_analysis import TeamAnalysis
+from src.speculation import TeamSpeculator
+from src.team_cache import LRUCache
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    monkeypatch.setattr(TeamAnalysis, "cache", LRUCache(maxsize=4))
+    monkeypatch.setattr(TeamAnalysis, "speculative", LRUCache(maxsize=1024))
+
+
+def test_resubmitting_while_the_worker_is_busy_cancels_the_queued_job(caches):
+    speculator = TeamSpeculator(max_workers=1)
+    release = threading.Event()
+    blocker = speculator.executor.submit(release.wait)
+    pokedex = Pokedex.load("151pokemon.csv")
+
+    first = speculator.submit("session", [pokedex.get(1)])
+    # Cancelling the queued job used to deadlock on the speculator's lock
+    second_submit = threading.Thread(target=speculator.submit, args=("session", [pokedex.get(1), pokedex.get(4)]),
+                                     daemon=True)
+    second_submit.start()
+    second_submit.join(timeout=5)
+    release.set()
+
+    assert not second_submit.is_alive()
+    assert first.cancelled()
+    blocker.result(timeout=5)
+    speculator.executor.shutdown(wait=True)
+    assert speculator._pending == {}
+
+
+def test_precomputed_teams_do_not_evict_requested_ones(caches):
+    pokedex = Pokedex.load("151pokemon.csv")
+    requested = [pokedex.get(1), pokedex.get(4)]
+    kpis = TeamAnalysis.calculate_team_kpis(requested)
+
+    added = TeamSpeculator().precompute(requested)
+    expected = TeamAnalysis.compute_team_kpis(requested + [pokedex.get(7)])
+    hits = TeamAnalysis.speculative.hits
+
+    assert added > TeamAnalysis.cache.maxsize
+    assert TeamAnalysis.calculate_team_kpis(requested) == kpis
+    assert len(TeamAnalysis.cache) == 1
+    # The next click is served from the speculative cache and promoted
+    assert TeamAnalysis.calculate_team_kpis(requested + [pokedex.get(7)]) == expected
+    assert TeamAnalysis.speculative.hits == hits + 1
+    assert len(TeamAnalysis.cache) == 2
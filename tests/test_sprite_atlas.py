@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from src.sprite_atlas import build_atlas
+
+Image = pytest.importorskip("PIL.Image")
+
+CSV = """pokedex,pokemon,type1,type2
+1,Bulbasaur,Grass,Poison
+4,Charmander,Fire,
+7,Squirtle,Water,
+"""
+
+
+def test_atlas_packs_sprites_by_pokedex_number(tmp_path):
+    csv_path = tmp_path / "pokemon.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+    source = tmp_path / "sprites"
+    source.mkdir()
+    # Placeholder sprites: one smaller and one larger than a cell; #7 has none
+    Image.new("RGBA", (4, 4), (255, 0, 0, 255)).save(source / "1.png")
+    Image.new("RGB", (12, 12), (0, 0, 255)).save(source / "4.png")
+    out = tmp_path / "atlas"
+
+    index = build_atlas(str(source), str(out), str(csv_path), size=8, columns=2)
+
+    assert index['sprites'] == {0: [0, 0], 1: [8, 0], 4: [0, 8], 7: [8, 8]}
+    assert json.loads((out / "atlas.json").read_text(encoding="utf-8"))['image'] == index['image']
+    assert ".sprite-4 { background-position: -0px -8px; }" in (out / "atlas.css").read_text(encoding="utf-8")
+
+    with Image.open(out / "atlas.png") as atlas:
+        assert atlas.size == (16, 16)
+        assert atlas.getpixel((8 + 1, 1)) == (0, 0, 0, 0)
+        assert atlas.getpixel((8 + 2, 2)) == (255, 0, 0, 255)
+        assert atlas.getpixel((0, 8)) == (0, 0, 255, 255)
+        assert atlas.getpixel((8 + 4, 8 + 4)) == (0, 0, 0, 0)
@@ -0,0 +1,26 @@
+import io
+import json
+
+from src.pokemon_analysis import calculate_team_kpis
+from src.stream_scoring import score_stream
+
+
+def test_unscorable_lines_are_skipped(capsys):
+    lines = [
+        '{"id": "a", "team": [1, 4, 7]}',
+        '{"id": "b", "team": [{"type1": ["Fire"]}]}',
+        '{"id": "c", "team": [{"type1": "Fire", "type2": {"a": 1}}]}',
+        '[{"type1": 5}]',
+        '{"id": "d", "team": [{"type1": "Fyre"}]}',
+        'not json',
+        '{"id": "e", "team": [{"type1": "Water", "type2": "Ground"}]}',
+    ]
+    out = io.StringIO()
+
+    scored, skipped = score_stream(io.StringIO("\n".join(lines) + "\n"), out, chunk_size=3)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert (scored, skipped) == (2, 5)
+    assert [record['id'] for record in records] == ['a', 'e']
+    assert records[1] == dict(id='e', **calculate_team_kpis([{'type1': 'Water', 'type2': 'Ground'}]))
+    assert capsys.readouterr().err.count("Skipped line") == 5
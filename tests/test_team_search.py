@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.batch_scoring import weighted_objective
+from src.pokedex import Pokedex
+from src.pokemon_analysis import TeamAnalysis
+from src.team_search import DEFAULT_OBJECTIVE, TeamSearch
+from src.type_chart import TypeChart
+
+# A small Pokédex, with a few Pokémon sharing a type pair
+ENTRIES = [
+    (1, 'Bulbasaur', 'Grass', 'Poison'), (2, 'Ivysaur', 'Grass', 'Poison'), (4, 'Charmander', 'Fire', None),
+    (6, 'Charizard', 'Fire', 'Flying'), (7, 'Squirtle', 'Water', None), (8, 'Wartortle', 'Water', None),
+    (25, 'Pikachu', 'Electric', None), (27, 'Sandshrew', 'Ground', None), (35, 'Clefairy', 'Fairy', None),
+    (66, 'Machop', 'Fighting', None), (74, 'Geodude', 'Rock', 'Ground'), (81, 'Magnemite', 'Electric', 'Steel'),
+    (92, 'Gastly', 'Ghost', 'Poison'), (124, 'Jynx', 'Ice', 'Psychic'), (147, 'Dratini', 'Dragon', None),
+    (197, 'Umbreon', 'Dark', None), (212, 'Scizor', 'Bug', 'Steel'), (230, 'Kingdra', 'Water', 'Dragon'),
+]
+OBJECTIVES = [None, {'team_coverage_score': 1.0, 'type_coverage_index': 0.5}, {'defensive_holes': -1.0}]
+
+
+@pytest.fixture(scope="module")
+def pokedex():
+    return Pokedex({'pokedex': n, 'pokemon': name, 'type1': t1, 'type2': t2} for n, name, t1, t2 in ENTRIES)
+
+
+@pytest.fixture(scope="module")
+def engine(pokedex):
+    return TeamSearch(pokedex, TypeChart.load("types.csv"))
+
+
+def brute_force_scores(entries, team_size, objective, must_include=(), banned_types=()):
+    """Objective of every team of distinct Pokémon, best first."""
+    fixed = [e for e in entries if e['pokedex'] in must_include]
+    rest = [e for e in entries if e['pokedex'] not in must_include
+            and not {e['type1'], e['type2']} & set(banned_types)]
+    teams = [fixed + list(c) for c in itertools.combinations(rest, team_size - len(fixed))]
+    kpis = TeamAnalysis.score_teams(teams)
+    weights = DEFAULT_OBJECTIVE if objective is None else objective
+    return np.sort(weighted_objective(kpis, weights))[::-1]
+
+
+@pytest.mark.parametrize("team_size", [1, 2, 3, 4])
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_top_k_matches_brute_force(pokedex, engine, team_size, objective):
+    result = engine.search(team_size, top_k=5, objective=objective)
+    expected = brute_force_scores(pokedex.entries, team_size, objective)[:5]
+
+    assert result['exhaustive']
+    np.testing.assert_allclose([team['score'] for team in result['teams']], expected)
+
+
+def test_constraints_match_brute_force(pokedex, engine):
+    result = engine.search(4, must_include=(25,), banned_types=('Water',), top_k=5)
+    expected = brute_force_scores(pokedex.entries, 4, None, must_include=(25,), banned_types=('Water',))[:5]
+
+    np.testing.assert_allclose([team['score'] for team in result['teams']], expected)
+    for team in result['teams']:
+        assert team['team'][0]['pokedex'] == 25
+        assert all('Water' not in (m['type1'], m['type2']) for m in team['team'][1:])
+
+
+def test_default_limit_proves_teams_of_four_over_the_pokedex():
+    assert TeamSearch.from_files().search(4)['exhaustive']
+
+
+def test_must_include_with_unknown_type_raises_value_error():
+    pokedex = Pokedex([{'pokedex': 1, 'pokemon': 'Bulbasaur', 'type1': 'Grass', 'type2': 'Poison'},
+                       {'pokedex': 900, 'pokemon': 'Glitchmon', 'type1': 'Fyre', 'type2': None}])
+    engine = TeamSearch(pokedex, TypeChart.load("types.csv"))
+
+    with pytest.raises(ValueError):
+        engine.search(2, must_include=(900,))
@@ -0,0 +1,21 @@
+import shutil
+
+from src.pokemon_analysis import TeamAnalysis
+from src.team_cache import LRUCache
+from src.team_session import TeamSessionStore
+
+
+def test_editing_the_pokedex_rebuilds_the_session_analysis(tmp_path, monkeypatch):
+    monkeypatch.setattr(TeamAnalysis, "cache", LRUCache(maxsize=4096))
+    csv_path = tmp_path / "pokemon.csv"
+    shutil.copy("151pokemon.csv", csv_path)
+    store = TeamSessionStore(pokemon_csv_path=str(csv_path))
+    store.set_team("session", [1, 4])
+
+    # Bulbasaur changes types between the two selections
+    text = csv_path.read_text(encoding="utf-8")
+    csv_path.write_text(text.replace("1,Bulbasaur,Grass,Poison", "1,Bulbasaur,Normal,"), encoding="utf-8")
+    entry = store.set_team("session", [1, 4, 7])
+
+    assert [member['type1'] for member in entry['team']] == ['Normal', 'Fire', 'Water']
+    assert entry['analysis'].kpis == TeamAnalysis.compute_team_kpis(entry['team'])